@@ -0,0 +1,100 @@
+from bisect import bisect_right
+from datetime import date, datetime
+from typing import Any, Iterable
+
+from .market_calendar import EASTERN
+
+# Aggregate bar fields scaled by the price factor; volume is scaled inversely.
+PRICE_FIELDS = ("o", "h", "l", "c", "vw")
+VOLUME_FIELDS = ("v",)
+
+
+def has_corporate_actions(ticker: str) -> bool:
+    """Return True for stock tickers, the only ones Polygon split-adjusts."""
+    return ":" not in ticker
+
+
+def split_fingerprint(splits: Iterable[dict[str, Any]]) -> tuple:
+    """Return a hashable summary of a ticker's splits for change detection."""
+    return tuple(
+        sorted(
+            (s.get("execution_date", ""), s.get("split_from"), s.get("split_to"))
+            for s in splits
+        )
+    )
+
+
+class SplitAdjuster:
+    """
+    Applies split adjustments to unadjusted aggregate bars.
+
+    A bar is adjusted by every split that executes after it: prices are
+    multiplied by split_from / split_to and volume by the inverse, matching
+    Polygon's ``adjusted=true`` aggregates.
+    """
+
+    def __init__(self, splits: Iterable[dict[str, Any]]):
+        events = []
+        for split in splits:
+            try:
+                executed = date.fromisoformat(split["execution_date"])
+                factor = float(split["split_from"]) / float(split["split_to"])
+            except (KeyError, TypeError, ValueError, ZeroDivisionError):
+                continue
+            # Bars stamped before midnight Eastern on the execution date predate
+            # the split.
+            start = datetime(
+                executed.year, executed.month, executed.day, tzinfo=EASTERN
+            )
+            events.append((int(start.timestamp() * 1000), factor))
+        events.sort()
+
+        self.boundaries = [timestamp for timestamp, _ in events]
+        # factors[i] is the product of every split from events[i] onward, so a
+        # bar before boundaries[i] (and after boundaries[i - 1]) uses factors[i].
+        self.factors = [1.0] * (len(events) + 1)
+        for i in range(len(events) - 1, -1, -1):
+            self.factors[i] = self.factors[i + 1] * events[i][1]
+
+    def __bool__(self) -> bool:
+        return bool(self.boundaries)
+
+    def factor_at(self, timestamp_ms: int) -> float:
+        """Return the cumulative price factor for a bar starting at timestamp_ms."""
+        return self.factors[bisect_right(self.boundaries, timestamp_ms)]
+
+    def adjust_bars(self, bars: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """
+        Return split-adjusted copies of bars.
+
+        Args:
+            bars: Aggregate bars with millisecond 't' timestamps
+
+        Returns:
+            New list of bars; bars unaffected by any split are returned as is
+        """
+        adjusted = []
+        for bar in bars:
+            timestamp = bar.get("t")
+            factor = 1.0 if timestamp is None else self.factor_at(timestamp)
+            if factor == 1.0:
+                adjusted.append(bar)
+                continue
+
+            bar = dict(bar)
+            for field in PRICE_FIELDS:
+                if bar.get(field) is not None:
+                    bar[field] = bar[field] * factor
+            for field in VOLUME_FIELDS:
+                if bar.get(field) is not None:
+                    bar[field] = bar[field] / factor
+            adjusted.append(bar)
+        return adjusted
+
+    def adjust_response(self, response: dict[str, Any]) -> dict[str, Any]:
+        """Adjust the bars of an unadjusted aggregates response."""
+        response = dict(response)
+        if "results" in response:
+            response["results"] = self.adjust_bars(response["results"])
+        response["adjusted"] = True
+        return response
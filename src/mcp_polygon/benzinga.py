@@ -0,0 +1,166 @@
+import asyncio
+import re
+import time
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+# Rating columns returned by get_analyst_ratings, before the track record.
+RATING_FIELDS = (
+    "date",
+    "ticker",
+    "firm",
+    "analyst",
+    "rating_action",
+    "rating",
+    "previous_rating",
+    "price_target_action",
+    "price_target",
+    "previous_price_target",
+    "importance",
+)
+
+# Analyst fields joined onto each rating.
+TRACK_RECORD_FIELDS = (
+    "smart_score",
+    "overall_success_rate",
+    "overall_avg_return",
+    "total_ratings",
+)
+
+# Insight columns returned by get_analyst_insights.
+INSIGHT_FIELDS = (
+    "date",
+    "ticker",
+    "firm",
+    "rating_action",
+    "rating",
+    "price_target",
+    "insight",
+)
+
+
+def normalize_name(name: Any) -> str:
+    """Lowercase a name and reduce it to its words, for lookups."""
+    if not isinstance(name, str):
+        return ""
+    return " ".join(re.findall(r"[a-z0-9]+", name.lower()))
+
+
+def equality_filters(
+    **filters: Tuple[Optional[str], Optional[str]],
+) -> Dict[str, Set[str]]:
+    """
+    Combine (eq, any_of) filter pairs into the allowed values per field.
+
+    any_of is comma-separated. Fields with neither value are left out.
+    """
+    allowed: Dict[str, Set[str]] = {}
+    for field, (eq, any_of) in filters.items():
+        values = None
+        if eq is not None:
+            values = {eq}
+        if any_of is not None:
+            listed = {value.strip() for value in any_of.split(",")}
+            values = listed if values is None else values & listed
+        if values is not None:
+            allowed[field] = values
+    return allowed
+
+
+class EntityIndex:
+    """
+    Local copy of the Benzinga analyst or firm list, indexed by ID and name.
+
+    The list changes slowly, so it is loaded whole and replaced on each
+    reload. Names are matched ignoring case and punctuation.
+    """
+
+    def __init__(self, name_field: str):
+        self.name_field = name_field
+        self.by_id: Dict[str, Dict[str, Any]] = {}
+        self.by_name: Dict[str, List[Dict[str, Any]]] = {}
+        self.loaded_at = float("-inf")
+        self.lock = asyncio.Lock()
+
+    def __len__(self) -> int:
+        return len(self.by_id)
+
+    def load(
+        self, records: Iterable[Dict[str, Any]], now: Optional[float] = None
+    ) -> None:
+        """Replace the index with a freshly fetched list."""
+        by_id: Dict[str, Dict[str, Any]] = {}
+        by_name: Dict[str, List[Dict[str, Any]]] = {}
+        for record in records:
+            entity_id = record.get("benzinga_id")
+            if entity_id is None:
+                continue
+            by_id[entity_id] = record
+            name = normalize_name(record.get(self.name_field))
+            by_name.setdefault(name, []).append(record)
+        self.by_id, self.by_name = by_id, by_name
+        self.loaded_at = time.monotonic() if now is None else now
+
+    def get(self, entity_id: Any) -> Optional[Dict[str, Any]]:
+        return self.by_id.get(entity_id)
+
+    def find(self, name: str) -> List[Dict[str, Any]]:
+        """Return the entities with this name, else those whose name contains it."""
+        key = normalize_name(name)
+        if not key:
+            return []
+        exact = self.by_name.get(key)
+        if exact:
+            return list(exact)
+        return [
+            record
+            for indexed, records in self.by_name.items()
+            if key in indexed
+            for record in records
+        ]
+
+    def select(self, filters: Dict[str, Set[str]], limit: int) -> List[Dict[str, Any]]:
+        """Return up to limit entities whose fields take one of the allowed values."""
+        if "benzinga_id" in filters:
+            candidates: Iterable[Dict[str, Any]] = [
+                self.by_id[entity_id]
+                for entity_id in sorted(filters["benzinga_id"])
+                if entity_id in self.by_id
+            ]
+        else:
+            candidates = self.by_id.values()
+        selected = []
+        for record in candidates:
+            if all(record.get(field) in values for field, values in filters.items()):
+                selected.append(record)
+                if len(selected) >= limit:
+                    break
+        return selected
+
+
+def join_ratings(
+    ratings: List[Dict[str, Any]], analysts: Optional[EntityIndex] = None
+) -> List[Dict[str, Any]]:
+    """
+    Reduce ratings to RATING_FIELDS plus the analyst's TRACK_RECORD_FIELDS.
+
+    Track record columns are None when the analyst isn't in the index.
+    """
+    rows = []
+    for rating in ratings:
+        row = {field: rating.get(field) for field in RATING_FIELDS}
+        analyst = (
+            analysts.get(rating.get("benzinga_analyst_id"))
+            if analysts is not None
+            else None
+        )
+        for field in TRACK_RECORD_FIELDS:
+            row[field] = analyst.get(field) if analyst else None
+        rows.append(row)
+    return rows
+
+
+def project_insights(insights: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Reduce insights to INSIGHT_FIELDS."""
+    return [
+        {field: insight.get(field) for field in INSIGHT_FIELDS} for insight in insights
+    ]
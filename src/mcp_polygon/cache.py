@@ -0,0 +1,243 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Optional, Protocol
+
+
+class CachedNotFound(Exception):
+    """
+    Replayed not-found error from a negative cache entry.
+    """
+
+    pass
+
+
+class SharedStore(Protocol):
+    """Cross-process second-level store; timestamps are wall-clock seconds."""
+
+    def get(self, key: str) -> Optional[tuple[str, Optional[str], float, float]]: ...
+
+    def put(
+        self,
+        key: str,
+        value: str,
+        error: Optional[str],
+        expires_at: float,
+        stale_until: float,
+    ) -> None: ...
+
+
+class CacheEntry:
+    """A cached response body, or a not-found error when ``error`` is set."""
+
+    __slots__ = ("value", "error", "expires_at", "stale_until")
+
+    def __init__(
+        self,
+        value: str,
+        expires_at: float,
+        stale_until: float,
+        error: Optional[str] = None,
+    ):
+        self.value = value
+        self.error = error
+        self.expires_at = expires_at
+        self.stale_until = stale_until
+
+
+def is_not_found(error: Exception) -> bool:
+    """Return True if an upstream error says the requested resource doesn't exist."""
+    return isinstance(error, CachedNotFound) or '"NOT_FOUND"' in str(error)
+
+
+class ResponseCache:
+    """
+    In-memory LRU cache for upstream response bodies.
+
+    Fresh entries are returned directly. Entries past their TTL but still
+    inside their stale window are returned immediately while a single
+    background task refreshes them, so callers never wait on a slow upstream
+    for data that was recently fresh. Concurrent misses for the same key share
+    one upstream request. Not-found errors are cached for ``negative_ttl``
+    seconds and replayed as CachedNotFound.
+
+    With a shared ``store``, entries fetched by any process are visible to the
+    others: local misses and expired entries are looked up in the store
+    before going upstream, and every fetched entry is written through.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 2048,
+        max_bytes: int = 256 * 1024 * 1024,
+        negative_ttl: float = 30.0,
+        store: Optional[SharedStore] = None,
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.negative_ttl = negative_ttl
+        self.store = store
+        self._entries: OrderedDict[str, CacheEntry] = OrderedDict()
+        self._bytes = 0
+        self._inflight: dict[str, asyncio.Task] = {}
+        self._refreshing: set[str] = set()
+        self._tasks: set[asyncio.Task] = set()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def get_or_fetch(
+        self,
+        key: str,
+        fetch: Callable[[], Awaitable[str]],
+        ttl: float,
+        stale_ttl: float = 0.0,
+    ) -> str:
+        """
+        Return the cached value for key, fetching it on a miss.
+
+        Args:
+            key: Cache key identifying the upstream request
+            fetch: Coroutine factory performing the upstream request
+            ttl: Seconds a fetched value is served as fresh (0 disables caching)
+            stale_ttl: Additional seconds a value may be served while refreshing
+
+        Raises:
+            CachedNotFound: If the key has a live negative entry
+            Exception: Whatever fetch raises on a miss
+        """
+        now = time.monotonic()
+        entry = self._entries.get(key)
+        if self.store is not None and (entry is None or now >= entry.expires_at):
+            entry = await self._from_store(key, now) or entry
+        if entry is not None:
+            if entry.error is not None:
+                if now < entry.expires_at:
+                    raise CachedNotFound(entry.error)
+            elif now < entry.expires_at:
+                self._entries.move_to_end(key)
+                return entry.value
+            elif now < entry.stale_until:
+                self._entries.move_to_end(key)
+                if key not in self._refreshing:
+                    self._refreshing.add(key)
+                    self._spawn(self._refresh(key, fetch, ttl, stale_ttl))
+                return entry.value
+
+        # Concurrent misses share one load, which runs as its own task so a
+        # cancelled caller doesn't abort it for everyone else.
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._load(key, fetch, ttl, stale_ttl))
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._finish_load(key, t))
+        return await asyncio.shield(task)
+
+    def invalidate(self, predicate: Callable[[str], bool]) -> int:
+        """
+        Drop every entry whose key matches predicate.
+
+        Returns:
+            Number of entries removed
+        """
+        keys = [key for key in self._entries if predicate(key)]
+        for key in keys:
+            self._remove(key)
+        return len(keys)
+
+    def clear(self) -> None:
+        """Drop all entries."""
+        self._entries.clear()
+        self._bytes = 0
+
+    async def _load(
+        self,
+        key: str,
+        fetch: Callable[[], Awaitable[str]],
+        ttl: float,
+        stale_ttl: float,
+    ) -> str:
+        try:
+            value = await fetch()
+        except Exception as e:
+            if self.negative_ttl > 0 and is_not_found(e):
+                now = time.monotonic()
+                entry = CacheEntry("", now + self.negative_ttl, 0.0, error=str(e))
+                self._store(key, entry)
+                await self._to_store(key, entry, now)
+            raise
+
+        if ttl > 0 or stale_ttl > 0:
+            now = time.monotonic()
+            entry = CacheEntry(value, now + ttl, now + ttl + stale_ttl)
+            self._store(key, entry)
+            await self._to_store(key, entry, now)
+        return value
+
+    async def _from_store(self, key: str, now: float) -> Optional[CacheEntry]:
+        # SQLite calls block, so they run off the event loop.
+        row = await asyncio.to_thread(self.store.get, key)
+        if row is None:
+            return None
+        value, error, expires_at, stale_until = row
+        # Convert wall-clock deadlines to this process's monotonic clock.
+        offset = now - time.time()
+        entry = CacheEntry(value, expires_at + offset, stale_until + offset, error)
+        if max(entry.expires_at, entry.stale_until) <= now:
+            return None
+        self._store(key, entry)
+        return entry
+
+    async def _to_store(self, key: str, entry: CacheEntry, now: float) -> None:
+        if self.store is None:
+            return
+        offset = time.time() - now
+        await asyncio.to_thread(
+            self.store.put,
+            key,
+            entry.value,
+            entry.error,
+            entry.expires_at + offset,
+            entry.stale_until + offset,
+        )
+
+    async def _refresh(
+        self,
+        key: str,
+        fetch: Callable[[], Awaitable[str]],
+        ttl: float,
+        stale_ttl: float,
+    ) -> None:
+        try:
+            await self._load(key, fetch, ttl, stale_ttl)
+        except Exception:
+            # Keep serving the stale value until its window runs out.
+            pass
+        finally:
+            self._refreshing.discard(key)
+
+    def _finish_load(self, key: str, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            # Mark the error retrieved in case every caller went away.
+            task.exception()
+
+    def _spawn(self, coro: Awaitable[None]) -> None:
+        task = asyncio.ensure_future(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def _store(self, key: str, entry: CacheEntry) -> None:
+        self._remove(key)
+        self._entries[key] = entry
+        self._bytes += len(entry.value)
+        while self._entries and (
+            len(self._entries) > self.max_entries or self._bytes > self.max_bytes
+        ):
+            self._remove(next(iter(self._entries)))
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= len(entry.value)
@@ -0,0 +1,89 @@
+import hashlib
+from collections import OrderedDict
+from typing import Callable, Optional
+
+from mcp.server.lowlevel.server import request_ctx
+from polygon import RESTClient
+
+from .upstream import RateLimiter
+
+# HTTP header carrying a caller's own Polygon.io API key.
+API_KEY_HEADER = "x-polygon-api-key"
+
+
+def key_id(api_key: str) -> str:
+    """Return a short, non-reversible identifier for an API key."""
+    return hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:16]
+
+
+def request_api_key() -> Optional[str]:
+    """
+    Return the API key sent with the current MCP request, if any.
+
+    Only HTTP transports carry headers; under stdio, or outside a request,
+    this returns None.
+    """
+    ctx = request_ctx.get(None)
+    request = getattr(ctx, "request", None)
+    headers = getattr(request, "headers", None)
+    if headers is None:
+        return None
+    return headers.get(API_KEY_HEADER) or None
+
+
+class PooledClient:
+    """A RESTClient with the rate limiter for its API key."""
+
+    __slots__ = ("client", "rate_limiter", "key_id")
+
+    def __init__(self, client: RESTClient, rate_limiter: RateLimiter, key_id: str):
+        self.client = client
+        self.rate_limiter = rate_limiter
+        self.key_id = key_id
+
+
+class ClientPool:
+    """
+    LRU pool of RESTClients keyed by API key.
+
+    Each client has its own connection pool and rate limiter, so tenants
+    sharing one server neither share quota nor wait on each other's
+    connections. The least recently used client is closed once more than
+    max_clients keys are active, and on_evict, if given, is called with its
+    key ID so state held for the key elsewhere can be dropped.
+    """
+
+    def __init__(
+        self,
+        client_factory: Callable[[str], RESTClient],
+        limiter_factory: Callable[[str], RateLimiter],
+        max_clients: int = 256,
+        on_evict: Optional[Callable[[str], None]] = None,
+    ):
+        self.client_factory = client_factory
+        self.limiter_factory = limiter_factory
+        self.max_clients = max_clients
+        self.on_evict = on_evict
+        self._clients: OrderedDict[str, PooledClient] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._clients)
+
+    def get(self, api_key: str) -> PooledClient:
+        """Return the pooled client for an API key, creating it if needed."""
+        pooled = self._clients.get(api_key)
+        if pooled is not None:
+            self._clients.move_to_end(api_key)
+            return pooled
+
+        ident = key_id(api_key)
+        pooled = self._clients[api_key] = PooledClient(
+            self.client_factory(api_key), self.limiter_factory(ident), ident
+        )
+        while len(self._clients) > self.max_clients:
+            _, evicted = self._clients.popitem(last=False)
+            # Idle connections are closed; in-flight requests finish normally.
+            evicted.client.client.clear()
+            if self.on_evict is not None:
+                self.on_evict(evicted.key_id)
+        return pooled
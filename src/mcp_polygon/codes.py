@@ -0,0 +1,104 @@
+import asyncio
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# Exchange ID fields of trades and quotes, with the column their name goes in.
+EXCHANGE_FIELDS = {
+    "exchange": "exchange_name",
+    "ask_exchange": "ask_exchange_name",
+    "bid_exchange": "bid_exchange_name",
+    "trf_id": "trf_name",
+}
+
+# Condition data types tried in order when decoding each kind of record.
+CONDITION_DATA_TYPES = {
+    "trades": ("trade",),
+    "quotes": ("nbbo", "bbo"),
+}
+
+
+def asset_class(ticker: str) -> str:
+    """Return the asset class of a ticker, as used by conditions and exchanges."""
+    prefix = ticker.split(":", 1)[0] if ":" in ticker else ""
+    return {"O": "options", "X": "crypto", "C": "fx"}.get(prefix, "stocks")
+
+
+class CodeBook:
+    """
+    Local names for the numeric condition and exchange codes in trades and
+    quotes, per asset class.
+
+    Both lists are small and change rarely, so they are loaded whole and
+    replaced on each reload.
+    """
+
+    def __init__(self):
+        # (asset_class, data_type) -> condition ID -> name
+        self.conditions: Dict[Tuple[str, str], Dict[int, str]] = {}
+        # asset_class -> exchange ID -> name
+        self.exchanges: Dict[str, Dict[int, str]] = {}
+        self.loaded_at = float("-inf")
+        self.lock = asyncio.Lock()
+
+    def load(
+        self,
+        conditions: Iterable[Dict[str, Any]],
+        exchanges: Iterable[Dict[str, Any]],
+        now: Optional[float] = None,
+    ) -> None:
+        """Replace both maps with freshly fetched conditions and exchanges."""
+        condition_names: Dict[Tuple[str, str], Dict[int, str]] = {}
+        for condition in conditions:
+            code, name = condition.get("id"), condition.get("name")
+            if code is None or not name:
+                continue
+            for data_type in condition.get("data_types") or ():
+                key = (condition.get("asset_class"), data_type)
+                condition_names.setdefault(key, {})[code] = name
+        exchange_names: Dict[str, Dict[int, str]] = {}
+        for exchange in exchanges:
+            code, name = exchange.get("id"), exchange.get("name")
+            if code is not None and name:
+                exchange_names.setdefault(exchange.get("asset_class"), {})[code] = name
+        self.conditions, self.exchanges = condition_names, exchange_names
+        self.loaded_at = time.monotonic() if now is None else now
+
+    def decode(
+        self, records: List[Dict[str, Any]], asset_class: str, kind: str
+    ) -> List[Dict[str, Any]]:
+        """
+        Add condition and exchange names to trades or quotes.
+
+        Args:
+            records: Trades or quotes of one ticker
+            asset_class: See asset_class
+            kind: "trades" or "quotes"
+
+        Returns:
+            Copies of records with condition_names (a list, None for unknown
+            codes) and a name column per exchange field present, see
+            EXCHANGE_FIELDS
+        """
+        conditions: Dict[int, str] = {}
+        for data_type in reversed(CONDITION_DATA_TYPES[kind]):
+            conditions.update(self.conditions.get((asset_class, data_type), {}))
+        exchanges = self.exchanges.get(asset_class, {})
+
+        # Records repeat a handful of condition combinations, so each one is
+        # decoded once.
+        combinations: Dict[Tuple[int, ...], List[Optional[str]]] = {}
+        decoded = []
+        for record in records:
+            row = dict(record)
+            codes = record.get("conditions")
+            if codes is not None:
+                key = tuple(codes)
+                names = combinations.get(key)
+                if names is None:
+                    names = combinations[key] = [conditions.get(c) for c in key]
+                row["condition_names"] = names
+            for field, name_field in EXCHANGE_FIELDS.items():
+                if field in record:
+                    row[name_field] = exchanges.get(record[field])
+            decoded.append(row)
+        return decoded
@@ -0,0 +1,138 @@
+import math
+import secrets
+from array import array
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+# Timestamp columns change on every tick and would mark every row as changed,
+# so they are carried along but not compared.
+TIME_COLUMN_SUFFIXES = ("_t", "updated", "timestamp")
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _is_time_column(column: str) -> bool:
+    return column.endswith(TIME_COLUMN_SUFFIXES) or column == "t"
+
+
+class SnapshotTable:
+    """
+    Compact numeric view of a snapshot, used to diff consecutive polls.
+
+    Only numeric, non-timestamp columns are kept, row-major in a single
+    array of doubles with NaN for missing values, so a 10k-ticker market
+    costs a few megabytes rather than 10k dicts.
+    """
+
+    __slots__ = ("columns", "tickers", "row_index", "values")
+
+    def __init__(self, rows: List[Dict[str, Any]], key: str = "ticker"):
+        columns: Dict[str, int] = {}
+        for row in rows:
+            for column, value in row.items():
+                if (
+                    column not in columns
+                    and _is_number(value)
+                    and not _is_time_column(column)
+                ):
+                    columns[column] = len(columns)
+
+        self.columns = columns
+        self.tickers = [row.get(key) for row in rows]
+        self.row_index = {ticker: i for i, ticker in enumerate(self.tickers)}
+        self.values = array("d", [math.nan]) * (len(rows) * len(columns))
+        width = len(columns)
+        for i, row in enumerate(rows):
+            for column, j in columns.items():
+                value = row.get(column)
+                if _is_number(value):
+                    self.values[i * width + j] = value
+
+    def changed_rows(
+        self, previous: "SnapshotTable", min_change_pct: float = 0.0
+    ) -> List[int]:
+        """
+        Return indexes of rows that are new or changed since previous.
+
+        A value counts as changed when it appears, disappears, or moves by
+        more than min_change_pct percent of its previous value.
+        """
+        width = len(self.columns)
+        previous_width = len(previous.columns)
+        column_map = [
+            (j, previous.columns.get(column, -1)) for column, j in self.columns.items()
+        ]
+        threshold = min_change_pct / 100
+
+        changed = []
+        for i, ticker in enumerate(self.tickers):
+            p = previous.row_index.get(ticker)
+            if p is None:
+                changed.append(i)
+                continue
+            for j, pj in column_map:
+                new = self.values[i * width + j]
+                old = math.nan if pj < 0 else previous.values[p * previous_width + pj]
+                if math.isnan(new) and math.isnan(old):
+                    continue
+                if (
+                    math.isnan(new)
+                    or math.isnan(old)
+                    or abs(new - old) > threshold * abs(old)
+                ):
+                    changed.append(i)
+                    break
+        return changed
+
+
+class DeltaCursors:
+    """
+    Server-side cursors remembering the last snapshot each poller saw.
+
+    A cursor is an unguessable token bound to one request, so it can't be
+    replayed against a different query. Each poll replaces the stored table.
+    The least recently used cursors are dropped beyond max_cursors.
+    """
+
+    def __init__(self, max_cursors: int = 64):
+        self.max_cursors = max_cursors
+        self._cursors: OrderedDict[str, Tuple[str, SnapshotTable]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._cursors)
+
+    def diff(
+        self,
+        cursor: Optional[str],
+        request: str,
+        rows: List[Dict[str, Any]],
+        min_change_pct: float = 0.0,
+    ) -> Tuple[str, List[Dict[str, Any]]]:
+        """
+        Diff rows against the cursor's previous snapshot and advance it.
+
+        Args:
+            cursor: Token from the previous poll, or None to start polling
+            request: Identifies the polled query; cursors only match it
+            rows: Current snapshot rows
+            min_change_pct: Ignore moves smaller than this percentage
+
+        Returns:
+            (cursor, rows) where rows are the new or changed rows, or every
+            row if the cursor is unknown or expired
+        """
+        table = SnapshotTable(rows)
+        stored = self._cursors.get(cursor) if cursor else None
+        if stored is None or stored[0] != request:
+            cursor = secrets.token_urlsafe(12)
+            changed = rows
+        else:
+            changed = [rows[i] for i in table.changed_rows(stored[1], min_change_pct)]
+
+        self._cursors[cursor] = (request, table)
+        self._cursors.move_to_end(cursor)
+        while len(self._cursors) > self.max_cursors:
+            self._cursors.popitem(last=False)
+        return cursor, changed
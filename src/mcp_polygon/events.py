@@ -0,0 +1,165 @@
+import asyncio
+import time
+from datetime import date, timedelta
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Set
+
+from .timeseries import to_day
+
+
+def week_of(day: date) -> date:
+    """Return the Monday starting the week of a date."""
+    return day - timedelta(days=day.weekday())
+
+
+class EventCalendar:
+    """
+    Local copy of a Benzinga event calendar (earnings or guidance).
+
+    Events are deduplicated by benzinga_id and indexed by date and ticker.
+    The calendar is loaded in buckets: a week of dates (keyed by its Monday)
+    or one ticker's whole history (keyed by the ticker). A query is answered
+    once every bucket it spans is loaded. Changes to loaded events arrive
+    through incremental syncs of everything updated past cursor; reloading
+    a bucket whole also drops events that were removed upstream.
+    """
+
+    def __init__(self):
+        self.events: Dict[str, Dict[str, Any]] = {}
+        self.by_date: Dict[date, Set[str]] = {}
+        self.by_ticker: Dict[str, Set[str]] = {}
+        self.buckets: Dict[Hashable, float] = {}
+        self.cursor: Optional[str] = None
+        self.synced_at = float("-inf")
+        self.lock = asyncio.Lock()
+        self._dates: Dict[str, date] = {}
+
+    def __len__(self) -> int:
+        return len(self.events)
+
+    @staticmethod
+    def weeks(since: date, until: date) -> List[date]:
+        """Return the week buckets spanning an inclusive date range."""
+        first, last = week_of(since), week_of(until)
+        return [first + timedelta(weeks=i) for i in range((last - first).days // 7 + 1)]
+
+    def stale(
+        self, buckets: Iterable[Hashable], max_age: float, now: Optional[float] = None
+    ) -> List[Hashable]:
+        """Return the buckets not loaded within max_age seconds, in order."""
+        now = time.monotonic() if now is None else now
+        return [
+            bucket
+            for bucket in dict.fromkeys(buckets)
+            if now - self.buckets.get(bucket, float("-inf")) >= max_age
+        ]
+
+    def add(self, events: Iterable[Dict[str, Any]]) -> None:
+        """Insert or replace events from an incremental sync and advance the cursor."""
+        for event in events:
+            self._insert(event)
+            updated = event.get("last_updated")
+            if updated and (self.cursor is None or updated > self.cursor):
+                self.cursor = updated
+
+    def load_bucket(
+        self,
+        bucket: Hashable,
+        events: List[Dict[str, Any]],
+        now: Optional[float] = None,
+    ) -> None:
+        """
+        Replace everything held for a week or ticker bucket.
+
+        The cursor isn't moved: events in other buckets may have changed
+        since the last sync.
+        """
+        if isinstance(bucket, date):
+            held = set().union(
+                *(self.by_date.get(bucket + timedelta(days=i), ()) for i in range(7))
+            )
+        else:
+            held = set(self.by_ticker.get(bucket, ()))
+        for event_id in held - {event.get("benzinga_id") for event in events}:
+            self._unindex(event_id)
+        for event in events:
+            self._insert(event)
+        self.buckets[bucket] = time.monotonic() if now is None else now
+
+    def query(
+        self,
+        since: Optional[date] = None,
+        until: Optional[date] = None,
+        days: Optional[Set[date]] = None,
+        tickers: Optional[List[str]] = None,
+        limit: int = 10,
+        ascending: bool = False,
+    ) -> List[Dict[str, Any]]:
+        """
+        Select events by date range and ticker.
+
+        The caller makes sure the buckets covering the query are loaded.
+        Events are ordered by date, time and ticker.
+        """
+        if tickers:
+            ids: Iterable[str] = set().union(
+                *(self.by_ticker.get(ticker, ()) for ticker in tickers)
+            )
+        elif since is not None and until is not None:
+            ids = set().union(
+                *(
+                    self.by_date.get(since + timedelta(days=i), ())
+                    for i in range((until - since).days + 1)
+                )
+            )
+        else:
+            ids = self.events.keys()
+
+        selected = [
+            self.events[event_id]
+            for event_id in ids
+            if (since is None or self._dates[event_id] >= since)
+            and (until is None or self._dates[event_id] <= until)
+            and (days is None or self._dates[event_id] in days)
+        ]
+        selected.sort(
+            key=lambda event: (
+                event.get("date") or "",
+                event.get("time") or "",
+                event.get("ticker") or "",
+            ),
+            reverse=not ascending,
+        )
+        return selected[:limit]
+
+    def _insert(self, event: Dict[str, Any]) -> None:
+        event_id = event.get("benzinga_id")
+        try:
+            day = to_day(event.get("date"))
+        except ValueError:
+            return
+        if event_id is None:
+            return
+        self._unindex(event_id)
+        self.events[event_id] = event
+        self._dates[event_id] = day
+        self.by_date.setdefault(day, set()).add(event_id)
+        ticker = event.get("ticker")
+        if ticker:
+            self.by_ticker.setdefault(ticker, set()).add(event_id)
+
+    def _unindex(self, event_id: str) -> None:
+        previous = self.events.pop(event_id, None)
+        day = self._dates.pop(event_id, None)
+        if previous is None:
+            return
+        ids = self.by_date.get(day)
+        if ids is not None:
+            ids.discard(event_id)
+            if not ids:
+                del self.by_date[day]
+        ticker = previous.get("ticker")
+        ids = self.by_ticker.get(ticker)
+        if ids is not None:
+            ids.discard(event_id)
+            if not ids:
+                del self.by_ticker[ticker]
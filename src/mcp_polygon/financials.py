@@ -0,0 +1,180 @@
+import math
+from array import array
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# Statement order used when a bare metric name appears in several statements.
+STATEMENTS = (
+    "income_statement",
+    "balance_sheet",
+    "cash_flow_statement",
+    "comprehensive_income",
+)
+
+# Filing fields kept for every period next to the metric columns.
+PERIOD_FIELDS = ("fiscal_period", "fiscal_year", "start_date", "filing_date")
+
+
+class FinancialsStore:
+    """
+    Columnar store of financial statement filings.
+
+    A period is keyed by (ticker, end_date, timeframe). Each metric (e.g.
+    "income_statement.revenues") is one array of doubles with a slot per
+    period and NaN where the filing doesn't report it, so selecting a few
+    metrics across many tickers never touches the rest of the statements.
+    Filings don't change once published and are kept indefinitely; adding
+    a filing for a period already held replaces its values.
+    """
+
+    def __init__(self):
+        self.periods: List[Tuple[str, str, str]] = []
+        self.period_info: List[Dict[str, Any]] = []
+        self.period_index: Dict[Tuple[str, str, str], int] = {}
+        self.columns: Dict[str, array] = {}
+        self.labels: Dict[str, str] = {}
+        self.by_ticker: Dict[Tuple[str, str], List[int]] = {}
+        # Newest filing date held per (ticker, timeframe), for incremental syncs.
+        self.latest_filing: Dict[Tuple[str, str], str] = {}
+        self.synced_at: Dict[Tuple[str, str], float] = {}
+
+    def __len__(self) -> int:
+        return len(self.periods)
+
+    def add(self, ticker: str, filings: Iterable[Dict[str, Any]]) -> None:
+        """Ingest a ticker's filings, as returned by list_stock_financials."""
+        for filing in filings:
+            end_date = filing.get("end_date")
+            timeframe = filing.get("timeframe")
+            if not end_date or not timeframe:
+                continue
+            key = (ticker, end_date, timeframe)
+            row = self.period_index.get(key)
+            if row is None:
+                row = len(self.periods)
+                self.periods.append(key)
+                self.period_info.append({})
+                self.period_index[key] = row
+                self.by_ticker.setdefault((ticker, timeframe), []).append(row)
+                for values in self.columns.values():
+                    values.append(math.nan)
+            else:
+                for values in self.columns.values():
+                    values[row] = math.nan
+
+            self.period_info[row] = {
+                field: filing.get(field) for field in PERIOD_FIELDS
+            }
+            filing_date = filing.get("filing_date")
+            if filing_date and filing_date > self.latest_filing.get(
+                (ticker, timeframe), ""
+            ):
+                self.latest_filing[ticker, timeframe] = filing_date
+
+            for statement, items in (filing.get("financials") or {}).items():
+                for metric, entry in (items or {}).items():
+                    value = entry.get("value") if isinstance(entry, dict) else None
+                    if isinstance(value, bool) or not isinstance(value, (int, float)):
+                        continue
+                    column = f"{statement}.{metric}"
+                    values = self.columns.get(column)
+                    if values is None:
+                        values = array("d", [math.nan]) * len(self.periods)
+                        self.columns[column] = values
+                        self.labels[column] = entry.get("label") or metric
+                    values[row] = value
+
+    def resolve(self, metric: str) -> str:
+        """
+        Map a metric name to its column.
+
+        Accepts a full column name ("balance_sheet.assets") or a bare metric
+        name ("assets"), which picks the first statement in STATEMENTS that
+        has it.
+
+        Raises:
+            ValueError: If no filing held reports the metric
+        """
+        if metric in self.columns:
+            return metric
+        for statement in STATEMENTS:
+            column = f"{statement}.{metric}"
+            if column in self.columns:
+                return column
+        for column in self.columns:
+            if column.endswith(f".{metric}"):
+                return column
+        raise ValueError(
+            f"Unknown metric {metric!r}; call without metrics to list them"
+        )
+
+    def metric_list(
+        self, tickers: Optional[List[str]] = None, timeframe: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        List the metric columns with their labels and period counts.
+
+        Args:
+            tickers: Only count these tickers' periods, or every ticker if None
+            timeframe: Only count periods of this timeframe, or all if None
+
+        Returns:
+            One row per metric reported in at least one counted period
+        """
+        rows = [
+            row
+            for (ticker, period_timeframe), held in self.by_ticker.items()
+            if (tickers is None or ticker in tickers)
+            and (timeframe is None or period_timeframe == timeframe)
+            for row in held
+        ]
+        listed = []
+        for column, values in sorted(self.columns.items()):
+            periods = sum(1 for row in rows if not math.isnan(values[row]))
+            if periods:
+                listed.append(
+                    {"metric": column, "label": self.labels[column], "periods": periods}
+                )
+        return listed
+
+    def select(
+        self,
+        tickers: List[str],
+        metrics: List[str],
+        timeframe: str,
+        periods: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Select metrics for the newest periods of each ticker.
+
+        Args:
+            tickers: Tickers in output order
+            metrics: Metric or column names, see resolve
+            timeframe: "quarterly", "annual" or "ttm"
+            periods: Newest periods per ticker, or all held if None
+
+        Returns:
+            One row per ticker and period, newest period first: ticker,
+            end_date, timeframe, PERIOD_FIELDS, then one column per metric
+            (None where not reported)
+        """
+        columns = [(metric, self.columns[self.resolve(metric)]) for metric in metrics]
+        rows = []
+        for ticker in tickers:
+            held = sorted(
+                self.by_ticker.get((ticker, timeframe), []),
+                key=lambda row: self.periods[row][1],
+                reverse=True,
+            )
+            for row in held[:periods]:
+                _, end_date, _ = self.periods[row]
+                record: Dict[str, Any] = {
+                    "ticker": ticker,
+                    "end_date": end_date,
+                    "timeframe": timeframe,
+                    **self.period_info[row],
+                }
+                for metric, values in columns:
+                    value = values[row]
+                    record[metric] = None if math.isnan(value) else value
+                rows.append(record)
+        return rows
@@ -1,10 +1,51 @@
 import json
 import csv
 import io
-from typing import Any
+import os
+import sys
+from array import array
+from typing import Any, Optional, Sequence
 
+# How list-valued fields are written:
+#   repr    - Python repr, e.g. "['a', 'b']"
+#   join    - elements joined with a delimiter, e.g. "a;b"
+#   json    - compact JSON, e.g. '["a","b"]'
+#   first   - the first K elements as key_0..key_K-1 columns plus key_count
+#   explode - one row per element, other fields repeated
+LIST_STRATEGIES = ("repr", "join", "json", "first", "explode")
 
-def json_to_csv(json_input: str | dict) -> str:
+
+def list_strategy_setting(value: str) -> str:
+    """
+    Validate a POLYGON_LIST_FORMAT value.
+
+    Unknown values are reported on stderr and replaced with "repr", so a typo
+    doesn't make every tool fail.
+    """
+    if value in LIST_STRATEGIES:
+        return value
+    print(
+        f"Warning: unknown POLYGON_LIST_FORMAT {value!r}, expected one of "
+        f"{', '.join(LIST_STRATEGIES)}; using repr.",
+        file=sys.stderr,
+    )
+    return "repr"
+
+
+# Strategy used when json_to_csv isn't given one.
+DEFAULT_LIST_STRATEGY = list_strategy_setting(
+    os.environ.get("POLYGON_LIST_FORMAT", "repr")
+)
+
+_compact_json = json.JSONEncoder(separators=(",", ":"), default=str).encode
+
+
+def json_to_csv(
+    json_input: str | dict,
+    list_strategy: Optional[str] = None,
+    list_delimiter: str = ";",
+    list_limit: int = 3,
+) -> str:
     """
     Convert JSON to flattened CSV format.
 
@@ -12,10 +53,18 @@ def json_to_csv(json_input: str | dict) -> str:
         json_input: JSON string or dict. If the JSON has a 'results' key containing
                    a list, it will be extracted. Otherwise, the entire structure
                    will be wrapped in a list for processing.
+        list_strategy: How to write list-valued fields, one of LIST_STRATEGIES.
+                      Defaults to DEFAULT_LIST_STRATEGY.
+        list_delimiter: Separator for the "join" strategy
+        list_limit: Number of elements kept by the "first" strategy
 
     Returns:
         CSV string with headers and flattened rows
     """
+    strategy = list_strategy or DEFAULT_LIST_STRATEGY
+    if strategy not in LIST_STRATEGIES:
+        raise ValueError(f"Unknown list strategy: {strategy}")
+
     # Parse JSON if it's a string
     if isinstance(json_input, str):
         data = json.loads(json_input)
@@ -24,12 +73,26 @@ def json_to_csv(json_input: str | dict) -> str:
 
     if isinstance(data, dict) and "results" in data:
         records = data["results"]
+        if isinstance(records, dict):
+            # Single-object endpoints, e.g. ticker details
+            records = [records]
     elif isinstance(data, list):
         records = data
     else:
         records = [data]
 
-    flattened_records = [_flatten_dict(record) for record in records]
+    flattened_records = []
+    for record in records:
+        flattened = _flatten_dict(
+            record,
+            list_strategy=strategy,
+            list_delimiter=list_delimiter,
+            list_limit=list_limit,
+        )
+        if strategy == "explode":
+            flattened_records.extend(_explode(flattened))
+        else:
+            flattened_records.append(flattened)
 
     if not flattened_records:
         return ""
@@ -52,7 +115,12 @@ def json_to_csv(json_input: str | dict) -> str:
 
 
 def _flatten_dict(
-    d: dict[str, Any], parent_key: str = "", sep: str = "_"
+    d: dict[str, Any],
+    parent_key: str = "",
+    sep: str = "_",
+    list_strategy: str = "repr",
+    list_delimiter: str = ";",
+    list_limit: int = 3,
 ) -> dict[str, Any]:
     """
     Flatten a nested dictionary by joining keys with separator.
@@ -61,6 +129,10 @@ def _flatten_dict(
         d: Dictionary to flatten
         parent_key: Key from parent level (for recursion)
         sep: Separator to use between nested keys
+        list_strategy: How to write list values, one of LIST_STRATEGIES. With
+                      "explode", lists are left in place for _explode.
+        list_delimiter: Separator for the "join" strategy
+        list_limit: Number of elements kept by the "first" strategy
 
     Returns:
         Flattened dictionary with no nested structures
@@ -71,11 +143,192 @@ def _flatten_dict(
 
         if isinstance(v, dict):
             # Recursively flatten nested dicts
-            items.extend(_flatten_dict(v, new_key, sep=sep).items())
-        elif isinstance(v, list):
-            # Convert lists to comma-separated strings
+            items.extend(
+                _flatten_dict(
+                    v, new_key, sep, list_strategy, list_delimiter, list_limit
+                ).items()
+            )
+        elif not isinstance(v, list):
+            items.append((new_key, v))
+        elif list_strategy == "repr":
             items.append((new_key, str(v)))
+        elif list_strategy == "json":
+            items.append((new_key, _compact_json(v)))
+        elif list_strategy == "join":
+            items.append(
+                (
+                    new_key,
+                    list_delimiter.join(
+                        x if isinstance(x, str) else _compact_json(x) for x in v
+                    ),
+                )
+            )
+        elif list_strategy == "first":
+            for i, x in enumerate(v[:list_limit]):
+                element_key = f"{new_key}{sep}{i}"
+                if isinstance(x, dict):
+                    items.extend(_flatten_dict(x, element_key, sep, "json").items())
+                elif isinstance(x, list):
+                    items.append((element_key, _compact_json(x)))
+                else:
+                    items.append((element_key, x))
+            items.append((f"{new_key}{sep}count", len(v)))
         else:
             items.append((new_key, v))
 
     return dict(items)
+
+
+def _explode(record: dict[str, Any], sep: str = "_") -> list[dict[str, Any]]:
+    """
+    Split a flattened record into one row per list element.
+
+    Several list fields are exploded side by side, so row i holds element i
+    of each; dict elements are flattened under the list's key and nested
+    lists are written as JSON. A record whose lists are all empty is kept as
+    one row with those fields blank.
+    """
+    length = max(
+        (len(value) for value in record.values() if isinstance(value, list)),
+        default=None,
+    )
+    if length is None:
+        return [record]
+
+    rows = []
+    for i in range(max(length, 1)):
+        row: dict[str, Any] = {}
+        for key, value in record.items():
+            if not isinstance(value, list):
+                row[key] = value
+                continue
+            x = value[i] if i < len(value) else None
+            if isinstance(x, dict):
+                row.update(_flatten_dict(x, key, sep, "json"))
+            elif isinstance(x, list):
+                row[key] = _compact_json(x)
+            else:
+                row[key] = x
+        rows.append(row)
+    return rows
+
+
+def format_order_book(
+    json_input: str | dict,
+    depth: int = 10,
+    depth_bps: Sequence[float] = (10, 50, 100),
+) -> str:
+    """
+    Convert an order book snapshot to a summary table and a price ladder.
+
+    Args:
+        json_input: get_snapshot_crypto_book response as a JSON string or dict.
+                   Levels are {"p": price, "x": {exchange: size}}, bids best
+                   first, asks best first.
+        depth: Number of levels per side to include in the ladder, at least 1
+        depth_bps: Distances from the mid, in basis points, at which to report
+                   cumulative bid and ask size
+
+    Returns:
+        Two CSV tables separated by a blank line: one summary row (best bid
+        and ask, mid, spread, top-of-book imbalance and cumulative depth) and
+        a ladder with one row per level. Levels without a price are left out
+        and counted in the summary's skipped_levels column.
+
+    Raises:
+        ValueError: If depth is less than 1
+    """
+    if depth < 1:
+        raise ValueError(f"depth must be at least 1, got {depth}")
+    if isinstance(json_input, str):
+        data = json.loads(json_input)
+    else:
+        data = json_input
+    book = data.get("data", data)
+
+    bid_prices, bid_sizes, bid_skipped = _book_side(book.get("bids") or [])
+    ask_prices, ask_sizes, ask_skipped = _book_side(book.get("asks") or [])
+
+    summary: dict[str, Any] = {
+        "ticker": book.get("ticker"),
+        "updated": book.get("updated"),
+        "bid": bid_prices[0] if bid_prices else None,
+        "ask": ask_prices[0] if ask_prices else None,
+        "bid_levels": len(bid_prices),
+        "ask_levels": len(ask_prices),
+    }
+    if bid_skipped or ask_skipped:
+        summary["skipped_levels"] = bid_skipped + ask_skipped
+    if bid_prices and ask_prices:
+        mid = (bid_prices[0] + ask_prices[0]) / 2
+        spread = ask_prices[0] - bid_prices[0]
+        summary["mid"] = mid
+        summary["spread"] = spread
+        summary["spread_bps"] = spread / mid * 10_000
+
+        top_bid = sum(bid_sizes[:depth])
+        top_ask = sum(ask_sizes[:depth])
+        if top_bid + top_ask:
+            summary["imbalance"] = (top_bid - top_ask) / (top_bid + top_ask)
+
+        for bps in depth_bps:
+            band = mid * bps / 10_000
+            summary[f"bid_size_{bps:g}bps"] = _size_within(
+                bid_prices, bid_sizes, lambda price: price >= mid - band
+            )
+            summary[f"ask_size_{bps:g}bps"] = _size_within(
+                ask_prices, ask_sizes, lambda price: price <= mid + band
+            )
+
+    ladder = []
+    bid_total = ask_total = 0.0
+    for level in range(min(depth, max(len(bid_prices), len(ask_prices)))):
+        row: dict[str, Any] = {"level": level + 1}
+        if level < len(bid_prices):
+            bid_total += bid_sizes[level]
+            row.update(
+                bid_price=bid_prices[level],
+                bid_size=bid_sizes[level],
+                bid_cum_size=bid_total,
+            )
+        if level < len(ask_prices):
+            ask_total += ask_sizes[level]
+            row.update(
+                ask_price=ask_prices[level],
+                ask_size=ask_sizes[level],
+                ask_cum_size=ask_total,
+            )
+        ladder.append(row)
+
+    return json_to_csv([summary]) + "\n" + json_to_csv(ladder)
+
+
+def _book_side(levels: list[dict[str, Any]]) -> tuple[array, array, int]:
+    """
+    Pack one side of a book into price and total size arrays.
+
+    Returns:
+        (prices, sizes, skipped), skipped counting the levels left out for
+        lacking a numeric price
+    """
+    prices = array("d")
+    sizes = array("d")
+    skipped = 0
+    for level in levels:
+        price = level.get("p")
+        if isinstance(price, bool) or not isinstance(price, (int, float)):
+            skipped += 1
+            continue
+        prices.append(price)
+        sizes.append(sum((level.get("x") or {}).values()))
+    return prices, sizes, skipped
+
+
+def _size_within(prices: array, sizes: array, inside) -> float:
+    """Cumulative size of the levels, best first, for which inside(price) holds."""
+    total = 0.0
+    for price, size in zip(prices, sizes):
+        if not inside(price):
+            break
+        total += size
+    return total
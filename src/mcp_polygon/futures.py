@@ -0,0 +1,459 @@
+import asyncio
+import math
+import operator
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import date, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from .timeseries import to_day
+
+# Contract fields returned by the front-month and roll resolvers.
+CONTRACT_FIELDS = ("ticker", "first_trade_date", "last_trade_date")
+
+# Aggregate bar prices moved by back-adjustment.
+ADJUSTED_FIELDS = ("open", "high", "low", "close", "settlement_price")
+
+# Columns returned by the continuous series.
+CONTINUOUS_FIELDS = (
+    "session_end_date",
+    "window_start",
+    "ticker",
+    *ADJUSTED_FIELDS,
+    "volume",
+)
+
+# Back-adjustment methods: scale or shift earlier contracts onto the next
+# one at each roll, or leave prices as traded.
+ADJUSTMENTS = ("ratio", "difference", "none")
+
+
+def _day(value: Any) -> Optional[date]:
+    try:
+        return to_day(value)
+    except ValueError:
+        return None
+
+
+class FuturesReference:
+    """
+    Local copy of futures reference data.
+
+    Products are held as one list keyed by product code. Contracts and
+    trading session schedules are loaded per product; contracts are also
+    indexed by ticker. Each part records when it was loaded, so callers can
+    reload it once it is older than they allow.
+    """
+
+    def __init__(self):
+        self.products: Dict[str, Dict[str, Any]] = {}
+        self.contracts: Dict[str, List[Dict[str, Any]]] = {}
+        self.contracts_by_ticker: Dict[str, Dict[str, Any]] = {}
+        self.schedules: Dict[str, List[Dict[str, Any]]] = {}
+        self.sessions: Dict[str, List[date]] = {}
+        self.loaded_at: Dict[tuple, float] = {}
+        self.lock = asyncio.Lock()
+
+    def stale(
+        self,
+        kind: str,
+        product_code: Optional[str],
+        max_age: float,
+        now: Optional[float] = None,
+    ) -> bool:
+        """Return True if a part ("products", "contracts", "schedules") is stale."""
+        now = time.monotonic() if now is None else now
+        return now - self.loaded_at.get((kind, product_code), float("-inf")) >= max_age
+
+    def load(
+        self,
+        kind: str,
+        product_code: Optional[str],
+        records: List[Dict[str, Any]],
+        now: Optional[float] = None,
+    ) -> None:
+        """Replace one part with freshly fetched records."""
+        if kind == "products":
+            self.products = {
+                record["product_code"]: record
+                for record in records
+                if record.get("product_code")
+            }
+        elif kind == "contracts":
+            for contract in self.contracts.get(product_code, []):
+                self.contracts_by_ticker.pop(contract.get("ticker"), None)
+            contracts = sorted(
+                records, key=lambda contract: contract.get("last_trade_date") or ""
+            )
+            self.contracts[product_code] = contracts
+            for contract in contracts:
+                if contract.get("ticker"):
+                    self.contracts_by_ticker[contract["ticker"]] = contract
+        elif kind == "schedules":
+            schedules = sorted(
+                records, key=lambda schedule: schedule.get("session_end_date") or ""
+            )
+            self.schedules[product_code] = schedules
+            self.sessions[product_code] = sorted(
+                {
+                    day
+                    for day in (_day(s.get("session_end_date")) for s in schedules)
+                    if day is not None
+                }
+            )
+        else:
+            raise ValueError(f"Unknown futures reference part: {kind!r}")
+        self.loaded_at[kind, product_code] = time.monotonic() if now is None else now
+
+    def schedules_between(
+        self,
+        product_code: str,
+        since: date,
+        until: Optional[date] = None,
+        days: Optional[Set[date]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Return cached schedules whose session end date is in range, oldest first."""
+        selected = []
+        for schedule in self.schedules.get(product_code, []):
+            day = _day(schedule.get("session_end_date"))
+            if (
+                day is not None
+                and since <= day
+                and (until is None or day <= until)
+                and (days is None or day in days)
+            ):
+                selected.append(schedule)
+        return selected
+
+    def roll_date(
+        self, product_code: str, contract: Dict[str, Any], roll_days: int = 0
+    ) -> Optional[date]:
+        """
+        Return the last day a contract is held as front month.
+
+        That is roll_days trading sessions before its last trade date,
+        counted on the product's cached sessions, or on weekdays where the
+        cached schedules don't reach.
+        """
+        last = _day(contract.get("last_trade_date"))
+        if last is None:
+            return None
+        sessions = self.sessions.get(product_code, [])
+        i = bisect_left(sessions, last)
+        if i < len(sessions) and sessions[i] == last and i >= roll_days:
+            return sessions[i - roll_days]
+        day = last
+        for _ in range(roll_days):
+            day -= timedelta(days=1)
+            while day.weekday() >= 5:
+                day -= timedelta(days=1)
+        return day
+
+    def chain(
+        self, product_code: str, on: date, roll_days: int = 0
+    ) -> List[Dict[str, Any]]:
+        """
+        List the contracts listed and not yet rolled out of on a date.
+
+        Combos are skipped. Rows hold CONTRACT_FIELDS and roll_date, the
+        front month first.
+        """
+        rows = []
+        for contract in self.contracts.get(product_code, []):
+            if contract.get("type") == "combo":
+                continue
+            first = _day(contract.get("first_trade_date"))
+            roll = self.roll_date(product_code, contract, roll_days)
+            if roll is None or roll < on or (first is not None and first > on):
+                continue
+            row = {field: contract.get(field) for field in CONTRACT_FIELDS}
+            row["roll_date"] = roll.isoformat()
+            rows.append(row)
+        return rows
+
+    def roll_schedule(
+        self, product_code: str, start: date, end: date, roll_days: int = 0
+    ) -> List[Dict[str, Any]]:
+        """
+        Split a date range into front-month segments.
+
+        Returns:
+            One row per contract in order: ticker, start_date and end_date
+            (inclusive) of the span it is the front month. Stops early if
+            no cached contract covers the rest of the range.
+        """
+        segments = []
+        day = start
+        while day <= end:
+            chain = self.chain(product_code, day, roll_days)
+            if not chain:
+                break
+            front = chain[0]
+            roll = date.fromisoformat(front["roll_date"])
+            segments.append(
+                {
+                    "ticker": front["ticker"],
+                    "start_date": day.isoformat(),
+                    "end_date": min(roll, end).isoformat(),
+                }
+            )
+            day = roll + timedelta(days=1)
+        return segments
+
+
+class ContractBars:
+    """
+    Aggregate bars held for one contract at one resolution.
+
+    Bars are kept in session order and cover one contiguous range of
+    session end dates, [covers[0], covers[1]]. Requests outside it fetch
+    only the sessions missing on either side; sessions from today on are
+    never counted as covered, since their bars are still forming.
+    """
+
+    def __init__(self):
+        self.days: List[date] = []
+        self.bars: List[Dict[str, Any]] = []
+        self.covers: Optional[Tuple[date, date]] = None
+        self.lock = asyncio.Lock()
+
+    def __len__(self) -> int:
+        return len(self.bars)
+
+    def missing(self, since: date, until: date) -> List[Tuple[date, date]]:
+        """
+        Return the inclusive session ranges to fetch to cover since to until.
+
+        Ranges reach back to the covered range, so it stays contiguous.
+        """
+        if self.covers is None:
+            return [(since, until)]
+        first, last = self.covers
+        ranges = []
+        if since < first:
+            ranges.append((since, first - timedelta(days=1)))
+        if until > last:
+            ranges.append((last + timedelta(days=1), until))
+        return ranges
+
+    def add(
+        self,
+        bars: Iterable[Dict[str, Any]],
+        since: date,
+        until: date,
+        today: date,
+    ) -> None:
+        """Replace the bars held for sessions since to until with fetched ones."""
+        start = bisect_left(self.days, since)
+        end = bisect_right(self.days, until)
+        fetched = []
+        for bar in bars:
+            day = _day(bar.get("session_end_date"))
+            if day is not None and since <= day <= until:
+                fetched.append((day, bar.get("window_start") or 0, bar))
+        fetched.sort(key=lambda item: item[:2])
+        self.days[start:end] = [day for day, _, _ in fetched]
+        self.bars[start:end] = [bar for _, _, bar in fetched]
+
+        covered_until = min(until, today - timedelta(days=1))
+        if covered_until < since:
+            return
+        if self.covers is None:
+            self.covers = (since, covered_until)
+        else:
+            self.covers = (
+                min(self.covers[0], since),
+                max(self.covers[1], covered_until),
+            )
+
+    def select(self, since: date, until: date) -> List[Dict[str, Any]]:
+        """Return the bars for sessions since to until, oldest first."""
+        start = bisect_left(self.days, since)
+        return self.bars[start : bisect_right(self.days, until)]
+
+
+def _closing(bars: List[Dict[str, Any]], day: str) -> float:
+    """Return the close of the last bar of a session, or NaN if it has none."""
+    for bar in reversed(bars):
+        if bar.get("session_end_date") == day:
+            close = bar.get("close")
+            return float(close) if isinstance(close, (int, float)) else math.nan
+    return math.nan
+
+
+def stitch(
+    segments: List[Dict[str, Any]],
+    bars: List[List[Dict[str, Any]]],
+    adjustment: str = "ratio",
+) -> List[Dict[str, Any]]:
+    """
+    Join front-month segments into one back-adjusted series.
+
+    Args:
+        segments: Rows from FuturesReference.roll_schedule
+        bars: Each segment's bars, oldest first. Bars after the first
+            segment may start at the previous segment's last session, whose
+            closes in both contracts measure the roll gap
+        adjustment: "ratio" multiplies earlier prices by the new close over
+            the old one at each roll, "difference" adds the new close less
+            the old one, "none" leaves prices as traded. The newest segment
+            is never adjusted; a roll without both closes isn't either
+
+    Returns:
+        One row of CONTINUOUS_FIELDS per bar, oldest first
+    """
+    if adjustment not in ADJUSTMENTS:
+        raise ValueError(
+            f"Unknown adjustment {adjustment!r}; use one of {', '.join(ADJUSTMENTS)}"
+        )
+    held: List[List[Dict[str, Any]]] = []
+    gaps: List[float] = []
+    for i, (segment, segment_bars) in enumerate(zip(segments, bars)):
+        start = segment["start_date"]
+        held.append(
+            [
+                bar
+                for bar in segment_bars
+                if (bar.get("session_end_date") or "") >= start
+            ]
+        )
+        if i:
+            roll_day = segments[i - 1]["end_date"]
+            new, old = _closing(segment_bars, roll_day), _closing(bars[i - 1], roll_day)
+            if adjustment == "ratio":
+                gap = new / old if old else math.nan
+            else:
+                gap = new - old
+            gaps.append(gap)
+
+    # Each segment's factor accumulates the gaps of every later roll.
+    identity = 1.0 if adjustment == "ratio" else 0.0
+    factors = [identity] * len(held)
+    for i in range(len(held) - 2, -1, -1):
+        gap = gaps[i]
+        if adjustment == "none" or math.isnan(gap):
+            gap = identity
+        if adjustment == "ratio":
+            factors[i] = factors[i + 1] * gap
+        else:
+            factors[i] = factors[i + 1] + gap
+
+    rows = [
+        (segment["ticker"], bar)
+        for segment, segment_bars in zip(segments, held)
+        for bar in segment_bars
+    ]
+    per_row = array(
+        "d",
+        (factor for factor, segment_bars in zip(factors, held) for _ in segment_bars),
+    )
+    apply = operator.mul if adjustment == "ratio" else operator.add
+    columns = {}
+    for field in ADJUSTED_FIELDS:
+        values = array(
+            "d",
+            (
+                value if isinstance(value, (int, float)) else math.nan
+                for value in (bar.get(field) for _, bar in rows)
+            ),
+        )
+        columns[field] = array("d", map(apply, values, per_row))
+
+    stitched = []
+    for i, (ticker, bar) in enumerate(rows):
+        row = {
+            "session_end_date": bar.get("session_end_date"),
+            "window_start": bar.get("window_start"),
+            "ticker": ticker,
+        }
+        for field in ADJUSTED_FIELDS:
+            value = columns[field][i]
+            row[field] = None if math.isnan(value) else value
+        row["volume"] = bar.get("volume")
+        stitched.append(row)
+    return stitched
+
+
+class LiveTable:
+    """
+    In-memory copy of a whole futures snapshot or market status list.
+
+    The table is replaced at each refresh and read with filters applied
+    locally, so any number of readers share one upstream poll per refresh
+    interval. Rows are kept sorted by key_field.
+    """
+
+    def __init__(self, key_field: str):
+        self.key_field = key_field
+        self.rows: List[Dict[str, Any]] = []
+        self.refreshed_at = float("-inf")
+        self.refresh: Optional[asyncio.Task] = None
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def age(self, now: Optional[float] = None) -> float:
+        """Return the seconds since the last refresh."""
+        return (time.monotonic() if now is None else now) - self.refreshed_at
+
+    def load(
+        self, records: Iterable[Dict[str, Any]], now: Optional[float] = None
+    ) -> None:
+        """Replace the table with a freshly fetched list."""
+        self.rows = sorted(
+            (record for record in records if record.get(self.key_field)),
+            key=lambda record: record[self.key_field],
+        )
+        self.refreshed_at = time.monotonic() if now is None else now
+
+    def select(
+        self,
+        filters: Dict[str, Set[str]],
+        bounds: Dict[str, Tuple[Any, Any, Any, Any]],
+        limit: int,
+        sort: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Select rows by field values and ranges.
+
+        Args:
+            filters: Allowed values per field, see equality_filters
+            bounds: (gt, gte, lt, lte) per field; None leaves a side open
+            limit: Maximum number of rows
+            sort: "field", "field.asc" or "field.desc" (default key_field
+                ascending); rows without the field sort last
+
+        Returns:
+            Up to limit rows
+        """
+        bounds = {
+            field: limits
+            for field, limits in bounds.items()
+            if any(limit is not None for limit in limits)
+        }
+        selected = [
+            row
+            for row in self.rows
+            if all(row.get(field) in values for field, values in filters.items())
+            and all(
+                _within(row.get(field), *limits) for field, limits in bounds.items()
+            )
+        ]
+        if sort:
+            field, _, order = sort.partition(".")
+            present = [row for row in selected if row.get(field) is not None]
+            present.sort(key=lambda row: row[field], reverse=order == "desc")
+            selected = present + [row for row in selected if row.get(field) is None]
+        return selected[:limit]
+
+
+def _within(value: Any, gt: Any, gte: Any, lt: Any, lte: Any) -> bool:
+    if value is None:
+        return False
+    return (
+        (gt is None or value > gt)
+        and (gte is None or value >= gte)
+        and (lt is None or value < lt)
+        and (lte is None or value <= lte)
+    )
@@ -0,0 +1,106 @@
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional
+
+# Every rate is stored against this currency; cross rates go through it.
+PIVOT_CURRENCY = "USD"
+
+
+class FxRates:
+    """
+    Local FX rate table pivoted on USD.
+
+    Each currency holds its mid rate in units per US dollar, so any cross
+    rate is a single division and a full matrix needs only one upstream
+    quote per currency. Rates older than max_age seconds are reported as
+    stale so callers know which quotes to refresh, and a stale rate keeps
+    the time it was quoted and why its refresh failed.
+    """
+
+    def __init__(self, max_age: float = 5.0):
+        self.max_age = max_age
+        self.rates: Dict[str, float] = {PIVOT_CURRENCY: 1.0}
+        self._updated: Dict[str, float] = {PIVOT_CURRENCY: float("inf")}
+        # Unix time each quote was made, and the last refresh error.
+        self.as_of: Dict[str, float] = {}
+        self.errors: Dict[str, str] = {}
+
+    def set_quote(
+        self,
+        currency: str,
+        bid: float,
+        ask: float,
+        now: Optional[float] = None,
+        as_of: Optional[float] = None,
+    ) -> None:
+        """Record a USD/currency quote, made at Unix time as_of, as its mid rate."""
+        if bid <= 0 or ask <= 0:
+            raise ValueError(f"Invalid USD/{currency} quote: {bid}/{ask}")
+        self.rates[currency] = (bid + ask) / 2
+        self._updated[currency] = time.monotonic() if now is None else now
+        self.as_of[currency] = time.time() if as_of is None else as_of
+        self.errors.pop(currency, None)
+
+    def set_error(self, currency: str, error: str) -> None:
+        """Record why a currency's quote couldn't be refreshed."""
+        self.errors[currency] = error
+
+    def stale(
+        self, currencies: Iterable[str], now: Optional[float] = None
+    ) -> List[str]:
+        """Return the currencies without a rate newer than max_age, in order."""
+        now = time.monotonic() if now is None else now
+        return [
+            currency
+            for currency in dict.fromkeys(currencies)
+            if now - self._updated.get(currency, float("-inf")) > self.max_age
+        ]
+
+    def staleness(self, currency: str, now: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Describe a stale or unknown rate.
+
+        Returns:
+            {} if the rate is fresh, else {"as_of": ISO time of the quote held
+            or None, "error": why the refresh failed or None}
+        """
+        if not self.stale([currency], now):
+            return {}
+        as_of = self.as_of.get(currency)
+        return {
+            "as_of": (
+                None
+                if as_of is None
+                else datetime.fromtimestamp(as_of, timezone.utc).isoformat()
+            ),
+            "error": self.errors.get(currency),
+        }
+
+    def cross(self, from_: str, to: str) -> Optional[float]:
+        """Return units of to per unit of from_, or None if either is unknown."""
+        from_rate = self.rates.get(from_)
+        to_rate = self.rates.get(to)
+        if from_rate is None or to_rate is None:
+            return None
+        return to_rate / from_rate
+
+    def matrix(self, currencies: List[str]) -> List[Dict[str, Any]]:
+        """
+        Build a cross-rate matrix.
+
+        Returns:
+            One row per currency: {"currency": c, <other>: units of other per
+            unit of c, ...}; None where a rate is unknown
+        """
+        rates = [self.rates.get(currency) for currency in currencies]
+        rows = []
+        for currency, from_rate in zip(currencies, rates):
+            row: Dict[str, Any] = {"currency": currency}
+            for other, to_rate in zip(currencies, rates):
+                row[other] = (
+                    None
+                    if from_rate is None or to_rate is None
+                    else to_rate / from_rate
+                )
+            rows.append(row)
+        return rows
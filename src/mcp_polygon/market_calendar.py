@@ -0,0 +1,215 @@
+import time
+from datetime import date, datetime, timedelta, timezone
+from datetime import time as dt_time
+from typing import Any, Iterable, Optional, Union
+from zoneinfo import ZoneInfo
+
+EASTERN = ZoneInfo("America/New_York")
+
+PRE_MARKET_OPEN = dt_time(4, 0)
+REGULAR_OPEN = dt_time(9, 30)
+REGULAR_CLOSE = dt_time(16, 0)
+AFTER_HOURS_CLOSE = dt_time(20, 0)
+
+# Extended trading ends this long after an early close (13:00 -> 17:00 ET).
+EARLY_CLOSE_AFTER_HOURS = timedelta(hours=4)
+
+# Holiday records for these exchanges decide whether US equities trade.
+EQUITY_EXCHANGES = {"NYSE", "NASDAQ"}
+
+# Ticker prefixes for markets that trade around the clock and ignore the
+# equity calendar.
+CONTINUOUS_MARKET_PREFIXES = ("X:", "C:")
+
+
+class MarketCalendar:
+    """
+    US equity trading calendar computed locally.
+
+    Weekends are always closed. Holidays and early closes come from
+    Polygon's upcoming market holidays endpoint via ``load_holidays``; past
+    holidays are not published there, so dates before the loaded window are
+    treated as regular trading days.
+    """
+
+    def __init__(self, holidays: Optional[Iterable[dict[str, Any]]] = None):
+        self.closed_dates: set[date] = set()
+        self.early_closes: dict[date, datetime] = {}
+        self.holidays: list[dict[str, Any]] = []
+        self.loaded_at: Optional[float] = None
+        if holidays is not None:
+            self.load_holidays(holidays)
+
+    def load_holidays(self, records: Iterable[dict[str, Any]]) -> None:
+        """
+        Replace the known holidays with records from get_market_holidays.
+
+        Args:
+            records: Holiday records with 'date', 'exchange', 'status' and,
+                     for early closes, a UTC 'close' timestamp.
+        """
+        closed_dates = set()
+        early_closes = {}
+        holidays = list(records)
+        for record in holidays:
+            if record.get("exchange") not in EQUITY_EXCHANGES:
+                continue
+            try:
+                day = date.fromisoformat(record["date"])
+            except (KeyError, TypeError, ValueError):
+                continue
+            status = record.get("status")
+            if status == "closed":
+                closed_dates.add(day)
+            elif status == "early-close" and record.get("close"):
+                close = datetime.fromisoformat(record["close"].replace("Z", "+00:00"))
+                early_closes[day] = close.astimezone(EASTERN)
+
+        self.closed_dates = closed_dates
+        self.early_closes = early_closes
+        self.holidays = holidays
+        self.loaded_at = time.time()
+
+    def is_stale(self, max_age: float) -> bool:
+        """Return True if holidays were never loaded or are older than max_age."""
+        return self.loaded_at is None or time.time() - self.loaded_at > max_age
+
+    def is_trading_day(self, day: date) -> bool:
+        """Return True if US equities have a regular session on the given date."""
+        return day.weekday() < 5 and day not in self.closed_dates
+
+    def next_trading_day(self, day: date) -> date:
+        """Return the first trading day strictly after the given date."""
+        day += timedelta(days=1)
+        while not self.is_trading_day(day):
+            day += timedelta(days=1)
+        return day
+
+    def previous_trading_day(self, day: date) -> date:
+        """Return the last trading day strictly before the given date."""
+        day -= timedelta(days=1)
+        while not self.is_trading_day(day):
+            day -= timedelta(days=1)
+        return day
+
+    def has_trading_day(self, start: date, end: date) -> bool:
+        """Return True if any trading day falls within [start, end]."""
+        if start > end:
+            return False
+        if self.is_trading_day(start):
+            return True
+        return self.next_trading_day(start) <= end
+
+    def session(self, day: date) -> Optional[dict[str, datetime]]:
+        """
+        Get the session boundaries for a date in Eastern time.
+
+        Returns:
+            Dict with pre_market_open, open, close and after_hours_close, or
+            None if the market does not trade that day.
+        """
+        if not self.is_trading_day(day):
+            return None
+
+        close = self.early_closes.get(day)
+        if close is None:
+            close = datetime.combine(day, REGULAR_CLOSE, EASTERN)
+            after_hours_close = datetime.combine(day, AFTER_HOURS_CLOSE, EASTERN)
+        else:
+            after_hours_close = close + EARLY_CLOSE_AFTER_HOURS
+
+        return {
+            "pre_market_open": datetime.combine(day, PRE_MARKET_OPEN, EASTERN),
+            "open": datetime.combine(day, REGULAR_OPEN, EASTERN),
+            "close": close,
+            "after_hours_close": after_hours_close,
+        }
+
+    def status(self, now: Optional[datetime] = None) -> dict[str, Any]:
+        """
+        Compute the market status at a point in time.
+
+        The keys mirror the equity fields of get_market_status, plus the
+        time of the next status change.
+        """
+        now = _eastern_now(now)
+        session = self.session(now.date())
+
+        market = "closed"
+        early_hours = False
+        after_hours = False
+        if session is not None:
+            if session["pre_market_open"] <= now < session["open"]:
+                market, early_hours = "extended-hours", True
+            elif session["open"] <= now < session["close"]:
+                market = "open"
+            elif session["close"] <= now < session["after_hours_close"]:
+                market, after_hours = "extended-hours", True
+
+        return {
+            "market": market,
+            "earlyHours": early_hours,
+            "afterHours": after_hours,
+            "serverTime": now.isoformat(timespec="seconds"),
+            "nextChange": self.next_transition(now).isoformat(timespec="seconds"),
+        }
+
+    def next_transition(self, now: Optional[datetime] = None) -> datetime:
+        """Return the next session boundary strictly after now."""
+        now = _eastern_now(now)
+        session = self.session(now.date())
+        if session is not None:
+            for boundary in session.values():
+                if boundary > now:
+                    return boundary
+
+        next_session = self.session(self.next_trading_day(now.date()))
+        return next_session["pre_market_open"]
+
+    def seconds_until_transition(self, now: Optional[datetime] = None) -> float:
+        """Return how long the current market status will hold, in seconds."""
+        now = _eastern_now(now)
+        return (self.next_transition(now) - now).total_seconds()
+
+
+def follows_equity_calendar(ticker: str) -> bool:
+    """Return False for crypto and forex tickers, which trade continuously."""
+    return not ticker.startswith(CONTINUOUS_MARKET_PREFIXES)
+
+
+def to_market_date(value: Union[str, int, datetime, date, None]) -> Optional[date]:
+    """
+    Convert an aggregates range bound to an Eastern calendar date.
+
+    Accepts 'YYYY-MM-DD' strings, millisecond timestamps (as int or digit
+    string), dates and datetimes. Returns None when the value can't be
+    interpreted, so callers can fall back to asking upstream.
+    """
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            return value.date()
+        return value.astimezone(EASTERN).date()
+    if isinstance(value, date):
+        return value
+    if isinstance(value, str) and value.isdigit():
+        value = int(value)
+    if isinstance(value, int):
+        return (
+            datetime.fromtimestamp(value / 1000, timezone.utc)
+            .astimezone(EASTERN)
+            .date()
+        )
+    try:
+        return date.fromisoformat(value[:10])
+    except (TypeError, ValueError):
+        return None
+
+
+def _eastern_now(now: Optional[datetime]) -> datetime:
+    if now is None:
+        return datetime.now(EASTERN)
+    if now.tzinfo is None:
+        return now.replace(tzinfo=EASTERN)
+    return now.astimezone(EASTERN)
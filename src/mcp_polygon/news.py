@@ -0,0 +1,304 @@
+import asyncio
+import hashlib
+import heapq
+import re
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+from urllib.parse import urlsplit
+
+# Smallest step between timestamps; turns exclusive bounds into inclusive ones.
+EPSILON = 1e-6
+
+# Where each news feed keeps the fields of a merged article.
+NEWS_SOURCES: Dict[str, Dict[str, str]] = {
+    "benzinga": {
+        "published": "published",
+        "url": "url",
+        "publisher": "author",
+        "summary": "teaser",
+    },
+    "polygon": {
+        "published": "published_utc",
+        "url": "article_url",
+        "publisher": "publisher.name",
+        "summary": "description",
+    },
+}
+
+# Columns of a merged article; the headline projection stops at "url".
+HEADLINE_FIELDS = ("published", "title", "tickers", "sources", "url")
+ARTICLE_FIELDS = HEADLINE_FIELDS + ("publisher", "summary")
+
+
+def to_timestamp(value: Any) -> Optional[float]:
+    """
+    Parse an ISO 8601 date or datetime to epoch seconds.
+
+    Naive values are taken as UTC. Returns None if value can't be parsed.
+    """
+    if not isinstance(value, str):
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+def time_bounds(
+    gt: Optional[str] = None,
+    gte: Optional[str] = None,
+    lt: Optional[str] = None,
+    lte: Optional[str] = None,
+) -> tuple[Optional[float], Optional[float]]:
+    """
+    Combine comparison filters into an inclusive (since, until) range.
+
+    Raises:
+        ValueError: If a bound isn't an ISO 8601 date or datetime
+    """
+    since = until = None
+    for value, offset, lower in (
+        (gt, EPSILON, True),
+        (gte, 0.0, True),
+        (lt, -EPSILON, False),
+        (lte, 0.0, False),
+    ):
+        if value is None:
+            continue
+        timestamp = to_timestamp(value)
+        if timestamp is None:
+            raise ValueError(f"Invalid timestamp: {value!r}")
+        timestamp += offset
+        if lower:
+            since = timestamp if since is None else max(since, timestamp)
+        else:
+            until = timestamp if until is None else min(until, timestamp)
+    return since, until
+
+
+class NewsStore:
+    """
+    Local copy of a news feed, synced incrementally.
+
+    Articles are deduplicated by id, replaced when a newer version arrives,
+    and indexed by ticker. The store holds every article published since
+    covers_from, so queries within that window are answered locally. Once
+    max_articles is exceeded the oldest articles are dropped and covers_from
+    moves forward.
+
+    cursor is the largest cursor_field value seen; the next sync asks
+    upstream only for articles past it.
+    """
+
+    def __init__(
+        self,
+        id_field: str,
+        published_field: str,
+        cursor_field: str,
+        max_articles: int = 20_000,
+    ):
+        self.id_field = id_field
+        self.published_field = published_field
+        self.cursor_field = cursor_field
+        self.max_articles = max_articles
+        self.articles: Dict[Any, Dict[str, Any]] = {}
+        self.by_ticker: Dict[str, Set[Any]] = {}
+        self.cursor: Optional[str] = None
+        self.covers_from: Optional[float] = None
+        self.synced_at = float("-inf")
+        self.caught_up = False
+        self.lock = asyncio.Lock()
+        self._published: Dict[Any, float] = {}
+
+    def __len__(self) -> int:
+        return len(self.articles)
+
+    def add(self, articles: Iterable[Dict[str, Any]]) -> None:
+        """Insert or replace articles and advance the cursor."""
+        for article in articles:
+            article_id = article.get(self.id_field)
+            published = to_timestamp(article.get(self.published_field))
+            if article_id is None or published is None:
+                continue
+            self._unindex(article_id)
+            self.articles[article_id] = article
+            self._published[article_id] = published
+            for ticker in article.get("tickers") or []:
+                self.by_ticker.setdefault(ticker, set()).add(article_id)
+
+            position = article.get(self.cursor_field)
+            if position is not None and (self.cursor is None or position > self.cursor):
+                self.cursor = position
+
+        excess = len(self.articles) - self.max_articles
+        if excess > 0:
+            oldest = heapq.nsmallest(
+                excess, self._published.items(), key=lambda a: a[1]
+            )
+            for article_id, published in oldest:
+                self._unindex(article_id)
+            self.covers_from = max(self.covers_from or 0.0, oldest[-1][1] + EPSILON)
+
+    def covers(self, since: Optional[float]) -> bool:
+        """Return True if every article published since the given time is held."""
+        return (
+            self.caught_up
+            and self.covers_from is not None
+            and since is not None
+            and since >= self.covers_from
+        )
+
+    def query(
+        self,
+        tickers: Optional[List[str]] = None,
+        all_tickers: bool = False,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        limit: int = 10,
+        ascending: bool = False,
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Select articles by ticker and publication time.
+
+        Args:
+            tickers: Articles mentioning any of these (all, with all_tickers)
+            since: Inclusive lower bound on publication time, epoch seconds
+            until: Inclusive upper bound on publication time, epoch seconds
+            limit: Maximum number of articles
+            ascending: Oldest first instead of newest first
+
+        Returns:
+            The articles, or None if the store can't answer completely and
+            the query must go upstream
+        """
+        if not self.caught_up or self.covers_from is None:
+            return None
+
+        if tickers:
+            sets = [self.by_ticker.get(ticker, set()) for ticker in tickers]
+            ids = set.intersection(*sets) if all_tickers else set().union(*sets)
+        else:
+            ids = self.articles.keys()
+
+        matches = [
+            (self._published[article_id], article_id)
+            for article_id in ids
+            if (since is None or self._published[article_id] >= since)
+            and (until is None or self._published[article_id] <= until)
+        ]
+        select = heapq.nsmallest if ascending else heapq.nlargest
+        selected = select(limit, matches)
+
+        # Without a covered lower bound, a short result may be missing older
+        # articles that were never synced.
+        if not self.covers(since) and (ascending or len(selected) < limit):
+            return None
+        return [self.articles[article_id] for _, article_id in selected]
+
+    def _unindex(self, article_id: Any) -> None:
+        previous = self.articles.pop(article_id, None)
+        self._published.pop(article_id, None)
+        if previous is None:
+            return
+        for ticker in previous.get("tickers") or []:
+            ids = self.by_ticker.get(ticker)
+            if ids is not None:
+                ids.discard(article_id)
+                if not ids:
+                    del self.by_ticker[ticker]
+
+
+def normalize_title(title: Any) -> str:
+    """Lowercase a headline and reduce it to its words, for deduplication."""
+    if not isinstance(title, str):
+        return ""
+    return " ".join(re.findall(r"[a-z0-9]+", title.lower()))
+
+
+def url_hash(url: Any) -> str:
+    """
+    Hash an article URL, ignoring scheme, "www.", query string and fragment.
+
+    Returns an empty string for a missing URL.
+    """
+    if not isinstance(url, str) or not url:
+        return ""
+    parts = urlsplit(url.strip().lower())
+    host = parts.netloc.removeprefix("www.")
+    path = parts.path.rstrip("/")
+    return hashlib.sha1(f"{host}{path}".encode()).hexdigest()
+
+
+def _field(article: Dict[str, Any], path: str) -> Any:
+    value: Any = article
+    for key in path.split("."):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(key)
+    return value
+
+
+def merge_news(
+    feeds: Iterable[Tuple[str, List[Dict[str, Any]]]],
+    limit: int = 20,
+    headlines_only: bool = True,
+) -> List[Dict[str, Any]]:
+    """
+    Merge articles from several news feeds into one deduplicated feed.
+
+    Two articles are the same story when their normalized titles or URL
+    hashes match. The first copy seen is kept; later copies only add their
+    tickers and source name. Bodies and nested publisher objects are
+    dropped, and the headline projection keeps only HEADLINE_FIELDS.
+
+    Args:
+        feeds: (source, articles) pairs, source being a NEWS_SOURCES key
+        limit: Maximum number of articles
+        headlines_only: Return HEADLINE_FIELDS instead of ARTICLE_FIELDS
+
+    Returns:
+        Merged articles, newest first
+    """
+    merged: List[Dict[str, Any]] = []
+    seen: Dict[str, Dict[str, Any]] = {}
+    for source, articles in feeds:
+        fields = NEWS_SOURCES[source]
+        for article in articles:
+            keys = [
+                key
+                for key in (
+                    "t:" + normalize_title(article.get("title")),
+                    "u:" + url_hash(_field(article, fields["url"])),
+                )
+                if len(key) > 2
+            ]
+            tickers = article.get("tickers") or []
+            duplicate = next((seen[key] for key in keys if key in seen), None)
+            if duplicate is not None:
+                for ticker in tickers:
+                    if ticker not in duplicate["tickers"]:
+                        duplicate["tickers"].append(ticker)
+                if source not in duplicate["sources"]:
+                    duplicate["sources"].append(source)
+            else:
+                duplicate = {
+                    "published": _field(article, fields["published"]),
+                    "title": article.get("title"),
+                    "tickers": list(tickers),
+                    "sources": [source],
+                    "url": _field(article, fields["url"]),
+                    "publisher": _field(article, fields["publisher"]),
+                    "summary": _field(article, fields["summary"]),
+                    "_timestamp": to_timestamp(_field(article, fields["published"]))
+                    or 0.0,
+                }
+                merged.append(duplicate)
+            for key in keys:
+                seen.setdefault(key, duplicate)
+
+    newest = heapq.nlargest(limit, merged, key=lambda a: a["_timestamp"])
+    columns = HEADLINE_FIELDS if headlines_only else ARTICLE_FIELDS
+    return [{column: article[column] for column in columns} for article in newest]
@@ -0,0 +1,47 @@
+from typing import Any, Dict, List
+
+# Contract reference fields kept for each chain row.
+CONTRACT_FIELDS = (
+    "ticker",
+    "contract_type",
+    "expiration_date",
+    "strike_price",
+    "shares_per_contract",
+    "exercise_style",
+)
+
+# Universal snapshot fields that change during the day and are refreshed on
+# every chain request.
+QUOTE_FIELDS = (
+    "last_quote",
+    "last_trade",
+    "session",
+    "greeks",
+    "implied_volatility",
+    "open_interest",
+    "break_even_price",
+)
+
+
+def merge_chain(
+    contracts: List[Dict[str, Any]], snapshots: List[Dict[str, Any]]
+) -> List[Dict[str, Any]]:
+    """
+    Join cached contract reference data with fresh snapshot fields.
+
+    Rows follow the contract order. Contracts missing from the snapshots
+    (e.g. not yet traded) are kept with only their reference fields; a
+    per-contract snapshot error is reported in an "error" column.
+    """
+    by_ticker = {snapshot.get("ticker"): snapshot for snapshot in snapshots}
+    chain = []
+    for contract in contracts:
+        row = {field: contract.get(field) for field in CONTRACT_FIELDS}
+        snapshot = by_ticker.get(contract.get("ticker"), {})
+        for field in QUOTE_FIELDS:
+            if field in snapshot:
+                row[field] = snapshot[field]
+        if "error" in snapshot:
+            row["error"] = snapshot.get("message") or snapshot["error"]
+        chain.append(row)
+    return chain
@@ -0,0 +1,96 @@
+import heapq
+import json
+import math
+from typing import Any, Dict, List, Optional
+
+from .formatters import _flatten_dict
+
+# Columns returned for each screened ticker, followed by the ranking column.
+SUMMARY_COLUMNS = ("ticker", "price", "todaysChangePerc", "day_v", "day_vw")
+
+
+def _number(value: Any) -> Optional[float]:
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return None
+    if math.isnan(value):
+        return None
+    return float(value)
+
+
+def _price(row: Dict[str, Any]) -> Optional[float]:
+    """Latest price: last trade, else the last minute bar, else the day bar."""
+    for column in ("lastTrade_p", "min_c", "day_c"):
+        price = _number(row.get(column))
+        if price:
+            return price
+    return None
+
+
+def _add_derived_columns(row: Dict[str, Any]) -> None:
+    price = _price(row)
+    row["price"] = price
+
+    bid = _number(row.get("lastQuote_p"))
+    ask = _number(row.get("lastQuote_P"))
+    if bid and ask:
+        row["spread"] = ask - bid
+        row["spread_pct"] = (ask - bid) / ((ask + bid) / 2) * 100
+
+    vwap = _number(row.get("day_vw"))
+    if price and vwap:
+        row["vwap_distance_pct"] = (price - vwap) / vwap * 100
+    volume = _number(row.get("day_v"))
+    if volume is not None and vwap:
+        row["dollar_volume"] = volume * vwap
+
+
+def snapshot_rows(body: str) -> List[Dict[str, Any]]:
+    """
+    Parse a full-market snapshot into flat rows ready for screening.
+
+    Nested fields are flattened as in the CSV output (e.g. day_v, lastQuote_P)
+    and derived columns are added: price, spread, spread_pct,
+    vwap_distance_pct and dollar_volume.
+    """
+    rows = []
+    for snapshot in json.loads(body).get("tickers") or []:
+        row = _flatten_dict(snapshot)
+        _add_derived_columns(row)
+        rows.append(row)
+    return rows
+
+
+def top_n(
+    rows: List[Dict[str, Any]],
+    column: str,
+    n: int,
+    ascending: bool = False,
+    min_volume: Optional[float] = None,
+    min_price: Optional[float] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Select the n rows with the largest (or smallest) value in a column.
+
+    Uses bounded heap selection, so ranking a full market costs
+    O(rows * log n) rather than a full sort. Rows without a numeric value in
+    the column, or below the volume and price floors, are skipped.
+
+    Returns:
+        Summary rows in rank order: SUMMARY_COLUMNS plus the ranking column
+    """
+    candidates = []
+    for row in rows:
+        value = _number(row.get(column))
+        if value is None:
+            continue
+        if min_volume is not None and (_number(row.get("day_v")) or 0) < min_volume:
+            continue
+        if min_price is not None and (row["price"] or 0) < min_price:
+            continue
+        candidates.append((value, row))
+
+    select = heapq.nsmallest if ascending else heapq.nlargest
+    ranked = select(n, candidates, key=lambda candidate: candidate[0])
+
+    columns = list(dict.fromkeys(SUMMARY_COLUMNS + (column,)))
+    return [{key: row.get(key) for key in columns} for _, row in ranked]
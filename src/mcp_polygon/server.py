@@ -1,28 +1,705 @@
+import asyncio
+import functools
+import json
 import os
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
 from typing import Optional, Any, Dict, Union, List, Literal
 from mcp.server.fastmcp import FastMCP
-from mcp.types import ToolAnnotations
+from mcp.types import TextContent, ToolAnnotations
 from polygon import RESTClient
+from polygon.exceptions import BadResponse
 from importlib.metadata import version, PackageNotFoundError
-from .formatters import json_to_csv
-
-from datetime import datetime, date
+from .adjustments import SplitAdjuster, has_corporate_actions, split_fingerprint
+from .benzinga import EntityIndex, equality_filters, join_ratings, project_insights
+from .cache import ResponseCache
+from .clients import ClientPool, PooledClient, request_api_key
+from .codes import CodeBook, asset_class
+from .deltas import DeltaCursors
+from .events import EventCalendar
+from .financials import FinancialsStore
+from .formatters import _flatten_dict, format_order_book, json_to_csv
+from .futures import ContractBars, FuturesReference, LiveTable, stitch
+from .fx import PIVOT_CURRENCY, FxRates
+from .market_calendar import MarketCalendar, follows_equity_calendar, to_market_date
+from .news import NewsStore, merge_news, time_bounds
+from .options_chain import merge_chain
+from .screening import snapshot_rows, top_n
+from .shared_state import SharedRateLimiter, SharedState
+from .timeseries import TimeSeries, date_range, to_day
+from .upstream import (
+    AdmissionController,
+    CircuitBreaker,
+    HedgeBudget,
+    LatencyTracker,
+    RateLimiter,
+    endpoint_family,
+    hedged_call,
+)
+from .workers import STATE_DB_ENV, worker_count
+from .workers import serve as serve_workers
+
+from datetime import datetime, date, timedelta, timezone
 
 POLYGON_API_KEY = os.environ.get("POLYGON_API_KEY", "")
 if not POLYGON_API_KEY:
     print("Warning: POLYGON_API_KEY environment variable not set.")
 
+# Upstream requests per second across all tools (0 = unlimited).
+POLYGON_RATE_LIMIT = float(os.environ.get("POLYGON_RATE_LIMIT", "0"))
+# Upstream requests allowed in flight at once; more are rejected immediately.
+POLYGON_MAX_IN_FLIGHT = int(os.environ.get("POLYGON_MAX_IN_FLIGHT", "64"))
+# Worker processes for the sse/streamable-http transports ("auto" = one per
+# CPU core). More than one runs the server behind a session-routing proxy.
+MCP_WORKERS = worker_count(os.environ.get("MCP_WORKERS", "1"))
+# SQLite file for cache and rate-limit state shared between worker processes.
+# Set automatically in multi-worker mode.
+MCP_POLYGON_STATE_DB = os.environ.get(STATE_DB_ENV, "")
+# API keys with an open client when callers send their own key in the
+# X-Polygon-API-Key header; the least recently used are closed beyond this.
+POLYGON_MAX_CLIENTS = int(os.environ.get("POLYGON_MAX_CLIENTS", "256"))
+# Hedged requests allowed per primary request of a latency-critical tool
+# (0 disables hedging).
+POLYGON_HEDGE_BUDGET = float(os.environ.get("POLYGON_HEDGE_BUDGET", "0.1"))
+# Seconds between refreshes of the in-memory futures snapshot and market
+# status tables.
+POLYGON_FUTURES_REFRESH_INTERVAL = float(
+    os.environ.get("POLYGON_FUTURES_REFRESH_INTERVAL", "5")
+)
+
 version_number = "MCP-Polygon/unknown"
 try:
     version_number = f"MCP-Polygon/{version('mcp_polygon')}"
 except PackageNotFoundError:
     pass
 
-polygon_client = RESTClient(POLYGON_API_KEY)
-polygon_client.headers["User-Agent"] += f" {version_number}"
+
+def _new_client(api_key: str) -> RESTClient:
+    client = RESTClient(api_key)
+    client.headers["User-Agent"] += f" {version_number}"
+    return client
+
+
+polygon_client = _new_client(POLYGON_API_KEY)
 
 poly_mcp = FastMCP("Polygon", dependencies=["polygon"])
 
+# Holidays are published well in advance, so refreshing twice a day is plenty.
+HOLIDAYS_MAX_AGE = 12 * 60 * 60
+# Retry a failed holiday refresh after this many seconds.
+HOLIDAYS_RETRY_AFTER = 5 * 60
+# Aggregate timespans planned against the calendar; a week or longer bar
+# covers trading days outside the requested range too.
+CALENDAR_PLANNED_TIMESPANS = {"minute", "hour", "day"}
+# Upper bound on how long a get_market_status response is reused, so
+# unscheduled closures still show up promptly.
+MARKET_STATUS_MAX_AGE = 60
+# Upper bound on how long real-time data is reused while the market is closed.
+CLOSED_MARKET_MAX_AGE = 5 * 60
+
+# (ttl, stale_ttl) in seconds per RESTClient method. Within ttl a cached
+# response is served as is; for stale_ttl after that it is still served while
+# a background refresh runs. Methods not listed are only deduplicated and
+# negatively cached.
+_REALTIME = (2.0, 15.0)
+_AGGREGATES = (60.0, 600.0)
+_TICKS = (30.0, 300.0)
+_NEWS = (60.0, 600.0)
+_REFERENCE = (15 * 60.0, 60 * 60.0)
+_STATIC = (24 * 60 * 60.0, 24 * 60 * 60.0)
+CACHE_POLICIES: Dict[str, tuple[float, float]] = {
+    "get_aggs": _AGGREGATES,
+    "list_aggs": _AGGREGATES,
+    "get_grouped_daily_aggs": _AGGREGATES,
+    "get_daily_open_close_agg": _AGGREGATES,
+    "get_previous_close_agg": _AGGREGATES,
+    "list_trades": _TICKS,
+    "list_quotes": _TICKS,
+    "get_last_trade": _REALTIME,
+    "get_last_quote": _REALTIME,
+    "get_last_crypto_trade": _REALTIME,
+    "get_last_forex_quote": _REALTIME,
+    "get_real_time_currency_conversion": _REALTIME,
+    "list_universal_snapshots": _REALTIME,
+    "get_snapshot_all": _REALTIME,
+    "get_snapshot_direction": _REALTIME,
+    "get_snapshot_ticker": _REALTIME,
+    "get_snapshot_option": _REALTIME,
+    "get_snapshot_crypto_book": _REALTIME,
+    "list_options_contracts": _REFERENCE,
+    "get_market_holidays": (HOLIDAYS_MAX_AGE, HOLIDAYS_MAX_AGE),
+    "list_tickers": _REFERENCE,
+    "get_ticker_details": _REFERENCE,
+    "list_ticker_news": _NEWS,
+    "get_ticker_types": _STATIC,
+    "list_splits": _REFERENCE,
+    "list_dividends": _REFERENCE,
+    "list_conditions": _STATIC,
+    "get_exchanges": _STATIC,
+    "vx.list_stock_financials": _REFERENCE,
+    "vx.list_ipos": _REFERENCE,
+    "list_short_interest": _REFERENCE,
+    "list_short_volume": _REFERENCE,
+    "list_treasury_yields": _REFERENCE,
+    "list_inflation": _REFERENCE,
+    "list_benzinga_analyst_insights": _NEWS,
+    "list_benzinga_analysts": _REFERENCE,
+    "list_benzinga_consensus_ratings": _REFERENCE,
+    "list_benzinga_earnings": _REFERENCE,
+    "list_benzinga_firms": _REFERENCE,
+    "list_benzinga_guidance": _REFERENCE,
+    "list_benzinga_news": _NEWS,
+    "list_benzinga_ratings": _NEWS,
+    "list_futures_aggregates": _AGGREGATES,
+    "list_futures_contracts": _REFERENCE,
+    "get_futures_contract_details": _REFERENCE,
+    "list_futures_products": _REFERENCE,
+    "get_futures_product_details": _REFERENCE,
+    "list_futures_quotes": _TICKS,
+    "list_futures_trades": _TICKS,
+    "list_futures_schedules": _REFERENCE,
+    "list_futures_schedules_by_product_code": _REFERENCE,
+    "list_futures_market_statuses": _REALTIME,
+    "get_futures_snapshot": _REALTIME,
+}
+
+# Equity real-time data is frozen while the market is closed, so these can be
+# cached until the next session boundary.
+_EQUITY_REALTIME = {
+    "get_last_trade",
+    "get_last_quote",
+    "get_snapshot_ticker",
+    "get_snapshot_all",
+    "get_snapshot_direction",
+    "get_snapshot_option",
+}
+
+# Upstream responses fetched with adjusted=true; dropped for a ticker when its
+# splits change. Aggregate bars are cached unadjusted and adjusted locally.
+_SPLIT_SENSITIVE = {"get_daily_open_close_agg", "get_grouped_daily_aggs"}
+
+# Per-tool deadlines in seconds for latency-critical endpoints. Requests to
+# these are timed out adaptively and hedged once they exceed the p95 latency.
+DEADLINES: Dict[str, float] = {
+    "get_last_trade": 3.0,
+    "get_last_quote": 3.0,
+    "get_snapshot_ticker": 5.0,
+}
+# Upstream accepts at most this many tickers in one ticker.any_of filter;
+# longer lists are split into chunks fetched concurrently.
+UNIVERSAL_SNAPSHOT_MAX_TICKERS = 250
+# Upper bound on the contracts returned by get_options_chain.
+OPTIONS_CHAIN_MAX_CONTRACTS = 5000
+# Seconds a USD quote in the local FX table is used before it is refreshed.
+FX_RATES_MAX_AGE = 5.0
+# News feeds mirrored in a local NewsStore: the fields identifying an
+# article, its publication time and the sync cursor, and the sort order
+# that returns articles in cursor order.
+NEWS_FEEDS: Dict[str, Dict[str, Any]] = {
+    "list_benzinga_news": {
+        "id_field": "benzinga_id",
+        "published_field": "published",
+        "cursor_field": "last_updated",
+        "sort": {"sort": "last_updated.asc"},
+    },
+    "list_ticker_news": {
+        "id_field": "id",
+        "published_field": "published_utc",
+        "cursor_field": "published_utc",
+        "sort": {"sort": "published_utc", "order": "asc"},
+    },
+}
+# Seconds between incremental syncs of a news store.
+NEWS_SYNC_INTERVAL = 30.0
+# How far back a new news store is filled, in seconds.
+NEWS_BACKFILL = 2 * 24 * 60 * 60
+# Articles loaded per sync; a sync that hits this continues on the next query.
+NEWS_SYNC_MAX_ARTICLES = 5000
+# Seconds before a ticker's financials are checked again for new filings.
+FINANCIALS_SYNC_INTERVAL = 6 * 60 * 60.0
+# Filings loaded per ticker and timeframe on the first sync.
+FINANCIALS_MAX_FILINGS = 40
+# Maximum number of tickers accepted by get_financial_metrics.
+FINANCIALS_MAX_TICKERS = 100
+# Append-only series mirrored in a local TimeSeries: the record date field
+# (also the prefix of its filters), whether a series is per ticker, the days
+# between releases, and the sort order that returns the newest records first.
+SERIES: Dict[str, Dict[str, Any]] = {
+    "list_short_interest": {
+        "date_field": "settlement_date",
+        "per_ticker": True,
+        "cadence_days": 15,
+        "newest_first": {"sort": "settlement_date", "order": "desc"},
+    },
+    "list_short_volume": {
+        "date_field": "date",
+        "per_ticker": True,
+        "cadence_days": 1,
+        "newest_first": {"sort": "date", "order": "desc"},
+    },
+    "list_treasury_yields": {
+        "date_field": "date",
+        "per_ticker": False,
+        "cadence_days": 1,
+        "newest_first": {"sort": "date", "order": "desc"},
+    },
+    "list_inflation": {
+        "date_field": "date",
+        "per_ticker": False,
+        "cadence_days": 28,
+        "newest_first": {"sort": "date.desc"},
+    },
+}
+# Seconds between checks for a release that is due but not yet published.
+SERIES_POLL_INTERVAL = 15 * 60.0
+# Records loaded per series fetch.
+SERIES_MAX_RECORDS = 100_000
+# Series held at once; the least recently used are dropped beyond this.
+SERIES_MAX_CACHED = 1000
+# Benzinga entity lists mirrored in a local EntityIndex, with their name
+# fields, and the seconds between reloads.
+BENZINGA_ENTITIES = {
+    "list_benzinga_analysts": "full_name",
+    "list_benzinga_firms": "name",
+}
+BENZINGA_ENTITIES_MAX_AGE = 24 * 60 * 60.0
+BENZINGA_ENTITIES_MAX = 100_000
+# Analysts or firms a name may match before it must be made more specific.
+BENZINGA_MAX_NAME_MATCHES = 25
+# Seconds between incremental syncs of the local Benzinga earnings and
+# guidance calendars, which fetch only events changed upstream.
+CALENDAR_SYNC_INTERVAL = 60.0
+# Seconds before a loaded week or ticker is reloaded whole, which also drops
+# events removed upstream.
+CALENDAR_RELOAD_INTERVAL = 24 * 60 * 60.0
+# Widest date range, and most tickers, a calendar query may load.
+CALENDAR_MAX_WEEKS = 13
+CALENDAR_MAX_TICKERS = 20
+# Events loaded per calendar fetch.
+CALENDAR_MAX_EVENTS = 50_000
+# Seconds before cached futures products, contracts and schedules are
+# reloaded.
+FUTURES_REFERENCE_MAX_AGE = 24 * 60 * 60.0
+# Days of past trading sessions loaded per futures product.
+FUTURES_SCHEDULE_HISTORY_DAYS = 400
+# Records loaded per futures reference fetch.
+FUTURES_REFERENCE_MAX = 50_000
+# Bars loaded per contract segment of a continuous futures series.
+FUTURES_SEGMENT_MAX_BARS = 50_000
+# Contracts whose bars are kept for continuous futures series, least
+# recently used evicted first.
+FUTURES_BARS_MAX_CACHED = 500
+# Futures tables held whole in memory, by method, with the field they are
+# keyed by.
+FUTURES_LIVE_TABLES = {
+    "get_futures_snapshot": "ticker",
+    "list_futures_market_statuses": "product_code",
+}
+# Seconds past the refresh interval a live table is still served while it
+# refreshes in the background; older tables are refreshed before reading.
+FUTURES_LIVE_MAX_STALE = 60.0
+# Rows loaded per live table refresh.
+FUTURES_LIVE_MAX_ROWS = 50_000
+# Seconds before the cached condition and exchange names are reloaded.
+CODE_BOOK_MAX_AGE = 24 * 60 * 60.0
+# Conditions loaded per code book reload.
+CODE_BOOK_MAX_CONDITIONS = 10_000
+# Maximum number of calls accepted by the batch tool.
+BATCH_MAX_CALLS = 25
+# Upstream requests one tool call fanning out over tickers or chunks keeps in
+# flight at once, well below POLYGON_MAX_IN_FLIGHT so a single call can't use
+# up admission and have its own requests shed.
+FANOUT_MAX_CONCURRENCY = max(1, POLYGON_MAX_IN_FLIGHT // 8)
+# Adaptive timeouts are this multiple of p99 latency, within [floor, deadline].
+TIMEOUT_P99_MULTIPLIER = 3.0
+TIMEOUT_FLOOR = 0.5
+
+shared_state = SharedState(MCP_POLYGON_STATE_DB) if MCP_POLYGON_STATE_DB else None
+
+market_calendar = MarketCalendar()
+response_cache = ResponseCache(store=shared_state)
+if shared_state is not None:
+    rate_limiter = SharedRateLimiter(shared_state, POLYGON_RATE_LIMIT)
+else:
+    rate_limiter = RateLimiter(POLYGON_RATE_LIMIT)
+
+
+def _new_rate_limiter(name: str) -> RateLimiter:
+    if shared_state is not None:
+        return SharedRateLimiter(shared_state, POLYGON_RATE_LIMIT, name=name)
+    return RateLimiter(POLYGON_RATE_LIMIT)
+
+
+def _forget_api_key(key_id: str) -> None:
+    """Drop the local stores held for an API key whose client left the pool."""
+    for stores in (fx_rates, financials_stores, futures_references, code_books):
+        stores.pop(key_id, None)
+    # Keyed by (method, key_id, ...), except futures bars by (key_id, ...).
+    for stores, position in (
+        (news_stores, 1),
+        (series_cache, 1),
+        (benzinga_entities, 1),
+        (calendars, 1),
+        (live_tables, 1),
+        (futures_bars, 0),
+    ):
+        for key in [key for key in stores if key[position] == key_id]:
+            del stores[key]
+
+
+client_pool = ClientPool(
+    _new_client, _new_rate_limiter, POLYGON_MAX_CLIENTS, on_evict=_forget_api_key
+)
+latency_tracker = LatencyTracker()
+# Threads running blocking RESTClient calls. A call whose caller gave up (a
+# timed-out request or a losing hedge) keeps its thread until the HTTP
+# request ends, so the pool is bounded like admission: once it is full, new
+# calls queue behind the abandoned ones instead of adding threads.
+upstream_executor = ThreadPoolExecutor(
+    max_workers=max(1, POLYGON_MAX_IN_FLIGHT), thread_name_prefix="polygon-upstream"
+)
+hedge_budget = HedgeBudget(POLYGON_HEDGE_BUDGET)
+admission_controller = AdmissionController(POLYGON_MAX_IN_FLIGHT)
+circuit_breakers: Dict[str, CircuitBreaker] = {}
+delta_cursors = DeltaCursors()
+fx_rates: Dict[str, FxRates] = {}
+news_stores: Dict[tuple[str, str], NewsStore] = {}
+financials_stores: Dict[str, FinancialsStore] = {}
+series_cache: OrderedDict[tuple, TimeSeries] = OrderedDict()
+benzinga_entities: Dict[tuple[str, str], EntityIndex] = {}
+calendars: Dict[tuple[str, str], EventCalendar] = {}
+futures_references: Dict[str, FuturesReference] = {}
+futures_bars: OrderedDict[tuple, ContractBars] = OrderedDict()
+live_tables: Dict[tuple[str, str], LiveTable] = {}
+code_books: Dict[str, CodeBook] = {}
+_holidays_retry_at = 0.0
+# Parsed full-market snapshots by (market_type, include_otc), paired with the
+# cached body they were parsed from so a new body is parsed once.
+_screen_rows: Dict[tuple, tuple[str, List[Dict[str, Any]]]] = {}
+_split_fingerprints: Dict[str, tuple] = {}
+
+
+async def _fetch(method: str, **kwargs: Any) -> str:
+    """
+    Call a RESTClient method through the response cache.
+
+    Args:
+        method: RESTClient method name, e.g. "get_aggs" or "vx.list_ipos"
+        **kwargs: Arguments for the method, excluding raw
+
+    Returns:
+        The decoded response body
+    """
+    client = _current_client()
+    ttl, stale_ttl = await _cache_policy(method, kwargs)
+    # Responses are cached per API key, since entitlements differ by plan.
+    key = json.dumps([method, kwargs, client.key_id], sort_keys=True, default=str)
+
+    async def fetch() -> str:
+        return await _request_upstream(client, method, kwargs)
+
+    return await response_cache.get_or_fetch(key, fetch, ttl, stale_ttl)
+
+
+def _current_client() -> PooledClient:
+    """
+    Return the client for the current request.
+
+    Requests carrying their own API key get a pooled client for that key;
+    everything else uses the server's POLYGON_API_KEY.
+    """
+    api_key = request_api_key()
+    if api_key is None or api_key == POLYGON_API_KEY:
+        return PooledClient(polygon_client, rate_limiter, "")
+    return client_pool.get(api_key)
+
+
+async def _gather_bounded(*aws: Any, return_exceptions: bool = False) -> List[Any]:
+    """Like asyncio.gather, running at most FANOUT_MAX_CONCURRENCY at once."""
+    semaphore = asyncio.Semaphore(FANOUT_MAX_CONCURRENCY)
+
+    async def run(aw: Any) -> Any:
+        async with semaphore:
+            return await aw
+
+    return await asyncio.gather(
+        *(run(aw) for aw in aws), return_exceptions=return_exceptions
+    )
+
+
+async def _request_upstream(
+    client: PooledClient,
+    method: str,
+    kwargs: Dict[str, Any],
+    endpoint: Optional[str] = None,
+) -> str:
+    """
+    Send one request upstream through the shared request policies.
+
+    The request passes admission control, its endpoint family's circuit
+    breaker and the API key's rate limiter, in that order. Latency-critical
+    methods are hedged.
+
+    Args:
+        client: Client for the current request's API key
+        method: RESTClient method to call
+        kwargs: Arguments for the method, excluding raw
+        endpoint: Method whose breaker, latency and deadline the request
+            counts against (default method), e.g. the list method for a
+            follow-up page fetched with "_get"
+
+    Raises:
+        Unavailable: If the request was shed or the circuit is open
+    """
+    endpoint = endpoint or method
+    family = endpoint_family(endpoint)
+    breaker = circuit_breakers.get(family)
+    if breaker is None:
+        breaker = circuit_breakers[family] = CircuitBreaker(family)
+    with admission_controller.slot():
+        breaker.before_call()
+        try:
+            await client.rate_limiter.acquire()
+            if endpoint not in DEADLINES:
+                results = await _call_upstream(client.client, method, kwargs, endpoint)
+            else:
+                hedge_budget.earn()
+                results = await hedged_call(
+                    lambda: _call_upstream(client.client, method, kwargs, endpoint),
+                    timeout=_adaptive_timeout(endpoint),
+                    hedge_after=latency_tracker.percentile(endpoint, 0.95),
+                    can_hedge=lambda: _try_hedge(client),
+                )
+        except BadResponse:
+            # Non-retryable 4xx responses say nothing about upstream health.
+            breaker.release()
+            raise
+        except Exception:
+            breaker.record_failure()
+            raise
+        except BaseException:
+            breaker.release()
+            raise
+
+        breaker.record_success()
+        return results
+
+
+def _try_hedge(client: PooledClient) -> bool:
+    """
+    Pay for a hedge with a budget credit and a rate-limit token, or neither.
+
+    The token is taken first, so a credit is only spent on a hedge that is
+    actually sent.
+    """
+    if not hedge_budget.available():
+        return False
+    if not client.rate_limiter.try_acquire():
+        return False
+    return hedge_budget.try_spend()
+
+
+async def _call_upstream(
+    client: RESTClient,
+    method: str,
+    kwargs: Dict[str, Any],
+    endpoint: Optional[str] = None,
+) -> str:
+    """
+    Run one blocking RESTClient call on upstream_executor.
+
+    Its latency is recorded under endpoint (default method). Cancelling the
+    caller doesn't stop the HTTP request; it finishes in the background,
+    holding its thread, and has already used its rate-limit token.
+    """
+    func = client
+    for name in method.split("."):
+        func = getattr(func, name)
+
+    start = time.monotonic()
+    try:
+        results = await asyncio.get_running_loop().run_in_executor(
+            upstream_executor, functools.partial(func, raw=True, **kwargs)
+        )
+    finally:
+        # Timed-out and cancelled calls count too, so a slowdown raises the
+        # learned timeout instead of hiding from it.
+        latency_tracker.record(endpoint or method, time.monotonic() - start)
+    return results.data.decode("utf-8")
+
+
+async def _fetch_pages(
+    method: str,
+    max_results: int,
+    policy: Optional[tuple[float, float]] = None,
+    **kwargs: Any,
+) -> List[Dict[str, Any]]:
+    """
+    Fetch a paginated endpoint's results, following next_url.
+
+    The combined results are cached as one entry under the method's cache
+    policy, so later calls don't walk the pages again.
+
+    Args:
+        method: RESTClient method returning a paginated "results" list
+        max_results: Stop fetching pages once this many results are loaded
+        policy: (ttl, stale_ttl) overriding the method's cache policy
+        **kwargs: Arguments for the method, excluding raw
+
+    Returns:
+        Up to max_results results, in upstream order
+    """
+    client = _current_client()
+    ttl, stale_ttl = policy or await _cache_policy(method, kwargs)
+    key = json.dumps(
+        [f"{method}:pages", {**kwargs, "max_results": max_results}, client.key_id],
+        sort_keys=True,
+        default=str,
+    )
+
+    async def fetch() -> str:
+        page = json.loads(await _request_upstream(client, method, kwargs))
+        results = page.get("results") or []
+        while page.get("next_url") and len(results) < max_results:
+            next_url = urlparse(page["next_url"])
+            path = f"{next_url.path}?{next_url.query}"
+            # Later pages count against the list method, not a shared "_get".
+            page = json.loads(
+                await _request_upstream(client, "_get", {"path": path}, method)
+            )
+            results.extend(page.get("results") or [])
+        return json.dumps(results[:max_results])
+
+    return json.loads(await response_cache.get_or_fetch(key, fetch, ttl, stale_ttl))
+
+
+def _adaptive_timeout(method: str) -> float:
+    """Return a timeout learned from observed latency, capped by the tool deadline."""
+    deadline = DEADLINES[method]
+    p99 = latency_tracker.percentile(method, 0.99)
+    if p99 is None:
+        return deadline
+    return min(deadline, max(TIMEOUT_FLOOR, p99 * TIMEOUT_P99_MULTIPLIER))
+
+
+async def _fetch_aggs(
+    method: str, ticker: str, adjusted: Optional[bool], **kwargs: Any
+) -> Union[str, Dict[str, Any]]:
+    """
+    Fetch aggregate bars, applying split adjustment locally for stocks.
+
+    Bars are always requested unadjusted so one cached series serves both
+    adjusted variants. If the ticker's splits can't be loaded, falls back to
+    letting upstream adjust.
+    """
+    if adjusted is False or not has_corporate_actions(ticker):
+        return await _fetch(method, ticker=ticker, adjusted=adjusted, **kwargs)
+
+    try:
+        adjuster = await _split_adjuster(ticker)
+    except Exception:
+        return await _fetch(method, ticker=ticker, adjusted=adjusted, **kwargs)
+
+    results = await _fetch(method, ticker=ticker, adjusted=False, **kwargs)
+    return adjuster.adjust_response(json.loads(results))
+
+
+async def _split_adjuster(ticker: str) -> SplitAdjuster:
+    """
+    Load a ticker's splits through the cache and build its adjuster.
+
+    When the splits differ from the last ones seen, cached upstream-adjusted
+    responses for that ticker are invalidated.
+    """
+    results = json.loads(await _fetch("list_splits", ticker=ticker, limit=1000))
+    splits = results.get("results", [])
+
+    fingerprint = split_fingerprint(splits)
+    previous = _split_fingerprints.get(ticker)
+    _split_fingerprints[ticker] = fingerprint
+    if previous is not None and previous != fingerprint:
+        _invalidate_split_sensitive(ticker)
+
+    return SplitAdjuster(splits)
+
+
+def _invalidate_split_sensitive(ticker: str) -> None:
+    """Drop cached adjusted responses that mention the ticker."""
+
+    def affected(key: str) -> bool:
+        method, kwargs, _ = json.loads(key)
+        if method not in _SPLIT_SENSITIVE or kwargs.get("adjusted") is False:
+            return False
+        # Grouped daily bars cover every ticker.
+        return method == "get_grouped_daily_aggs" or kwargs.get("ticker") == ticker
+
+    response_cache.invalidate(affected)
+
+
+async def _cache_policy(method: str, kwargs: Dict[str, Any]) -> tuple[float, float]:
+    """Return (ttl, stale_ttl) for a request, extended while the market is closed."""
+    if method == "get_market_status":
+        # The status can only change at the next session boundary.
+        calendar = await _refresh_market_calendar()
+        return min(calendar.seconds_until_transition(), MARKET_STATUS_MAX_AGE), 0.0
+
+    ttl, stale_ttl = CACHE_POLICIES.get(method, (0.0, 0.0))
+    if method in _EQUITY_REALTIME and kwargs.get("market_type") not in (
+        "crypto",
+        "forex",
+    ):
+        calendar = await _refresh_market_calendar()
+        if calendar.status()["market"] == "closed":
+            ttl = max(
+                ttl, min(calendar.seconds_until_transition(), CLOSED_MARKET_MAX_AGE)
+            )
+    return ttl, stale_ttl
+
+
+async def _refresh_market_calendar() -> MarketCalendar:
+    """
+    Return the shared trading calendar, reloading holidays when stale.
+
+    A failed reload keeps the previous holidays (or weekends only) and is
+    retried after HOLIDAYS_RETRY_AFTER seconds.
+    """
+    global _holidays_retry_at
+    now = time.time()
+    if market_calendar.is_stale(HOLIDAYS_MAX_AGE) and now >= _holidays_retry_at:
+        try:
+            results = await _fetch("get_market_holidays")
+            market_calendar.load_holidays(json.loads(results))
+        except Exception:
+            _holidays_retry_at = now + HOLIDAYS_RETRY_AFTER
+    return market_calendar
+
+
+async def _range_has_trading_days(
+    ticker: str,
+    timespan: str,
+    from_: Union[str, int, datetime, date],
+    to: Union[str, int, datetime, date],
+) -> bool:
+    """
+    Plan an aggregates request against the local calendar.
+
+    Returns False only when the ticker follows the equity calendar, the bars
+    are at most a day long and the whole range is non-trading days, meaning
+    upstream would return no bars. Coarser bars are returned for any range
+    overlapping their period.
+    """
+    if timespan not in CALENDAR_PLANNED_TIMESPANS:
+        return True
+    if not follows_equity_calendar(ticker):
+        return True
+    start, end = to_market_date(from_), to_market_date(to)
+    if start is None or end is None:
+        return True
+    calendar = await _refresh_market_calendar()
+    return calendar.has_trading_day(start, end)
+
 
 @poly_mcp.tool(annotations=ToolAnnotations(readOnlyHint=True))
 async def get_aggs(
@@ -40,21 +717,23 @@ async def get_aggs(
     List aggregate bars for a ticker over a given date range in custom time window sizes.
     """
     try:
-        results = polygon_client.get_aggs(
+        if not await _range_has_trading_days(ticker, timespan, from_, to):
+            return ""
+
+        results = await _fetch_aggs(
+            "get_aggs",
             ticker=ticker,
+            adjusted=adjusted,
             multiplier=multiplier,
             timespan=timespan,
             from_=from_,
             to=to,
-            adjusted=adjusted,
             sort=sort,
             limit=limit,
             params=params,
-            raw=True,
         )
 
-        # Parse the binary data to string and then to JSON
-        return json_to_csv(results.data.decode("utf-8"))
+        return json_to_csv(results)
     except Exception as e:
         return f"Error: {e}"
 
@@ -75,20 +754,23 @@ async def list_aggs(
     Iterate through aggregate bars for a ticker over a given date range.
     """
     try:
-        results = polygon_client.list_aggs(
+        if not await _range_has_trading_days(ticker, timespan, from_, to):
+            return ""
+
+        results = await _fetch_aggs(
+            "list_aggs",
             ticker=ticker,
+            adjusted=adjusted,
             multiplier=multiplier,
             timespan=timespan,
             from_=from_,
             to=to,
-            adjusted=adjusted,
             sort=sort,
             limit=limit,
             params=params,
-            raw=True,
         )
 
-        return json_to_csv(results.data.decode("utf-8"))
+        return json_to_csv(results)
     except Exception as e:
         return f"Error: {e}"
 
@@ -106,17 +788,17 @@ async def get_grouped_daily_aggs(
     Get grouped daily bars for entire market for a specific date.
     """
     try:
-        results = polygon_client.get_grouped_daily_aggs(
+        results = await _fetch(
+            "get_grouped_daily_aggs",
             date=date,
             adjusted=adjusted,
             include_otc=include_otc,
             locale=locale,
             market_type=market_type,
             params=params,
-            raw=True,
         )
 
-        return json_to_csv(results.data.decode("utf-8"))
+        return json_to_csv(results)
     except Exception as e:
         return f"Error: {e}"
 
@@ -132,11 +814,15 @@ async def get_daily_open_close_agg(
     Get daily open, close, high, and low for a specific ticker and date.
     """
     try:
-        results = polygon_client.get_daily_open_close_agg(
-            ticker=ticker, date=date, adjusted=adjusted, params=params, raw=True
+        results = await _fetch(
+            "get_daily_open_close_agg",
+            ticker=ticker,
+            date=date,
+            adjusted=adjusted,
+            params=params,
         )
 
-        return json_to_csv(results.data.decode("utf-8"))
+        return json_to_csv(results)
     except Exception as e:
         return f"Error: {e}"
 
@@ -151,11 +837,11 @@ async def get_previous_close_agg(
     Get previous day's open, close, high, and low for a specific ticker.
     """
     try:
-        results = polygon_client.get_previous_close_agg(
-            ticker=ticker, adjusted=adjusted, params=params, raw=True
+        results = await _fetch_aggs(
+            "get_previous_close_agg", ticker=ticker, adjusted=adjusted, params=params
         )
 
-        return json_to_csv(results.data.decode("utf-8"))
+        return json_to_csv(results)
     except Exception as e:
         return f"Error: {e}"
 
@@ -171,13 +857,19 @@ async def list_trades(
     limit: Optional[int] = 10,
     sort: Optional[str] = None,
     order: Optional[str] = None,
+    decode: Optional[bool] = False,
     params: Optional[Dict[str, Any]] = None,
 ) -> str:
     """
     Get trades for a ticker symbol.
+
+    With decode, condition and exchange codes are followed by their names
+    (condition_names and *_name columns), from a locally cached copy of
+    list_conditions and get_exchanges.
     """
     try:
-        results = polygon_client.list_trades(
+        results = await _fetch(
+            "list_trades",
             ticker=ticker,
             timestamp=timestamp,
             timestamp_lt=timestamp_lt,
@@ -188,10 +880,11 @@ async def list_trades(
             sort=sort,
             order=order,
             params=params,
-            raw=True,
         )
 
-        return json_to_csv(results.data.decode("utf-8"))
+        if decode:
+            return await _decoded(results, ticker, "trades")
+        return json_to_csv(results)
     except Exception as e:
         return f"Error: {e}"
 
@@ -205,9 +898,9 @@ async def get_last_trade(
     Get the most recent trade for a ticker symbol.
     """
     try:
-        results = polygon_client.get_last_trade(ticker=ticker, params=params, raw=True)
+        results = await _fetch("get_last_trade", ticker=ticker, params=params)
 
-        return json_to_csv(results.data.decode("utf-8"))
+        return json_to_csv(results)
     except Exception as e:
         return f"Error: {e}"
 
@@ -222,11 +915,11 @@ async def get_last_crypto_trade(
     Get the most recent trade for a crypto pair.
     """
     try:
-        results = polygon_client.get_last_crypto_trade(
-            from_=from_, to=to, params=params, raw=True
+        results = await _fetch(
+            "get_last_crypto_trade", from_=from_, to=to, params=params
         )
 
-        return json_to_csv(results.data.decode("utf-8"))
+        return json_to_csv(results)
     except Exception as e:
         return f"Error: {e}"
 
@@ -242,13 +935,19 @@ async def list_quotes(
     limit: Optional[int] = 10,
     sort: Optional[str] = None,
     order: Optional[str] = None,
+    decode: Optional[bool] = False,
     params: Optional[Dict[str, Any]] = None,
 ) -> str:
     """
     Get quotes for a ticker symbol.
+
+    With decode, condition and exchange codes are followed by their names
+    (condition_names and *_name columns), from a locally cached copy of
+    list_conditions and get_exchanges.
     """
     try:
-        results = polygon_client.list_quotes(
+        results = await _fetch(
+            "list_quotes",
             ticker=ticker,
             timestamp=timestamp,
             timestamp_lt=timestamp_lt,
@@ -259,10 +958,11 @@ async def list_quotes(
             sort=sort,
             order=order,
             params=params,
-            raw=True,
         )
 
-        return json_to_csv(results.data.decode("utf-8"))
+        if decode:
+            return await _decoded(results, ticker, "quotes")
+        return json_to_csv(results)
     except Exception as e:
         return f"Error: {e}"
 
@@ -276,13 +976,44 @@ async def get_last_quote(
     Get the most recent quote for a ticker symbol.
     """
     try:
-        results = polygon_client.get_last_quote(ticker=ticker, params=params, raw=True)
+        results = await _fetch("get_last_quote", ticker=ticker, params=params)
 
-        return json_to_csv(results.data.decode("utf-8"))
+        return json_to_csv(results)
     except Exception as e:
         return f"Error: {e}"
 
 
+async def _decoded(results: str, ticker: str, kind: str) -> str:
+    """Return trades or quotes as CSV with condition and exchange names added."""
+    data = json.loads(results)
+    records = data.get("results") or []
+    if records:
+        book = await _code_book()
+        data["results"] = book.decode(records, asset_class(ticker), kind)
+    return json_to_csv(data)
+
+
+async def _code_book() -> CodeBook:
+    """Return the API key's condition and exchange names, reloading them daily."""
+    key_id = _current_client().key_id
+    book = code_books.get(key_id)
+    if book is None:
+        book = code_books[key_id] = CodeBook()
+    async with book.lock:
+        if time.monotonic() - book.loaded_at >= CODE_BOOK_MAX_AGE:
+            conditions, exchanges = await asyncio.gather(
+                _fetch_pages(
+                    "list_conditions",
+                    CODE_BOOK_MAX_CONDITIONS,
+                    policy=(0.0, 0.0),
+                    limit=1000,
+                ),
+                _fetch("get_exchanges"),
+            )
+            book.load(conditions, json.loads(exchanges).get("results") or [])
+    return book
+
+
 @poly_mcp.tool(annotations=ToolAnnotations(readOnlyHint=True))
 async def get_last_forex_quote(
     from_: str,
@@ -293,11 +1024,11 @@ async def get_last_forex_quote(
     Get the most recent forex quote.
     """
     try:
-        results = polygon_client.get_last_forex_quote(
-            from_=from_, to=to, params=params, raw=True
+        results = await _fetch(
+            "get_last_forex_quote", from_=from_, to=to, params=params
         )
 
-        return json_to_csv(results.data.decode("utf-8"))
+        return json_to_csv(results)
     except Exception as e:
         return f"Error: {e}"
 
@@ -314,20 +1045,155 @@ async def get_real_time_currency_conversion(
     Get real-time currency conversion.
     """
     try:
-        results = polygon_client.get_real_time_currency_conversion(
+        results = await _fetch(
+            "get_real_time_currency_conversion",
             from_=from_,
             to=to,
             amount=amount,
             precision=precision,
             params=params,
-            raw=True,
         )
 
-        return json_to_csv(results.data.decode("utf-8"))
+        return json_to_csv(results)
     except Exception as e:
         return f"Error: {e}"
 
 
+@poly_mcp.tool(annotations=ToolAnnotations(readOnlyHint=True))
+async def get_fx_rates(
+    currencies: List[str],
+) -> str:
+    """
+    Get a matrix of cross rates between currencies, e.g. ["USD", "EUR", "JPY"].
+
+    Each row gives the units of every column currency per one unit of the
+    row currency, from mid quotes refreshed every few seconds. Pairs without
+    a USD quote are converted upstream directly. Rows whose quote couldn't
+    be refreshed add as_of (when the rate used was quoted) and error.
+    """
+    try:
+        currencies = list(dict.fromkeys(currency.upper() for currency in currencies))
+        rates = await _refresh_fx_rates(currencies)
+        rows = rates.matrix(currencies)
+
+        missing = []
+        for row in rows:
+            for other in currencies:
+                if row[other] is None:
+                    if other == row["currency"]:
+                        row[other] = 1.0
+                    else:
+                        missing.append((row["currency"], other))
+        direct = await _gather_bounded(
+            *(_direct_fx_rate(from_, to) for from_, to in missing),
+            return_exceptions=True,
+        )
+        by_currency = {row["currency"]: row for row in rows}
+        for (from_, to), rate in zip(missing, direct):
+            if not isinstance(rate, Exception):
+                by_currency[from_][to] = rate
+
+        for row in rows:
+            row.update(rates.staleness(row["currency"]))
+        return json_to_csv(rows)
+    except Exception as e:
+        return f"Error: {e}"
+
+
+@poly_mcp.tool(annotations=ToolAnnotations(readOnlyHint=True))
+async def convert_currencies(
+    amounts: Dict[str, float],
+    to: str,
+) -> str:
+    """
+    Convert amounts in several currencies into one currency and total them.
+
+    amounts maps currency codes to amounts, e.g. {"EUR": 1000, "JPY": 250000}.
+    Rates come from a local table of mid quotes, so converting a whole
+    portfolio costs at most one quote per currency.
+    """
+    try:
+        to = to.upper()
+        amounts = {currency.upper(): amount for currency, amount in amounts.items()}
+        rates = await _refresh_fx_rates([*amounts, to])
+
+        rows = []
+        total = 0.0
+        for currency, amount in amounts.items():
+            rate = rates.cross(currency, to)
+            staleness = rates.staleness(currency) or rates.staleness(to)
+            if rate is None:
+                rate = await _direct_fx_rate(currency, to)
+                staleness = {}
+            converted = amount * rate
+            total += converted
+            rows.append(
+                {
+                    "currency": currency,
+                    "amount": amount,
+                    "rate": rate,
+                    "converted": converted,
+                    **staleness,
+                }
+            )
+        rows.append({"currency": "TOTAL", "converted": total})
+
+        return json_to_csv(rows)
+    except Exception as e:
+        return f"Error: {e}"
+
+
+async def _refresh_fx_rates(currencies: List[str]) -> FxRates:
+    """
+    Refresh stale USD quotes in the API key's FX table concurrently.
+
+    Currencies whose quote can't be loaded keep their previous rate, or stay
+    unknown, with the error recorded for FxRates.staleness.
+    """
+    key_id = _current_client().key_id
+    rates = fx_rates.get(key_id)
+    if rates is None:
+        rates = fx_rates[key_id] = FxRates(FX_RATES_MAX_AGE)
+    stale = [c for c in rates.stale(currencies) if c != PIVOT_CURRENCY]
+    responses = await _gather_bounded(
+        *(
+            _fetch("get_last_forex_quote", from_=PIVOT_CURRENCY, to=c, params=None)
+            for c in stale
+        ),
+        return_exceptions=True,
+    )
+    for currency, response in zip(stale, responses):
+        if isinstance(response, Exception):
+            rates.set_error(currency, str(response) or type(response).__name__)
+            continue
+        last = json.loads(response).get("last") or {}
+        # Quote timestamps are Unix milliseconds.
+        timestamp = last.get("timestamp")
+        try:
+            rates.set_quote(
+                currency,
+                last["bid"],
+                last["ask"],
+                as_of=timestamp / 1000 if timestamp else None,
+            )
+        except (KeyError, TypeError, ValueError) as e:
+            rates.set_error(currency, f"No usable USD/{currency} quote: {e!r}")
+    return rates
+
+
+async def _direct_fx_rate(from_: str, to: str) -> float:
+    """Ask upstream for one pair's rate, for currencies with no USD quote."""
+    results = await _fetch(
+        "get_real_time_currency_conversion",
+        from_=from_,
+        to=to,
+        amount=1,
+        precision=None,
+        params=None,
+    )
+    return json.loads(results)["converted"]
+
+
 @poly_mcp.tool(annotations=ToolAnnotations(readOnlyHint=True))
 async def list_universal_snapshots(
     type: str,
@@ -336,46 +1202,192 @@ async def list_universal_snapshots(
     limit: Optional[int] = 10,
     sort: Optional[str] = None,
     params: Optional[Dict[str, Any]] = None,
+    delta: Optional[bool] = None,
+    cursor: Optional[str] = None,
+    min_change_pct: Optional[float] = None,
 ) -> str:
     """
     Get universal snapshots for multiple assets of a specific type.
+
+    ticker_any_of may list any number of tickers; lists longer than the
+    upstream maximum of 250 are fetched in concurrent chunks, merged, then
+    sorted and limited as one list.
+
+    For polling, set delta=True: the first line of the response is then
+    "cursor=<token> changed=<n> total=<n>". Pass the cursor back on the next
+    poll to receive only tickers whose values changed (by more than
+    min_change_pct percent, if given) since the previous poll.
     """
     try:
-        results = polygon_client.list_universal_snapshots(
+        kwargs = dict(
             type=type,
             ticker_any_of=ticker_any_of,
             order=order,
             limit=limit,
             sort=sort,
             params=params,
-            raw=True,
         )
-
-        return json_to_csv(results.data.decode("utf-8"))
+        results = await _fetch_universal_snapshots(**kwargs)
+        if delta or cursor:
+            return _snapshot_delta(
+                "list_universal_snapshots",
+                kwargs,
+                json.loads(results).get("results") or [],
+                cursor,
+                min_change_pct,
+            )
+
+        return json_to_csv(results)
     except Exception as e:
         return f"Error: {e}"
 
 
+async def _fetch_universal_snapshots(
+    ticker_any_of: Optional[List[str]],
+    limit: Optional[int],
+    order: Optional[str],
+    sort: Optional[str],
+    **kwargs: Any,
+) -> str:
+    """
+    Fetch universal snapshots, splitting long ticker lists into chunks.
+
+    Each chunk is a separate cached request for all of its tickers, so
+    overlapping watchlists share upstream calls. The merged results are
+    sorted by the sort field (ticker if only order is given) and cut to
+    limit here, as upstream would for a single request.
+    """
+    if not ticker_any_of or len(ticker_any_of) <= UNIVERSAL_SNAPSHOT_MAX_TICKERS:
+        return await _fetch(
+            "list_universal_snapshots",
+            ticker_any_of=ticker_any_of,
+            limit=limit,
+            order=order,
+            sort=sort,
+            **kwargs,
+        )
+
+    tickers = list(dict.fromkeys(ticker_any_of))
+    chunks = [
+        tickers[i : i + UNIVERSAL_SNAPSHOT_MAX_TICKERS]
+        for i in range(0, len(tickers), UNIVERSAL_SNAPSHOT_MAX_TICKERS)
+    ]
+    responses = await _gather_bounded(
+        *(
+            _fetch(
+                "list_universal_snapshots",
+                ticker_any_of=chunk,
+                limit=len(chunk),
+                **kwargs,
+            )
+            for chunk in chunks
+        )
+    )
+    results = []
+    for response in responses:
+        results.extend(json.loads(response).get("results") or [])
+
+    if sort or order:
+        field = sort or "ticker"
+        # Rows missing the field go last in either order, as upstream does.
+        present = [row for row in results if row.get(field) is not None]
+        missing = [row for row in results if row.get(field) is None]
+        present.sort(key=lambda row: row[field], reverse=order == "desc")
+        results = present + missing
+    if limit:
+        results = results[:limit]
+    return json.dumps({"status": "OK", "results": results})
+
+
 @poly_mcp.tool(annotations=ToolAnnotations(readOnlyHint=True))
 async def get_snapshot_all(
     market_type: str,
     tickers: Optional[List[str]] = None,
     include_otc: Optional[bool] = None,
     params: Optional[Dict[str, Any]] = None,
+    delta: Optional[bool] = None,
+    cursor: Optional[str] = None,
+    min_change_pct: Optional[float] = None,
 ) -> str:
     """
     Get a snapshot of all tickers in a market.
+
+    For polling, set delta=True: the first line of the response is then
+    "cursor=<token> changed=<n> total=<n>". Pass the cursor back on the next
+    poll to receive only tickers whose values changed (by more than
+    min_change_pct percent, if given) since the previous poll.
     """
     try:
-        results = polygon_client.get_snapshot_all(
+        kwargs = dict(
             market_type=market_type,
             tickers=tickers,
             include_otc=include_otc,
             params=params,
-            raw=True,
         )
+        results = await _fetch("get_snapshot_all", **kwargs)
+        snapshots = json.loads(results).get("tickers") or []
+        if delta or cursor:
+            return _snapshot_delta(
+                "get_snapshot_all", kwargs, snapshots, cursor, min_change_pct
+            )
+
+        return json_to_csv(snapshots)
+    except Exception as e:
+        return f"Error: {e}"
+
+
+def _snapshot_delta(
+    method: str,
+    kwargs: Dict[str, Any],
+    records: List[Dict[str, Any]],
+    cursor: Optional[str],
+    min_change_pct: Optional[float],
+) -> str:
+    """Format the rows changed since a delta cursor, preceded by the next cursor."""
+    request = json.dumps(
+        [method, kwargs, _current_client().key_id], sort_keys=True, default=str
+    )
+    rows = [_flatten_dict(record) for record in records]
+    cursor, changed = delta_cursors.diff(cursor, request, rows, min_change_pct or 0.0)
+    header = f"cursor={cursor} changed={len(changed)} total={len(rows)}\n"
+    return header + json_to_csv(changed)
+
+
+@poly_mcp.tool(annotations=ToolAnnotations(readOnlyHint=True))
+async def screen_snapshot(
+    market_type: str = "stocks",
+    sort_by: str = "todaysChangePerc",
+    limit: int = 20,
+    ascending: bool = False,
+    min_volume: Optional[float] = None,
+    min_price: Optional[float] = None,
+    include_otc: Optional[bool] = None,
+) -> str:
+    """
+    Rank every ticker in a market by a numeric column and return the top N.
+
+    sort_by can be any numeric snapshot column (e.g. todaysChangePerc,
+    todaysChange, day_v, day_vw, prevDay_c, min_v) or a derived column:
+    price, spread, spread_pct, vwap_distance_pct or dollar_volume. Set
+    ascending to rank from the smallest value, e.g. tightest spreads or
+    biggest losers. Uses the same cached snapshot as get_snapshot_all.
+    """
+    try:
+        results = await _fetch(
+            "get_snapshot_all",
+            market_type=market_type,
+            tickers=None,
+            include_otc=include_otc,
+            params=None,
+        )
+        memo_key = (market_type, include_otc)
+        memo = _screen_rows.get(memo_key)
+        if memo is None or memo[0] is not results:
+            memo = _screen_rows[memo_key] = (results, snapshot_rows(results))
 
-        return json_to_csv(results.data.decode("utf-8"))
+        return json_to_csv(
+            top_n(memo[1], sort_by, limit, ascending, min_volume, min_price)
+        )
     except Exception as e:
         return f"Error: {e}"
 
@@ -391,15 +1403,15 @@ async def get_snapshot_direction(
     Get gainers or losers for a market.
     """
     try:
-        results = polygon_client.get_snapshot_direction(
+        results = await _fetch(
+            "get_snapshot_direction",
             market_type=market_type,
             direction=direction,
             include_otc=include_otc,
             params=params,
-            raw=True,
         )
 
-        return json_to_csv(results.data.decode("utf-8"))
+        return json_to_csv(results)
     except Exception as e:
         return f"Error: {e}"
 
@@ -414,11 +1426,11 @@ async def get_snapshot_ticker(
     Get snapshot for a specific ticker.
     """
     try:
-        results = polygon_client.get_snapshot_ticker(
-            market_type=market_type, ticker=ticker, params=params, raw=True
+        results = await _fetch(
+            "get_snapshot_ticker", market_type=market_type, ticker=ticker, params=params
         )
 
-        return json_to_csv(results.data.decode("utf-8"))
+        return json_to_csv(results)
     except Exception as e:
         return f"Error: {e}"
 
@@ -433,14 +1445,69 @@ async def get_snapshot_option(
     Get snapshot for a specific option contract.
     """
     try:
-        results = polygon_client.get_snapshot_option(
+        results = await _fetch(
+            "get_snapshot_option",
             underlying_asset=underlying_asset,
             option_contract=option_contract,
             params=params,
-            raw=True,
         )
 
-        return json_to_csv(results.data.decode("utf-8"))
+        return json_to_csv(results)
+    except Exception as e:
+        return f"Error: {e}"
+
+
+@poly_mcp.tool(annotations=ToolAnnotations(readOnlyHint=True))
+async def get_options_chain(
+    underlying_asset: str,
+    contract_type: Optional[str] = None,
+    expiration_date: Optional[Union[str, date]] = None,
+    expiration_date_gte: Optional[Union[str, date]] = None,
+    expiration_date_lte: Optional[Union[str, date]] = None,
+    strike_price_gte: Optional[float] = None,
+    strike_price_lte: Optional[float] = None,
+    max_contracts: Optional[int] = 1000,
+) -> str:
+    """
+    Get quotes, greeks and implied volatility for a filtered options chain.
+
+    Filter by contract type (call/put), expiration date or range
+    (YYYY-MM-DD) and strike price band. The chain's contract list is cached,
+    and later calls only refresh the quote, trade, greeks, IV and open
+    interest fields. At most max_contracts contracts are returned.
+    """
+    try:
+        contracts = await _fetch_pages(
+            "list_options_contracts",
+            min(
+                max_contracts or OPTIONS_CHAIN_MAX_CONTRACTS,
+                OPTIONS_CHAIN_MAX_CONTRACTS,
+            ),
+            underlying_ticker=underlying_asset,
+            contract_type=contract_type,
+            expiration_date=expiration_date,
+            expiration_date_gte=expiration_date_gte,
+            expiration_date_lte=expiration_date_lte,
+            strike_price_gte=strike_price_gte,
+            strike_price_lte=strike_price_lte,
+            limit=1000,
+        )
+        if not contracts:
+            return ""
+
+        tickers = [contract["ticker"] for contract in contracts]
+        snapshots = await _fetch_universal_snapshots(
+            type="options",
+            ticker_any_of=tickers,
+            order=None,
+            limit=min(len(tickers), UNIVERSAL_SNAPSHOT_MAX_TICKERS),
+            sort=None,
+            params=None,
+        )
+
+        return json_to_csv(
+            merge_chain(contracts, json.loads(snapshots).get("results") or [])
+        )
     except Exception as e:
         return f"Error: {e}"
 
@@ -449,16 +1516,19 @@ async def get_snapshot_option(
 async def get_snapshot_crypto_book(
     ticker: str,
     params: Optional[Dict[str, Any]] = None,
+    depth: Optional[int] = 10,
 ) -> str:
     """
     Get snapshot for a crypto ticker's order book.
+
+    Returns a summary row (best bid/ask, mid, spread, imbalance over the
+    top depth levels, and cumulative size within 10, 50 and 100 bps of the
+    mid), then a ladder of the top depth levels per side.
     """
     try:
-        results = polygon_client.get_snapshot_crypto_book(
-            ticker=ticker, params=params, raw=True
-        )
+        results = await _fetch("get_snapshot_crypto_book", ticker=ticker, params=params)
 
-        return json_to_csv(results.data.decode("utf-8"))
+        return format_order_book(results, depth=10 if depth is None else depth)
     except Exception as e:
         return f"Error: {e}"
 
@@ -471,9 +1541,9 @@ async def get_market_holidays(
     Get upcoming market holidays and their open/close times.
     """
     try:
-        results = polygon_client.get_market_holidays(params=params, raw=True)
+        results = await _fetch("get_market_holidays", params=params)
 
-        return json_to_csv(results.data.decode("utf-8"))
+        return json_to_csv(results)
     except Exception as e:
         return f"Error: {e}"
 
@@ -486,9 +1556,44 @@ async def get_market_status(
     Get current trading status of exchanges and financial markets.
     """
     try:
-        results = polygon_client.get_market_status(params=params, raw=True)
+        results = await _fetch("get_market_status", params=params)
 
-        return json_to_csv(results.data.decode("utf-8"))
+        return json_to_csv(results)
+    except Exception as e:
+        return f"Error: {e}"
+
+
+@poly_mcp.tool(annotations=ToolAnnotations(readOnlyHint=True))
+async def get_trading_calendar(
+    date: Optional[str] = None,
+) -> str:
+    """
+    Get US equity market status, session hours and adjacent trading days.
+
+    Computed from a locally cached holiday calendar without an upstream call.
+
+    Status is for the current time; session hours and trading days are for
+    the given date (YYYY-MM-DD, defaults to today in US/Eastern).
+    """
+    try:
+        calendar = await _refresh_market_calendar()
+        status = calendar.status()
+        day = to_market_date(date) if date else to_market_date(status["serverTime"])
+        if day is None:
+            return f"Error: invalid date {date!r}"
+
+        session = calendar.session(day) or {}
+        return json_to_csv(
+            {
+                **status,
+                "date": day.isoformat(),
+                "isTradingDay": calendar.is_trading_day(day),
+                "earlyClose": day in calendar.early_closes,
+                **{key: value.isoformat() for key, value in session.items()},
+                "previousTradingDay": calendar.previous_trading_day(day).isoformat(),
+                "nextTradingDay": calendar.next_trading_day(day).isoformat(),
+            }
+        )
     except Exception as e:
         return f"Error: {e}"
 
@@ -513,7 +1618,8 @@ async def list_tickers(
     Query supported ticker symbols across stocks, indices, forex, and crypto.
     """
     try:
-        results = polygon_client.list_tickers(
+        results = await _fetch(
+            "list_tickers",
             ticker=ticker,
             type=type,
             market=market,
@@ -527,10 +1633,9 @@ async def list_tickers(
             order=order,
             limit=limit,
             params=params,
-            raw=True,
         )
 
-        return json_to_csv(results.data.decode("utf-8"))
+        return json_to_csv(results)
     except Exception as e:
         return f"Error: {e}"
 
@@ -545,11 +1650,11 @@ async def get_ticker_details(
     Get detailed information about a specific ticker.
     """
     try:
-        results = polygon_client.get_ticker_details(
-            ticker=ticker, date=date, params=params, raw=True
+        results = await _fetch(
+            "get_ticker_details", ticker=ticker, date=date, params=params
         )
 
-        return json_to_csv(results.data.decode("utf-8"))
+        return json_to_csv(results)
     except Exception as e:
         return f"Error: {e}"
 
@@ -565,23 +1670,188 @@ async def list_ticker_news(
 ) -> str:
     """
     Get recent news articles for a stock ticker.
+
+    Queries without a published_utc filter are answered from a local copy of
+    the feed that is synced incrementally.
     """
     try:
-        results = polygon_client.list_ticker_news(
+        if (
+            published_utc is None
+            and params is None
+            and sort in (None, "published_utc")
+            and order in (None, "asc", "desc")
+        ):
+            articles = await _news_from_store(
+                "list_ticker_news",
+                tickers=[ticker] if ticker else None,
+                limit=limit or 10,
+                ascending=order == "asc",
+            )
+            if articles is not None:
+                return json_to_csv({"results": articles})
+
+        results = await _fetch(
+            "list_ticker_news",
             ticker=ticker,
             published_utc=published_utc,
             limit=limit,
             sort=sort,
             order=order,
             params=params,
-            raw=True,
         )
 
-        return json_to_csv(results.data.decode("utf-8"))
+        return json_to_csv(results)
     except Exception as e:
         return f"Error: {e}"
 
 
+async def _news_from_store(method: str, **query: Any) -> Optional[List[Dict[str, Any]]]:
+    """
+    Answer a news query from the local store, syncing it first if due.
+
+    Returns:
+        The matching articles, or None if the store can't answer the query
+        completely (or couldn't be synced) and it should go upstream
+    """
+    try:
+        store = await _synced_news_store(method)
+    except Exception:
+        return None
+    return store.query(**query)
+
+
+async def _synced_news_store(method: str) -> NewsStore:
+    """Return the API key's store for a news feed, fetching new articles if due."""
+    feed = NEWS_FEEDS[method]
+    client = _current_client()
+    store = news_stores.get((method, client.key_id))
+    if store is None:
+        store = news_stores[method, client.key_id] = NewsStore(
+            feed["id_field"], feed["published_field"], feed["cursor_field"]
+        )
+
+    async with store.lock:
+        if store.caught_up and time.monotonic() - store.synced_at < NEWS_SYNC_INTERVAL:
+            return store
+
+        cursor_field = feed["cursor_field"]
+        # The backfill window start, which is also where an empty store's
+        # coverage begins.
+        start = time.time() - NEWS_BACKFILL
+        if store.cursor is not None:
+            position = {f"{cursor_field}_gt": store.cursor}
+        else:
+            position = {
+                f"{cursor_field}_gte": datetime.fromtimestamp(
+                    start, timezone.utc
+                ).strftime("%Y-%m-%dT%H:%M:%SZ")
+            }
+
+        articles = await _fetch_pages(
+            method,
+            NEWS_SYNC_MAX_ARTICLES,
+            policy=(0.0, 0.0),
+            limit=1000,
+            **feed["sort"],
+            **position,
+        )
+        if store.covers_from is None:
+            store.covers_from = start
+        store.add(articles)
+        store.caught_up = len(articles) < NEWS_SYNC_MAX_ARTICLES
+        store.synced_at = time.monotonic()
+    return store
+
+
+@poly_mcp.tool(annotations=ToolAnnotations(readOnlyHint=True))
+async def get_news(
+    ticker: Optional[str] = None,
+    published_gte: Optional[str] = None,
+    limit: Optional[int] = 20,
+    headlines_only: Optional[bool] = True,
+) -> str:
+    """
+    Get one merged news feed from Polygon.io and Benzinga, newest first.
+
+    Both feeds are fetched concurrently and stories carried by both are
+    listed once, matched by normalized title or URL. By default only the
+    headline, time, tickers, sources and URL are returned; set
+    headlines_only=False to add the publisher and summary. A feed that
+    fails (e.g. Benzinga not included in the plan) is left out.
+
+    Args:
+        ticker: Only articles mentioning this ticker
+        published_gte: Only articles published at or after this date or time
+        limit: Maximum number of articles
+    """
+    try:
+        since, _ = time_bounds(gte=published_gte)
+        limit = limit or 20
+        feeds = await asyncio.gather(
+            _news_articles(
+                "list_ticker_news",
+                ticker,
+                since,
+                limit,
+                {
+                    "ticker": ticker,
+                    "published_utc_gte": published_gte,
+                    "sort": "published_utc",
+                    "order": "desc",
+                },
+            ),
+            _news_articles(
+                "list_benzinga_news",
+                ticker,
+                since,
+                limit,
+                {
+                    "tickers": ticker,
+                    "published_gte": published_gte,
+                    "sort": "published.desc",
+                },
+            ),
+            return_exceptions=True,
+        )
+        errors = [feed for feed in feeds if isinstance(feed, BaseException)]
+        if len(errors) == len(feeds):
+            raise errors[0]
+
+        articles = merge_news(
+            [
+                (source, feed)
+                for source, feed in zip(("polygon", "benzinga"), feeds)
+                if not isinstance(feed, BaseException)
+            ],
+            limit,
+            headlines_only is not False,
+        )
+        return json_to_csv({"results": articles}, list_strategy="join")
+    except Exception as e:
+        return f"Error: {e}"
+
+
+async def _news_articles(
+    method: str,
+    ticker: Optional[str],
+    since: Optional[float],
+    limit: int,
+    upstream: Dict[str, Any],
+) -> List[Dict[str, Any]]:
+    """
+    Get a news feed's newest articles from its local store, else upstream.
+
+    upstream holds the feed's own filter arguments for the upstream request.
+    """
+    articles = await _news_from_store(
+        method, tickers=[ticker] if ticker else None, since=since, limit=limit
+    )
+    if articles is None:
+        body = await _fetch(method, limit=limit, **upstream)
+        articles = json.loads(body).get("results") or []
+    return articles
+
+
 @poly_mcp.tool(annotations=ToolAnnotations(readOnlyHint=True))
 async def get_ticker_types(
     asset_class: Optional[str] = None,
@@ -592,11 +1862,11 @@ async def get_ticker_types(
     List all ticker types supported by Polygon.io.
     """
     try:
-        results = polygon_client.get_ticker_types(
-            asset_class=asset_class, locale=locale, params=params, raw=True
+        results = await _fetch(
+            "get_ticker_types", asset_class=asset_class, locale=locale, params=params
         )
 
-        return json_to_csv(results.data.decode("utf-8"))
+        return json_to_csv(results)
     except Exception as e:
         return f"Error: {e}"
 
@@ -613,16 +1883,16 @@ async def list_splits(
     Get historical stock splits.
     """
     try:
-        results = polygon_client.list_splits(
+        results = await _fetch(
+            "list_splits",
             ticker=ticker,
             execution_date=execution_date,
             reverse_split=reverse_split,
             limit=limit,
             params=params,
-            raw=True,
         )
 
-        return json_to_csv(results.data.decode("utf-8"))
+        return json_to_csv(results)
     except Exception as e:
         return f"Error: {e}"
 
@@ -640,17 +1910,17 @@ async def list_dividends(
     Get historical cash dividends.
     """
     try:
-        results = polygon_client.list_dividends(
+        results = await _fetch(
+            "list_dividends",
             ticker=ticker,
             ex_dividend_date=ex_dividend_date,
             frequency=frequency,
             dividend_type=dividend_type,
             limit=limit,
             params=params,
-            raw=True,
         )
 
-        return json_to_csv(results.data.decode("utf-8"))
+        return json_to_csv(results)
     except Exception as e:
         return f"Error: {e}"
 
@@ -667,16 +1937,16 @@ async def list_conditions(
     List conditions used by Polygon.io.
     """
     try:
-        results = polygon_client.list_conditions(
+        results = await _fetch(
+            "list_conditions",
             asset_class=asset_class,
             data_type=data_type,
             id=id,
             sip=sip,
             params=params,
-            raw=True,
         )
 
-        return json_to_csv(results.data.decode("utf-8"))
+        return json_to_csv(results)
     except Exception as e:
         return f"Error: {e}"
 
@@ -691,11 +1961,11 @@ async def get_exchanges(
     List exchanges known by Polygon.io.
     """
     try:
-        results = polygon_client.get_exchanges(
-            asset_class=asset_class, locale=locale, params=params, raw=True
+        results = await _fetch(
+            "get_exchanges", asset_class=asset_class, locale=locale, params=params
         )
 
-        return json_to_csv(results.data.decode("utf-8"))
+        return json_to_csv(results)
     except Exception as e:
         return f"Error: {e}"
 
@@ -728,7 +1998,8 @@ async def list_stock_financials(
     Get fundamental financial data for companies.
     """
     try:
-        results = polygon_client.vx.list_stock_financials(
+        results = await _fetch(
+            "vx.list_stock_financials",
             ticker=ticker,
             cik=cik,
             company_name=company_name,
@@ -750,14 +2021,82 @@ async def list_stock_financials(
             sort=sort,
             order=order,
             params=params,
-            raw=True,
         )
 
-        return json_to_csv(results.data.decode("utf-8"))
+        return json_to_csv(results)
     except Exception as e:
         return f"Error: {e}"
 
 
+@poly_mcp.tool(annotations=ToolAnnotations(readOnlyHint=True))
+async def get_financial_metrics(
+    tickers: str,
+    metrics: Optional[str] = None,
+    timeframe: Optional[str] = "quarterly",
+    periods: Optional[int] = 4,
+) -> str:
+    """
+    Get selected financial statement metrics for many tickers and periods.
+
+    Filings are kept in a local store after the first request, so screens
+    across tickers and periods only fetch filings published since. Call
+    without metrics to list the metric names available for the tickers.
+
+    Args:
+        tickers: Comma-separated tickers, e.g. "AAPL,MSFT"
+        metrics: Comma-separated metrics, e.g. "revenues,net_income_loss"
+            or "balance_sheet.assets"
+        timeframe: "quarterly", "annual" or "ttm"
+        periods: Newest periods per ticker
+    """
+    try:
+        symbols = list(
+            dict.fromkeys(t.strip().upper() for t in tickers.split(",") if t.strip())
+        )
+        if len(symbols) > FINANCIALS_MAX_TICKERS:
+            raise ValueError(
+                f"At most {FINANCIALS_MAX_TICKERS} tickers per call, got {len(symbols)}"
+            )
+        timeframe = timeframe or "quarterly"
+
+        key_id = _current_client().key_id
+        store = financials_stores.setdefault(key_id, FinancialsStore())
+        await _gather_bounded(
+            *(_sync_financials(store, symbol, timeframe) for symbol in symbols)
+        )
+
+        if not metrics:
+            return json_to_csv({"results": store.metric_list(symbols, timeframe)})
+        names = [m.strip() for m in metrics.split(",") if m.strip()]
+        return json_to_csv(
+            {"results": store.select(symbols, names, timeframe, periods or None)}
+        )
+    except Exception as e:
+        return f"Error: {e}"
+
+
+async def _sync_financials(store: FinancialsStore, ticker: str, timeframe: str) -> None:
+    """Load a ticker's filings published since the newest one held, if due."""
+    key = (ticker, timeframe)
+    synced_at = store.synced_at.get(key, float("-inf"))
+    if time.monotonic() - synced_at < FINANCIALS_SYNC_INTERVAL:
+        return
+
+    filings = await _fetch_pages(
+        "vx.list_stock_financials",
+        FINANCIALS_MAX_FILINGS,
+        policy=(0.0, 0.0),
+        ticker=ticker,
+        timeframe=timeframe,
+        filing_date_gte=store.latest_filing.get(key),
+        sort="filing_date",
+        order="desc",
+        limit=100,
+    )
+    store.add(ticker, filings)
+    store.synced_at[key] = time.monotonic()
+
+
 @poly_mcp.tool(annotations=ToolAnnotations(readOnlyHint=True))
 async def list_ipos(
     ticker: Optional[str] = None,
@@ -776,7 +2115,8 @@ async def list_ipos(
     Retrieve upcoming or historical IPOs.
     """
     try:
-        results = polygon_client.vx.list_ipos(
+        results = await _fetch(
+            "vx.list_ipos",
             ticker=ticker,
             listing_date=listing_date,
             listing_date_lt=listing_date_lt,
@@ -788,10 +2128,9 @@ async def list_ipos(
             sort=sort,
             order=order,
             params=params,
-            raw=True,
         )
 
-        return json_to_csv(results.data.decode("utf-8"))
+        return json_to_csv(results)
     except Exception as e:
         return f"Error: {e}"
 
@@ -811,9 +2150,37 @@ async def list_short_interest(
 ) -> str:
     """
     Retrieve short interest data for stocks.
+
+    Queries for one ticker are answered from a local copy of its series,
+    newest first unless order="asc"; only settlements newer than those held
+    are fetched.
     """
     try:
-        results = polygon_client.list_short_interest(
+        if (
+            ticker
+            and params is None
+            and sort in (None, "settlement_date")
+            and order in (None, "asc", "desc")
+        ):
+            records = await _series_from_cache(
+                "list_short_interest",
+                ticker,
+                date_range(
+                    settlement_date,
+                    None,
+                    settlement_date_gt,
+                    settlement_date_gte,
+                    settlement_date_lt,
+                    settlement_date_lte,
+                ),
+                limit or 10,
+                order == "asc",
+            )
+            if records is not None:
+                return json_to_csv({"results": records})
+
+        results = await _fetch(
+            "list_short_interest",
             ticker=ticker,
             settlement_date=settlement_date,
             settlement_date_lt=settlement_date_lt,
@@ -824,10 +2191,9 @@ async def list_short_interest(
             sort=sort,
             order=order,
             params=params,
-            raw=True,
         )
 
-        return json_to_csv(results.data.decode("utf-8"))
+        return json_to_csv(results)
     except Exception as e:
         return f"Error: {e}"
 
@@ -847,9 +2213,30 @@ async def list_short_volume(
 ) -> str:
     """
     Retrieve short volume data for stocks.
+
+    Queries for one ticker are answered from a local copy of its series,
+    newest first unless order="asc"; only days newer than those held are
+    fetched.
     """
     try:
-        results = polygon_client.list_short_volume(
+        if (
+            ticker
+            and params is None
+            and sort in (None, "date")
+            and order in (None, "asc", "desc")
+        ):
+            records = await _series_from_cache(
+                "list_short_volume",
+                ticker,
+                date_range(date, None, date_gt, date_gte, date_lt, date_lte),
+                limit or 10,
+                order == "asc",
+            )
+            if records is not None:
+                return json_to_csv({"results": records})
+
+        results = await _fetch(
+            "list_short_volume",
             ticker=ticker,
             date=date,
             date_lt=date_lt,
@@ -860,10 +2247,9 @@ async def list_short_volume(
             sort=sort,
             order=order,
             params=params,
-            raw=True,
         )
 
-        return json_to_csv(results.data.decode("utf-8"))
+        return json_to_csv(results)
     except Exception as e:
         return f"Error: {e}"
 
@@ -883,10 +2269,26 @@ async def list_treasury_yields(
 ) -> str:
     """
     Retrieve treasury yield data.
+
+    Queries are answered from a local copy of the series, newest first
+    unless order="asc"; only days newer than those held are fetched.
     """
     try:
-        results = polygon_client.list_treasury_yields(
+        if params is None and sort in (None, "date") and order in (None, "asc", "desc"):
+            records = await _series_from_cache(
+                "list_treasury_yields",
+                None,
+                date_range(date, date_any_of, date_gt, date_gte, date_lt, date_lte),
+                limit or 10,
+                order == "asc",
+            )
+            if records is not None:
+                return json_to_csv({"results": records})
+
+        results = await _fetch(
+            "list_treasury_yields",
             date=date,
+            date_any_of=date_any_of,
             date_lt=date_lt,
             date_lte=date_lte,
             date_gt=date_gt,
@@ -895,10 +2297,9 @@ async def list_treasury_yields(
             sort=sort,
             order=order,
             params=params,
-            raw=True,
         )
 
-        return json_to_csv(results.data.decode("utf-8"))
+        return json_to_csv(results)
     except Exception as e:
         return f"Error: {e}"
 
@@ -917,9 +2318,24 @@ async def list_inflation(
 ) -> str:
     """
     Get inflation data from the Federal Reserve.
+
+    Queries are answered from a local copy of the series, newest first
+    unless sort="date.asc"; only months newer than those held are fetched.
     """
     try:
-        results = polygon_client.list_inflation(
+        if params is None and sort in (None, "date.asc", "date.desc"):
+            records = await _series_from_cache(
+                "list_inflation",
+                None,
+                date_range(date, date_any_of, date_gt, date_gte, date_lt, date_lte),
+                limit or 10,
+                sort == "date.asc",
+            )
+            if records is not None:
+                return json_to_csv({"results": records})
+
+        results = await _fetch(
+            "list_inflation",
             date=date,
             date_any_of=date_any_of,
             date_gt=date_gt,
@@ -929,14 +2345,115 @@ async def list_inflation(
             limit=limit,
             sort=sort,
             params=params,
-            raw=True,
         )
 
-        return json_to_csv(results.data.decode("utf-8"))
+        return json_to_csv(results)
     except Exception as e:
         return f"Error: {e}"
 
 
+async def _series_from_cache(
+    method: str,
+    ticker: Optional[str],
+    selection: tuple,
+    limit: int,
+    ascending: bool,
+) -> Optional[List[Dict[str, Any]]]:
+    """
+    Answer a range query from the local copy of a series, updating it first.
+
+    The newest end is refreshed once a release is due (see SERIES), and
+    history before the held range is fetched only when the query needs it.
+    A first query for the newest records without date filters loads just
+    those, so the rest of the history is backfilled only if asked for.
+
+    Args:
+        selection: (since, until, days) as returned by date_range
+
+    Returns:
+        The matching records, or None if the series couldn't be updated and
+        the query should go upstream
+    """
+    since, until, days = selection
+    key = (method, _current_client().key_id, ticker)
+    series = series_cache.get(key)
+    if series is None:
+        spec = SERIES[method]
+        series = TimeSeries(spec["date_field"], spec["cadence_days"])
+        series_cache[key] = series
+    series_cache.move_to_end(key)
+    while len(series_cache) > SERIES_MAX_CACHED:
+        series_cache.popitem(last=False)
+
+    try:
+        async with series.lock:
+            today = datetime.now(timezone.utc).date()
+            if (
+                series.covers_from is not None
+                and series.due(today)
+                and time.monotonic() - series.polled_at >= SERIES_POLL_INTERVAL
+            ):
+                if series.high_water is not None:
+                    await _load_series(method, series, ticker, gt=series.high_water)
+                else:
+                    await _load_series(method, series, ticker, gte=series.covers_from)
+                series.polled_at = time.monotonic()
+
+            records = series.query(since, until, days, limit, ascending)
+            if records is None and series.covers_from is None:
+                if selection == (None, None, None) and not ascending:
+                    await _load_newest(method, series, ticker, limit)
+                    series.polled_at = time.monotonic()
+                    records = series.query(since, until, days, limit, ascending)
+            if records is None:
+                first_load = series.covers_from is None
+                await _load_series(
+                    method, series, ticker, gte=since, lt=series.covers_from
+                )
+                series.covers_from = since or date.min
+                if first_load:
+                    series.polled_at = time.monotonic()
+                records = series.query(since, until, days, limit, ascending)
+    except Exception:
+        return None
+    return records
+
+
+async def _load_newest(
+    method: str, series: TimeSeries, ticker: Optional[str], count: int
+) -> None:
+    """Fetch a series' newest count records into it, covering from the oldest."""
+    filters: Dict[str, Any] = dict(SERIES[method]["newest_first"])
+    if SERIES[method]["per_ticker"]:
+        filters["ticker"] = ticker
+    records = await _fetch_pages(
+        method, count, policy=(0.0, 0.0), limit=min(count, 1000), **filters
+    )
+    series.add(records)
+    if len(records) < count or not series.dates:
+        series.covers_from = date.min
+    else:
+        series.covers_from = series.dates[0]
+
+
+async def _load_series(
+    method: str, series: TimeSeries, ticker: Optional[str], **bounds: Optional[date]
+) -> None:
+    """Fetch a series' records within date bounds (gt, gte, lt) into it."""
+    field = SERIES[method]["date_field"]
+    filters: Dict[str, Any] = {
+        f"{field}_{op}": day.isoformat()
+        for op, day in bounds.items()
+        if day is not None and day != date.min
+    }
+    if SERIES[method]["per_ticker"]:
+        filters["ticker"] = ticker
+    records = await _fetch_pages(
+        method, SERIES_MAX_RECORDS, policy=(0.0, 0.0), limit=1000, **filters
+    )
+    series.add(records)
+
+
 @poly_mcp.tool(annotations=ToolAnnotations(readOnlyHint=True))
 async def list_benzinga_analyst_insights(
     date: Optional[Union[str, date]] = None,
@@ -989,7 +2506,8 @@ async def list_benzinga_analyst_insights(
     List Benzinga analyst insights.
     """
     try:
-        results = polygon_client.list_benzinga_analyst_insights(
+        results = await _fetch(
+            "list_benzinga_analyst_insights",
             date=date,
             date_any_of=date_any_of,
             date_gt=date_gt,
@@ -1035,10 +2553,9 @@ async def list_benzinga_analyst_insights(
             limit=limit,
             sort=sort,
             params=params,
-            raw=True,
         )
 
-        return json_to_csv(results.data.decode("utf-8"))
+        return json_to_csv(results)
     except Exception as e:
         return f"Error: {e}"
 
@@ -1075,9 +2592,46 @@ async def list_benzinga_analysts(
 ) -> str:
     """
     List Benzinga analysts.
+
+    Queries filtering only on exact IDs and names are answered from a local
+    copy of the analyst list, reloaded daily.
     """
     try:
-        results = polygon_client.list_benzinga_analysts(
+        if (
+            benzinga_id_gt is None
+            and benzinga_id_gte is None
+            and benzinga_id_lt is None
+            and benzinga_id_lte is None
+            and benzinga_firm_id_gt is None
+            and benzinga_firm_id_gte is None
+            and benzinga_firm_id_lt is None
+            and benzinga_firm_id_lte is None
+            and firm_name_gt is None
+            and firm_name_gte is None
+            and firm_name_lt is None
+            and firm_name_lte is None
+            and full_name_gt is None
+            and full_name_gte is None
+            and full_name_lt is None
+            and full_name_lte is None
+            and sort is None
+            and params is None
+        ):
+            records = await _entities_from_index(
+                "list_benzinga_analysts",
+                equality_filters(
+                    benzinga_id=(benzinga_id, benzinga_id_any_of),
+                    benzinga_firm_id=(benzinga_firm_id, benzinga_firm_id_any_of),
+                    firm_name=(firm_name, firm_name_any_of),
+                    full_name=(full_name, full_name_any_of),
+                ),
+                limit or 10,
+            )
+            if records is not None:
+                return json_to_csv({"results": records})
+
+        results = await _fetch(
+            "list_benzinga_analysts",
             benzinga_id=benzinga_id,
             benzinga_id_any_of=benzinga_id_any_of,
             benzinga_id_gt=benzinga_id_gt,
@@ -1105,10 +2659,9 @@ async def list_benzinga_analysts(
             limit=limit,
             sort=sort,
             params=params,
-            raw=True,
         )
 
-        return json_to_csv(results.data.decode("utf-8"))
+        return json_to_csv(results)
     except Exception as e:
         return f"Error: {e}"
 
@@ -1128,7 +2681,8 @@ async def list_benzinga_consensus_ratings(
     List Benzinga consensus ratings for a ticker.
     """
     try:
-        results = polygon_client.list_benzinga_consensus_ratings(
+        results = await _fetch(
+            "list_benzinga_consensus_ratings",
             ticker=ticker,
             date=date,
             date_gt=date_gt,
@@ -1137,10 +2691,9 @@ async def list_benzinga_consensus_ratings(
             date_lte=date_lte,
             limit=limit,
             params=params,
-            raw=True,
         )
 
-        return json_to_csv(results.data.decode("utf-8"))
+        return json_to_csv(results)
     except Exception as e:
         return f"Error: {e}"
 
@@ -1207,9 +2760,73 @@ async def list_benzinga_earnings(
 ) -> str:
     """
     List Benzinga earnings.
+
+    Queries filtering only on date and ticker are answered from a local copy
+    of the calendar, newest first unless sort="date.asc".
     """
     try:
-        results = polygon_client.list_benzinga_earnings(
+        if (
+            importance is None
+            and importance_any_of is None
+            and importance_gt is None
+            and importance_gte is None
+            and importance_lt is None
+            and importance_lte is None
+            and last_updated is None
+            and last_updated_any_of is None
+            and last_updated_gt is None
+            and last_updated_gte is None
+            and last_updated_lt is None
+            and last_updated_lte is None
+            and date_status is None
+            and date_status_any_of is None
+            and date_status_gt is None
+            and date_status_gte is None
+            and date_status_lt is None
+            and date_status_lte is None
+            and eps_surprise_percent is None
+            and eps_surprise_percent_any_of is None
+            and eps_surprise_percent_gt is None
+            and eps_surprise_percent_gte is None
+            and eps_surprise_percent_lt is None
+            and eps_surprise_percent_lte is None
+            and revenue_surprise_percent is None
+            and revenue_surprise_percent_any_of is None
+            and revenue_surprise_percent_gt is None
+            and revenue_surprise_percent_gte is None
+            and revenue_surprise_percent_lt is None
+            and revenue_surprise_percent_lte is None
+            and fiscal_year is None
+            and fiscal_year_any_of is None
+            and fiscal_year_gt is None
+            and fiscal_year_gte is None
+            and fiscal_year_lt is None
+            and fiscal_year_lte is None
+            and fiscal_period is None
+            and fiscal_period_any_of is None
+            and fiscal_period_gt is None
+            and fiscal_period_gte is None
+            and fiscal_period_lt is None
+            and fiscal_period_lte is None
+            and ticker_gt is None
+            and ticker_gte is None
+            and ticker_lt is None
+            and ticker_lte is None
+            and params is None
+            and sort in (None, "date.asc", "date.desc")
+        ):
+            records = await _calendar_events(
+                "list_benzinga_earnings",
+                date_range(date, date_any_of, date_gt, date_gte, date_lt, date_lte),
+                ticker or ticker_any_of,
+                limit or 10,
+                sort == "date.asc",
+            )
+            if records is not None:
+                return json_to_csv({"results": records})
+
+        results = await _fetch(
+            "list_benzinga_earnings",
             date=date,
             date_any_of=date_any_of,
             date_gt=date_gt,
@@ -1267,10 +2884,9 @@ async def list_benzinga_earnings(
             limit=limit,
             sort=sort,
             params=params,
-            raw=True,
         )
 
-        return json_to_csv(results.data.decode("utf-8"))
+        return json_to_csv(results)
     except Exception as e:
         return f"Error: {e}"
 
@@ -1289,9 +2905,29 @@ async def list_benzinga_firms(
 ) -> str:
     """
     List Benzinga firms.
+
+    Queries filtering only on exact IDs are answered from a local copy of
+    the firm list, reloaded daily.
     """
     try:
-        results = polygon_client.list_benzinga_firms(
+        if (
+            benzinga_id_gt is None
+            and benzinga_id_gte is None
+            and benzinga_id_lt is None
+            and benzinga_id_lte is None
+            and sort is None
+            and params is None
+        ):
+            records = await _entities_from_index(
+                "list_benzinga_firms",
+                equality_filters(benzinga_id=(benzinga_id, benzinga_id_any_of)),
+                limit or 10,
+            )
+            if records is not None:
+                return json_to_csv({"results": records})
+
+        results = await _fetch(
+            "list_benzinga_firms",
             benzinga_id=benzinga_id,
             benzinga_id_any_of=benzinga_id_any_of,
             benzinga_id_gt=benzinga_id_gt,
@@ -1301,10 +2937,9 @@ async def list_benzinga_firms(
             limit=limit,
             sort=sort,
             params=params,
-            raw=True,
         )
 
-        return json_to_csv(results.data.decode("utf-8"))
+        return json_to_csv(results)
     except Exception as e:
         return f"Error: {e}"
 
@@ -1359,9 +2994,61 @@ async def list_benzinga_guidance(
 ) -> str:
     """
     List Benzinga guidance.
+
+    Queries filtering only on date and ticker are answered from a local copy
+    of the calendar, newest first unless sort="date.asc".
     """
     try:
-        results = polygon_client.list_benzinga_guidance(
+        if (
+            positioning is None
+            and positioning_any_of is None
+            and positioning_gt is None
+            and positioning_gte is None
+            and positioning_lt is None
+            and positioning_lte is None
+            and importance is None
+            and importance_any_of is None
+            and importance_gt is None
+            and importance_gte is None
+            and importance_lt is None
+            and importance_lte is None
+            and last_updated is None
+            and last_updated_any_of is None
+            and last_updated_gt is None
+            and last_updated_gte is None
+            and last_updated_lt is None
+            and last_updated_lte is None
+            and fiscal_year is None
+            and fiscal_year_any_of is None
+            and fiscal_year_gt is None
+            and fiscal_year_gte is None
+            and fiscal_year_lt is None
+            and fiscal_year_lte is None
+            and fiscal_period is None
+            and fiscal_period_any_of is None
+            and fiscal_period_gt is None
+            and fiscal_period_gte is None
+            and fiscal_period_lt is None
+            and fiscal_period_lte is None
+            and ticker_gt is None
+            and ticker_gte is None
+            and ticker_lt is None
+            and ticker_lte is None
+            and params is None
+            and sort in (None, "date.asc", "date.desc")
+        ):
+            records = await _calendar_events(
+                "list_benzinga_guidance",
+                date_range(date, date_any_of, date_gt, date_gte, date_lt, date_lte),
+                ticker or ticker_any_of,
+                limit or 10,
+                sort == "date.asc",
+            )
+            if records is not None:
+                return json_to_csv({"results": records})
+
+        results = await _fetch(
+            "list_benzinga_guidance",
             date=date,
             date_any_of=date_any_of,
             date_gt=date_gt,
@@ -1407,14 +3094,101 @@ async def list_benzinga_guidance(
             limit=limit,
             sort=sort,
             params=params,
-            raw=True,
         )
 
-        return json_to_csv(results.data.decode("utf-8"))
+        return json_to_csv(results)
     except Exception as e:
         return f"Error: {e}"
 
 
+async def _calendar_events(
+    method: str,
+    selection: tuple,
+    tickers: Optional[str],
+    limit: int,
+    ascending: bool,
+) -> Optional[List[Dict[str, Any]]]:
+    """
+    Answer a calendar query from the local EventCalendar.
+
+    Date ranges of up to CALENDAR_MAX_WEEKS are served from week buckets;
+    otherwise a query for a few tickers is served from their full
+    histories. Missing or expired buckets are loaded first, and changes
+    since the last sync are fetched at most every CALENDAR_SYNC_INTERVAL.
+
+    Args:
+        selection: (since, until, days) as returned by date_range
+        tickers: Comma-separated tickers, or None for all
+
+    Returns:
+        The matching events, or None if the query should go upstream
+    """
+    since, until, days = selection
+    symbols = tickers.split(",") if tickers else None
+    if (
+        since is not None
+        and until is not None
+        and len(EventCalendar.weeks(since, until)) <= CALENDAR_MAX_WEEKS
+    ):
+        buckets: List[Any] = EventCalendar.weeks(since, until)
+    elif symbols and len(symbols) <= CALENDAR_MAX_TICKERS:
+        buckets = symbols
+    else:
+        return None
+
+    key = (method, _current_client().key_id)
+    calendar = calendars.get(key)
+    if calendar is None:
+        calendar = calendars[key] = EventCalendar()
+
+    try:
+        async with calendar.lock:
+            if (
+                calendar.cursor is not None
+                and time.monotonic() - calendar.synced_at >= CALENDAR_SYNC_INTERVAL
+            ):
+                calendar.add(
+                    await _fetch_pages(
+                        method,
+                        CALENDAR_MAX_EVENTS,
+                        policy=(0.0, 0.0),
+                        limit=1000,
+                        sort="last_updated.asc",
+                        last_updated_gt=calendar.cursor,
+                    )
+                )
+                calendar.synced_at = time.monotonic()
+
+            stale = calendar.stale(buckets, CALENDAR_RELOAD_INTERVAL)
+            if stale and calendar.cursor is None:
+                # Later syncs pick up every change made after this first load.
+                start = datetime.now(timezone.utc) - timedelta(minutes=5)
+                calendar.cursor = start.strftime("%Y-%m-%dT%H:%M:%SZ")
+                calendar.synced_at = time.monotonic()
+            loaded = await asyncio.gather(
+                *(_load_calendar_bucket(method, bucket) for bucket in stale)
+            )
+            for bucket, events in zip(stale, loaded):
+                calendar.load_bucket(bucket, events)
+    except Exception:
+        return None
+    return calendar.query(since, until, days, symbols, limit, ascending)
+
+
+async def _load_calendar_bucket(method: str, bucket: Any) -> List[Dict[str, Any]]:
+    """Fetch every event in a week (keyed by its Monday) or for a ticker."""
+    if isinstance(bucket, date):
+        filters = {
+            "date_gte": bucket.isoformat(),
+            "date_lte": (bucket + timedelta(days=6)).isoformat(),
+        }
+    else:
+        filters = {"ticker": bucket}
+    return await _fetch_pages(
+        method, CALENDAR_MAX_EVENTS, policy=(0.0, 0.0), limit=1000, **filters
+    )
+
+
 @poly_mcp.tool(annotations=ToolAnnotations(readOnlyHint=True))
 async def list_benzinga_news(
     published: Optional[str] = None,
@@ -1450,9 +3224,54 @@ async def list_benzinga_news(
 ) -> str:
     """
     List Benzinga news.
+
+    Queries filtering only on tickers and published time are answered from
+    a local copy of the feed that is synced incrementally.
     """
     try:
-        results = polygon_client.list_benzinga_news(
+        if (
+            published is None
+            and published_any_of is None
+            and last_updated is None
+            and last_updated_any_of is None
+            and last_updated_gt is None
+            and last_updated_gte is None
+            and last_updated_lt is None
+            and last_updated_lte is None
+            and channels is None
+            and channels_all_of is None
+            and channels_any_of is None
+            and tags is None
+            and tags_all_of is None
+            and tags_any_of is None
+            and author is None
+            and author_any_of is None
+            and author_gt is None
+            and author_gte is None
+            and author_lt is None
+            and author_lte is None
+            and params is None
+            and sort in (None, "published.desc", "published.asc")
+            and [tickers, tickers_all_of, tickers_any_of].count(None) >= 2
+        ):
+            since, until = time_bounds(
+                published_gt, published_gte, published_lt, published_lte
+            )
+            ticker_filter = tickers or tickers_all_of or tickers_any_of
+            articles = await _news_from_store(
+                "list_benzinga_news",
+                tickers=ticker_filter.split(",") if ticker_filter else None,
+                all_tickers=tickers_all_of is not None,
+                since=since,
+                until=until,
+                limit=limit or 10,
+                ascending=sort == "published.asc",
+            )
+            if articles is not None:
+                return json_to_csv({"results": articles})
+
+        results = await _fetch(
+            "list_benzinga_news",
             published=published,
             published_any_of=published_any_of,
             published_gt=published_gt,
@@ -1483,10 +3302,9 @@ async def list_benzinga_news(
             limit=limit,
             sort=sort,
             params=params,
-            raw=True,
         )
 
-        return json_to_csv(results.data.decode("utf-8"))
+        return json_to_csv(results)
     except Exception as e:
         return f"Error: {e}"
 
@@ -1555,7 +3373,8 @@ async def list_benzinga_ratings(
     List Benzinga ratings.
     """
     try:
-        results = polygon_client.list_benzinga_ratings(
+        results = await _fetch(
+            "list_benzinga_ratings",
             date=date,
             date_any_of=date_any_of,
             date_gt=date_gt,
@@ -1613,14 +3432,155 @@ async def list_benzinga_ratings(
             limit=limit,
             sort=sort,
             params=params,
-            raw=True,
         )
 
-        return json_to_csv(results.data.decode("utf-8"))
+        return json_to_csv(results)
     except Exception as e:
         return f"Error: {e}"
 
 
+@poly_mcp.tool(annotations=ToolAnnotations(readOnlyHint=True))
+async def get_analyst_ratings(
+    ticker: Optional[str] = None,
+    analyst: Optional[str] = None,
+    firm: Optional[str] = None,
+    date_gte: Optional[str] = None,
+    limit: Optional[int] = 20,
+) -> str:
+    """
+    Get Benzinga analyst ratings with each analyst's track record, newest first.
+
+    Analyst and firm names are looked up in local copies of the Benzinga
+    analyst and firm lists: an exact name (ignoring case) or any name
+    containing the given text. Each rating is joined with the analyst's
+    smart score, success rate, average return and rating count.
+
+    Args:
+        ticker: Only ratings of this ticker
+        analyst: Analyst name, e.g. "Dan Ives"
+        firm: Firm name, e.g. "Wedbush"
+        date_gte: Only ratings on or after this date
+        limit: Maximum number of ratings
+    """
+    try:
+        ids = {}
+        if analyst:
+            ids["benzinga_analyst_id_any_of"] = await _entity_ids(
+                "list_benzinga_analysts", analyst
+            )
+        if firm:
+            ids["benzinga_firm_id_any_of"] = await _entity_ids(
+                "list_benzinga_firms", firm
+            )
+        body = await _fetch(
+            "list_benzinga_ratings",
+            ticker=ticker,
+            date_gte=date_gte,
+            limit=limit or 20,
+            sort="date.desc",
+            **ids,
+        )
+        ratings = json.loads(body).get("results") or []
+
+        # The join is best effort; ratings carry analyst and firm names.
+        try:
+            analysts = await _benzinga_entities("list_benzinga_analysts")
+        except Exception:
+            analysts = None
+        return json_to_csv({"results": join_ratings(ratings, analysts)})
+    except Exception as e:
+        return f"Error: {e}"
+
+
+@poly_mcp.tool(annotations=ToolAnnotations(readOnlyHint=True))
+async def get_analyst_insights(
+    ticker: Optional[str] = None,
+    firm: Optional[str] = None,
+    date_gte: Optional[str] = None,
+    limit: Optional[int] = 20,
+) -> str:
+    """
+    Get Benzinga analyst insights as compact rows, newest first.
+
+    The firm name is looked up in a local copy of the Benzinga firm list:
+    an exact name (ignoring case) or any name containing the given text.
+
+    Args:
+        ticker: Only insights on this ticker
+        firm: Firm name, e.g. "Morgan Stanley"
+        date_gte: Only insights on or after this date
+        limit: Maximum number of insights
+    """
+    try:
+        ids = {}
+        if firm:
+            ids["benzinga_firm_id_any_of"] = await _entity_ids(
+                "list_benzinga_firms", firm
+            )
+        body = await _fetch(
+            "list_benzinga_analyst_insights",
+            ticker=ticker,
+            date_gte=date_gte,
+            limit=limit or 20,
+            sort="date.desc",
+            **ids,
+        )
+        insights = json.loads(body).get("results") or []
+        return json_to_csv({"results": project_insights(insights)})
+    except Exception as e:
+        return f"Error: {e}"
+
+
+async def _benzinga_entities(method: str) -> EntityIndex:
+    """Return the API key's index of Benzinga analysts or firms, reloaded daily."""
+    key = (method, _current_client().key_id)
+    index = benzinga_entities.get(key)
+    if index is None:
+        index = benzinga_entities[key] = EntityIndex(BENZINGA_ENTITIES[method])
+    async with index.lock:
+        if time.monotonic() - index.loaded_at >= BENZINGA_ENTITIES_MAX_AGE:
+            records = await _fetch_pages(
+                method, BENZINGA_ENTITIES_MAX, policy=(0.0, 0.0), limit=1000
+            )
+            index.load(records)
+    return index
+
+
+async def _entity_ids(method: str, name: str) -> List[str]:
+    """
+    Resolve an analyst or firm name to its Benzinga IDs, for an any_of filter.
+
+    Raises:
+        ValueError: If no entity or too many entities match
+    """
+    matches = (await _benzinga_entities(method)).find(name)
+    kind = "analyst" if method == "list_benzinga_analysts" else "firm"
+    if not matches:
+        raise ValueError(f"No Benzinga {kind} matches {name!r}")
+    if len(matches) > BENZINGA_MAX_NAME_MATCHES:
+        raise ValueError(
+            f"{len(matches)} Benzinga {kind}s match {name!r}; use a longer name"
+        )
+    return [match["benzinga_id"] for match in matches]
+
+
+async def _entities_from_index(
+    method: str, filters: Dict[str, set], limit: int
+) -> Optional[List[Dict[str, Any]]]:
+    """
+    Answer an analyst or firm query from the local index.
+
+    Returns:
+        The matching entities, or None if the index couldn't be loaded and
+        the query should go upstream
+    """
+    try:
+        index = await _benzinga_entities(method)
+    except Exception:
+        return None
+    return index.select(filters, limit)
+
+
 @poly_mcp.tool(annotations=ToolAnnotations(readOnlyHint=True))
 async def list_futures_aggregates(
     ticker: str,
@@ -1638,7 +3598,8 @@ async def list_futures_aggregates(
     Get aggregates for a futures contract in a given time range.
     """
     try:
-        results = polygon_client.list_futures_aggregates(
+        results = await _fetch(
+            "list_futures_aggregates",
             ticker=ticker,
             resolution=resolution,
             window_start=window_start,
@@ -1649,10 +3610,9 @@ async def list_futures_aggregates(
             limit=limit,
             sort=sort,
             params=params,
-            raw=True,
         )
 
-        return json_to_csv(results.data.decode("utf-8"))
+        return json_to_csv(results)
     except Exception as e:
         return f"Error: {e}"
 
@@ -1671,9 +3631,33 @@ async def list_futures_contracts(
 ) -> str:
     """
     Get a paginated list of futures contracts.
+
+    Queries for one product, optionally filtered by active and type, are
+    answered from a local copy of its contracts, reloaded daily.
     """
     try:
-        results = polygon_client.list_futures_contracts(
+        if (
+            product_code
+            and first_trade_date is None
+            and last_trade_date is None
+            and as_of is None
+            and sort is None
+            and params is None
+        ):
+            reference = await _futures_reference(("contracts", product_code))
+            contracts = [
+                contract
+                for contract in reference.contracts[product_code]
+                if (
+                    active is None
+                    or str(contract.get("active")).lower() == active.lower()
+                )
+                and (type is None or contract.get("type") == type)
+            ]
+            return json_to_csv({"results": contracts[: limit or 10]})
+
+        results = await _fetch(
+            "list_futures_contracts",
             product_code=product_code,
             first_trade_date=first_trade_date,
             last_trade_date=last_trade_date,
@@ -1683,10 +3667,9 @@ async def list_futures_contracts(
             limit=limit,
             sort=sort,
             params=params,
-            raw=True,
         )
 
-        return json_to_csv(results.data.decode("utf-8"))
+        return json_to_csv(results)
     except Exception as e:
         return f"Error: {e}"
 
@@ -1699,16 +3682,25 @@ async def get_futures_contract_details(
 ) -> str:
     """
     Get details for a single futures contract at a specified point in time.
+
+    Contracts of products already in the local reference cache are
+    answered from it.
     """
     try:
-        results = polygon_client.get_futures_contract_details(
+        reference = futures_references.get(_current_client().key_id)
+        if reference is not None and as_of is None and params is None:
+            contract = reference.contracts_by_ticker.get(ticker)
+            if contract is not None:
+                return json_to_csv({"results": contract})
+
+        results = await _fetch(
+            "get_futures_contract_details",
             ticker=ticker,
             as_of=as_of,
             params=params,
-            raw=True,
         )
 
-        return json_to_csv(results.data.decode("utf-8"))
+        return json_to_csv(results)
     except Exception as e:
         return f"Error: {e}"
 
@@ -1730,9 +3722,36 @@ async def list_futures_products(
 ) -> str:
     """
     Get a list of futures products (including combos).
+
+    Queries without as_of, sort or params are answered from a local copy of
+    the product list, reloaded daily.
     """
     try:
-        results = polygon_client.list_futures_products(
+        if as_of is None and sort is None and params is None:
+            reference = await _futures_reference(("products", None))
+            filters = {
+                "name": name,
+                "trading_venue": trading_venue,
+                "sector": sector,
+                "sub_sector": sub_sector,
+                "asset_class": asset_class,
+                "asset_sub_class": asset_sub_class,
+                "type": type,
+            }
+            search = name_search.lower() if name_search else None
+            products = [
+                product
+                for product in reference.products.values()
+                if all(
+                    value is None or product.get(field) == value
+                    for field, value in filters.items()
+                )
+                and (search is None or search in (product.get("name") or "").lower())
+            ]
+            return json_to_csv({"results": products[: limit or 10]})
+
+        results = await _fetch(
+            "list_futures_products",
             name=name,
             name_search=name_search,
             as_of=as_of,
@@ -1745,10 +3764,9 @@ async def list_futures_products(
             limit=limit,
             sort=sort,
             params=params,
-            raw=True,
         )
 
-        return json_to_csv(results.data.decode("utf-8"))
+        return json_to_csv(results)
     except Exception as e:
         return f"Error: {e}"
 
@@ -1762,17 +3780,25 @@ async def get_futures_product_details(
 ) -> str:
     """
     Get details for a single futures product as it was at a specific day.
+
+    Without as_of, products are answered from the local product list.
     """
     try:
-        results = polygon_client.get_futures_product_details(
+        if as_of is None and params is None:
+            reference = await _futures_reference(("products", None))
+            product = reference.products.get(product_code)
+            if product is not None and type in (None, product.get("type")):
+                return json_to_csv({"results": product})
+
+        results = await _fetch(
+            "get_futures_product_details",
             product_code=product_code,
             type=type,
             as_of=as_of,
             params=params,
-            raw=True,
         )
 
-        return json_to_csv(results.data.decode("utf-8"))
+        return json_to_csv(results)
     except Exception as e:
         return f"Error: {e}"
 
@@ -1798,7 +3824,8 @@ async def list_futures_quotes(
     Get quotes for a futures contract in a given time range.
     """
     try:
-        results = polygon_client.list_futures_quotes(
+        results = await _fetch(
+            "list_futures_quotes",
             ticker=ticker,
             timestamp=timestamp,
             timestamp_lt=timestamp_lt,
@@ -1813,10 +3840,9 @@ async def list_futures_quotes(
             limit=limit,
             sort=sort,
             params=params,
-            raw=True,
         )
 
-        return json_to_csv(results.data.decode("utf-8"))
+        return json_to_csv(results)
     except Exception as e:
         return f"Error: {e}"
 
@@ -1842,7 +3868,8 @@ async def list_futures_trades(
     Get trades for a futures contract in a given time range.
     """
     try:
-        results = polygon_client.list_futures_trades(
+        results = await _fetch(
+            "list_futures_trades",
             ticker=ticker,
             timestamp=timestamp,
             timestamp_lt=timestamp_lt,
@@ -1857,10 +3884,9 @@ async def list_futures_trades(
             limit=limit,
             sort=sort,
             params=params,
-            raw=True,
         )
 
-        return json_to_csv(results.data.decode("utf-8"))
+        return json_to_csv(results)
     except Exception as e:
         return f"Error: {e}"
 
@@ -1877,16 +3903,16 @@ async def list_futures_schedules(
     Get trading schedules for multiple futures products on a specific date.
     """
     try:
-        results = polygon_client.list_futures_schedules(
+        results = await _fetch(
+            "list_futures_schedules",
             session_end_date=session_end_date,
             trading_venue=trading_venue,
             limit=limit,
             sort=sort,
             params=params,
-            raw=True,
         )
 
-        return json_to_csv(results.data.decode("utf-8"))
+        return json_to_csv(results)
     except Exception as e:
         return f"Error: {e}"
 
@@ -1905,9 +3931,31 @@ async def list_futures_schedules_by_product_code(
 ) -> str:
     """
     Get schedule data for a single futures product across many trading dates.
+
+    Queries for sessions within the last FUTURES_SCHEDULE_HISTORY_DAYS are
+    answered from a local copy of the product's schedules, oldest first.
     """
     try:
-        results = polygon_client.list_futures_schedules_by_product_code(
+        since, until, days = date_range(
+            session_end_date,
+            None,
+            session_end_date_gt,
+            session_end_date_gte,
+            session_end_date_lt,
+            session_end_date_lte,
+        )
+        if (
+            since is not None
+            and since >= _futures_schedule_start()
+            and sort is None
+            and params is None
+        ):
+            reference = await _futures_reference(("schedules", product_code))
+            schedules = reference.schedules_between(product_code, since, until, days)
+            return json_to_csv({"results": schedules[: limit or 10]})
+
+        results = await _fetch(
+            "list_futures_schedules_by_product_code",
             product_code=product_code,
             session_end_date=session_end_date,
             session_end_date_lt=session_end_date_lt,
@@ -1917,14 +3965,220 @@ async def list_futures_schedules_by_product_code(
             limit=limit,
             sort=sort,
             params=params,
-            raw=True,
         )
 
-        return json_to_csv(results.data.decode("utf-8"))
+        return json_to_csv(results)
+    except Exception as e:
+        return f"Error: {e}"
+
+
+@poly_mcp.tool(annotations=ToolAnnotations(readOnlyHint=True))
+async def get_futures_front_month(
+    product_code: str,
+    as_of: Optional[str] = None,
+    roll_days: Optional[int] = 0,
+    count: Optional[int] = 1,
+) -> str:
+    """
+    Resolve the front-month futures contract of a product, and the ones after it.
+
+    Computed from locally cached contracts and trading schedules, reloaded
+    daily. A contract stays the front month until roll_days trading
+    sessions before its last trade date; roll_date is the last day it is
+    held.
+
+    Args:
+        product_code: Futures product code, e.g. "ES"
+        as_of: Date to resolve for (default today)
+        roll_days: Trading sessions before the last trade date to roll
+        count: Number of contracts to return, front month first
+    """
+    try:
+        on = to_day(as_of) if as_of else date.today()
+        reference = await _futures_reference(
+            ("contracts", product_code), ("schedules", product_code)
+        )
+        chain = reference.chain(product_code, on, roll_days or 0)
+        return json_to_csv({"results": chain[: count or 1]})
+    except Exception as e:
+        return f"Error: {e}"
+
+
+@poly_mcp.tool(annotations=ToolAnnotations(readOnlyHint=True))
+async def get_futures_roll_schedule(
+    product_code: str,
+    start: str,
+    end: Optional[str] = None,
+    roll_days: Optional[int] = 0,
+) -> str:
+    """
+    List which futures contract is the front month over a date range.
+
+    Each row is a contract with the first and last date (inclusive) it is
+    the front month, as get_futures_front_month would resolve each day.
+
+    Args:
+        product_code: Futures product code, e.g. "ES"
+        start: First date, YYYY-MM-DD
+        end: Last date (default today)
+        roll_days: Trading sessions before the last trade date to roll
+    """
+    try:
+        reference = await _futures_reference(
+            ("contracts", product_code), ("schedules", product_code)
+        )
+        segments = reference.roll_schedule(
+            product_code,
+            to_day(start),
+            to_day(end) if end else date.today(),
+            roll_days or 0,
+        )
+        return json_to_csv({"results": segments})
+    except Exception as e:
+        return f"Error: {e}"
+
+
+@poly_mcp.tool(annotations=ToolAnnotations(readOnlyHint=True))
+async def get_continuous_futures(
+    product_code: str,
+    start: str,
+    end: Optional[str] = None,
+    resolution: Optional[str] = "1day",
+    roll_days: Optional[int] = 0,
+    adjustment: Optional[str] = "ratio",
+) -> str:
+    """
+    Get a continuous front-month series for a futures product.
+
+    Contracts are rolled as get_futures_roll_schedule resolves them, and
+    their bars fetched concurrently and stitched into one series. Bars of
+    past sessions are cached per contract, so later calls only fetch the
+    sessions they haven't seen.
+
+    Args:
+        product_code: Futures product code, e.g. "ES"
+        start: First session date, YYYY-MM-DD
+        end: Last session date (default today)
+        resolution: Bar size, as in list_futures_aggregates
+        roll_days: Trading sessions before the last trade date to roll
+        adjustment: "ratio" (default) scales and "difference" shifts earlier
+            contracts' prices onto the next contract's at each roll; "none"
+            keeps traded prices
+    """
+    try:
+        reference = await _futures_reference(
+            ("contracts", product_code), ("schedules", product_code)
+        )
+        segments = reference.roll_schedule(
+            product_code,
+            to_day(start),
+            to_day(end) if end else date.today(),
+            roll_days or 0,
+        )
+        bars = await asyncio.gather(
+            *(
+                _contract_bars(
+                    segment["ticker"],
+                    resolution or "1day",
+                    # From the previous roll day on, to measure the roll gap.
+                    to_day(segments[i - 1]["end_date"] if i else segment["start_date"]),
+                    to_day(segment["end_date"]),
+                )
+                for i, segment in enumerate(segments)
+            )
+        )
+        return json_to_csv(
+            {"results": stitch(segments, list(bars), adjustment or "ratio")}
+        )
     except Exception as e:
         return f"Error: {e}"
 
 
+async def _contract_bars(
+    ticker: str, resolution: str, since: date, until: date
+) -> List[Dict[str, Any]]:
+    """Return a contract's bars for sessions since to until, fetching what's missing."""
+    key = (_current_client().key_id, ticker, resolution)
+    held = futures_bars.get(key)
+    if held is None:
+        held = futures_bars[key] = ContractBars()
+    futures_bars.move_to_end(key)
+    while len(futures_bars) > FUTURES_BARS_MAX_CACHED:
+        futures_bars.popitem(last=False)
+
+    async with held.lock:
+        for first, last in held.missing(since, until):
+            # A session's bars can open the evening before it ends, so the
+            # window is widened and bars are matched on session_end_date.
+            bars = await _fetch_pages(
+                "list_futures_aggregates",
+                FUTURES_SEGMENT_MAX_BARS,
+                policy=(0.0, 0.0),
+                ticker=ticker,
+                resolution=resolution,
+                window_start_gte=(first - timedelta(days=3)).isoformat(),
+                window_start_lt=(last + timedelta(days=1)).isoformat(),
+                limit=50_000,
+            )
+            held.add(bars, first, last, date.today())
+        return held.select(since, until)
+
+
+async def _futures_reference(*parts: tuple) -> FuturesReference:
+    """
+    Return the API key's futures reference cache with the given parts loaded.
+
+    Args:
+        *parts: (kind, product_code) pairs, kind being "products" (with
+            product_code None), "contracts" or "schedules"
+    """
+    key_id = _current_client().key_id
+    reference = futures_references.get(key_id)
+    if reference is None:
+        reference = futures_references[key_id] = FuturesReference()
+    async with reference.lock:
+        stale = [
+            part for part in parts if reference.stale(*part, FUTURES_REFERENCE_MAX_AGE)
+        ]
+        loaded = await asyncio.gather(*(_load_futures_part(*part) for part in stale))
+        for (kind, product_code), records in zip(stale, loaded):
+            reference.load(kind, product_code, records)
+    return reference
+
+
+async def _load_futures_part(
+    kind: str, product_code: Optional[str]
+) -> List[Dict[str, Any]]:
+    if kind == "products":
+        return await _fetch_pages(
+            "list_futures_products",
+            FUTURES_REFERENCE_MAX,
+            policy=(0.0, 0.0),
+            limit=1000,
+        )
+    if kind == "contracts":
+        return await _fetch_pages(
+            "list_futures_contracts",
+            FUTURES_REFERENCE_MAX,
+            policy=(0.0, 0.0),
+            product_code=product_code,
+            limit=1000,
+        )
+    return await _fetch_pages(
+        "list_futures_schedules_by_product_code",
+        FUTURES_REFERENCE_MAX,
+        policy=(0.0, 0.0),
+        product_code=product_code,
+        session_end_date_gte=_futures_schedule_start().isoformat(),
+        limit=1000,
+    )
+
+
+def _futures_schedule_start() -> date:
+    """Return the first session date held in the local futures schedules."""
+    return date.today() - timedelta(days=FUTURES_SCHEDULE_HISTORY_DAYS)
+
+
 @poly_mcp.tool(annotations=ToolAnnotations(readOnlyHint=True))
 async def list_futures_market_statuses(
     product_code_any_of: Optional[str] = None,
@@ -1935,18 +4189,31 @@ async def list_futures_market_statuses(
 ) -> str:
     """
     Get market statuses for futures products.
+
+    Read from an in-memory status table refreshed in the background every
+    few seconds, shared by every caller, unless params are given.
     """
     try:
-        results = polygon_client.list_futures_market_statuses(
+        if params is None:
+            table = await _live_table("list_futures_market_statuses")
+            rows = table.select(
+                equality_filters(product_code=(product_code, product_code_any_of)),
+                {},
+                limit or 10,
+                sort,
+            )
+            return json_to_csv({"results": rows})
+
+        results = await _fetch(
+            "list_futures_market_statuses",
             product_code_any_of=product_code_any_of,
             product_code=product_code,
             limit=limit,
             sort=sort,
             params=params,
-            raw=True,
         )
 
-        return json_to_csv(results.data.decode("utf-8"))
+        return json_to_csv(results)
     except Exception as e:
         return f"Error: {e}"
 
@@ -1971,9 +4238,35 @@ async def get_futures_snapshot(
 ) -> str:
     """
     Get snapshots for futures contracts.
+
+    Read from an in-memory snapshot of every contract refreshed in the
+    background every few seconds, shared by every caller, unless params are
+    given.
     """
     try:
-        results = polygon_client.get_futures_snapshot(
+        if params is None:
+            table = await _live_table("get_futures_snapshot")
+            rows = table.select(
+                equality_filters(
+                    ticker=(ticker, ticker_any_of),
+                    product_code=(product_code, product_code_any_of),
+                ),
+                {
+                    "ticker": (ticker_gt, ticker_gte, ticker_lt, ticker_lte),
+                    "product_code": (
+                        product_code_gt,
+                        product_code_gte,
+                        product_code_lt,
+                        product_code_lte,
+                    ),
+                },
+                limit or 10,
+                sort,
+            )
+            return json_to_csv({"results": rows})
+
+        results = await _fetch(
+            "get_futures_snapshot",
             ticker=ticker,
             ticker_any_of=ticker_any_of,
             ticker_gt=ticker_gt,
@@ -1989,18 +4282,116 @@ async def get_futures_snapshot(
             limit=limit,
             sort=sort,
             params=params,
-            raw=True,
         )
 
-        return json_to_csv(results.data.decode("utf-8"))
+        return json_to_csv(results)
     except Exception as e:
         return f"Error: {e}"
 
 
+async def _live_table(method: str) -> LiveTable:
+    """
+    Return the API key's live table for a method, refreshing it as needed.
+
+    A table past the refresh interval is returned as is while one
+    background task refreshes it. Callers only wait on the first load, or
+    once the table is FUTURES_LIVE_MAX_STALE seconds overdue.
+    """
+    key = (method, _current_client().key_id)
+    table = live_tables.get(key)
+    if table is None:
+        table = live_tables[key] = LiveTable(FUTURES_LIVE_TABLES[method])
+    age = table.age()
+    if age < POLYGON_FUTURES_REFRESH_INTERVAL:
+        return table
+    if table.refresh is None:
+        table.refresh = asyncio.ensure_future(_refresh_live_table(method, table))
+        # A failed refresh nobody waited on is retried by the next read.
+        table.refresh.add_done_callback(
+            lambda task: task.cancelled() or task.exception()
+        )
+    if age >= POLYGON_FUTURES_REFRESH_INTERVAL + FUTURES_LIVE_MAX_STALE:
+        await asyncio.shield(table.refresh)
+    return table
+
+
+async def _refresh_live_table(method: str, table: LiveTable) -> None:
+    try:
+        records = await _fetch_pages(
+            method, FUTURES_LIVE_MAX_ROWS, policy=(0.0, 0.0), limit=1000
+        )
+        table.load(records)
+    finally:
+        table.refresh = None
+
+
+@poly_mcp.tool(annotations=ToolAnnotations(readOnlyHint=True))
+async def batch(
+    calls: List[Dict[str, Any]],
+) -> str:
+    """
+    Run several tool calls concurrently and return all their results.
+
+    Each call is {"tool": "<tool name>", "args": {...}}, e.g.
+    [{"tool": "get_ticker_details", "args": {"ticker": "AAPL"}},
+     {"tool": "get_snapshot_ticker",
+      "args": {"market_type": "stocks", "ticker": "AAPL"}}].
+    Identical calls run once. Results are returned in order, each under a
+    "# <n>. <tool>" heading.
+    """
+    try:
+        if len(calls) > BATCH_MAX_CALLS:
+            return f"Error: a batch can contain at most {BATCH_MAX_CALLS} calls"
+
+        runs: Dict[str, asyncio.Task] = {}
+        sections = []
+        for call in calls:
+            tool = call.get("tool", "")
+            args = call.get("args") or {}
+            key = json.dumps([tool, args], sort_keys=True, default=str)
+            if key not in runs:
+                runs[key] = asyncio.ensure_future(_run_batched_call(tool, args))
+            sections.append((tool, runs[key]))
+
+        await asyncio.gather(*runs.values())
+        return "\n".join(
+            f"# {i}. {tool}\n{task.result()}"
+            for i, (tool, task) in enumerate(sections, start=1)
+        )
+    except Exception as e:
+        return f"Error: {e}"
+
+
+async def _run_batched_call(tool: str, args: Dict[str, Any]) -> str:
+    """Run one call of a batch, returning errors as text like the tools do."""
+    if tool == "batch":
+        return "Error: batch calls can't be nested"
+    try:
+        result = await poly_mcp.call_tool(tool, args)
+    except Exception as e:
+        return f"Error: {e}"
+    # Depending on the mcp version, results come as (content, structured)
+    # or as the content blocks alone.
+    content = result[0] if isinstance(result, tuple) else result
+    if isinstance(content, dict):
+        return str(content.get("result", json.dumps(content, default=str)))
+    return "".join(block.text for block in content if isinstance(block, TextContent))
+
+
 # Directly expose the MCP server object
 # It will be run from entrypoint.py
 
 
 def run(transport: Literal["stdio", "sse", "streamable-http"] = "stdio") -> None:
     """Run the Polygon MCP server."""
+    if transport != "stdio" and MCP_WORKERS > 1:
+        serve_workers(
+            transport,
+            workers=MCP_WORKERS,
+            host=poly_mcp.settings.host,
+            port=poly_mcp.settings.port,
+            log_level=poly_mcp.settings.log_level.lower(),
+        )
+        return
+
     poly_mcp.run(transport)
@@ -0,0 +1,166 @@
+import asyncio
+import sqlite3
+import threading
+import time
+from typing import Optional
+
+from .upstream import RateLimiter
+
+# Purge expired cache rows after this many writes.
+PURGE_EVERY = 500
+# Milliseconds a connection waits for another process's write lock.
+BUSY_TIMEOUT_MS = 5000
+
+
+class SharedState:
+    """
+    SQLite-backed state shared by the server's worker processes.
+
+    Holds a second-level response cache and token buckets for rate limiting.
+    Timestamps are wall-clock seconds so every process agrees on them. The
+    database runs in WAL mode, so readers never block the single writer.
+    Methods block on disk I/O and on other processes' write locks; async
+    callers run them in a worker thread.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._writes = 0
+        self._conn = sqlite3.connect(
+            path,
+            timeout=BUSY_TIMEOUT_MS / 1000,
+            isolation_level=None,
+            check_same_thread=False,
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, error TEXT, "
+            "expires_at REAL NOT NULL, stale_until REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS buckets ("
+            "name TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL)"
+        )
+
+    def get(self, key: str) -> Optional[tuple[str, Optional[str], float, float]]:
+        """
+        Look up a cache row.
+
+        Returns:
+            (value, error, expires_at, stale_until), or None if absent
+        """
+        with self._lock:
+            return self._conn.execute(
+                "SELECT value, error, expires_at, stale_until FROM cache WHERE key = ?",
+                (key,),
+            ).fetchone()
+
+    def put(
+        self,
+        key: str,
+        value: str,
+        error: Optional[str],
+        expires_at: float,
+        stale_until: float,
+    ) -> None:
+        """Insert or replace a cache row."""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache VALUES (?, ?, ?, ?, ?)",
+                (key, value, error, expires_at, stale_until),
+            )
+            self._writes += 1
+            if self._writes % PURGE_EVERY == 0:
+                self._conn.execute(
+                    "DELETE FROM cache WHERE MAX(expires_at, stale_until) < ?",
+                    (time.time(),),
+                )
+
+    def take_token(
+        self, name: str, rate: float, burst: float, blocking: bool = True
+    ) -> float:
+        """
+        Take one token from a named bucket.
+
+        Args:
+            name: Bucket name
+            rate: Tokens added per second
+            burst: Bucket capacity
+            blocking: Wait up to the connection timeout for another process
+                holding the write lock; if False, give up at once
+
+        Returns:
+            0 if a token was taken, otherwise seconds until one is available
+            (inf if the lock wasn't free and blocking is False)
+        """
+        with self._lock:
+            now = time.time()
+            try:
+                if not blocking:
+                    self._conn.execute("PRAGMA busy_timeout = 0")
+                try:
+                    self._conn.execute("BEGIN IMMEDIATE")
+                finally:
+                    if not blocking:
+                        self._conn.execute(f"PRAGMA busy_timeout = {BUSY_TIMEOUT_MS}")
+            except sqlite3.OperationalError:
+                if blocking:
+                    raise
+                return float("inf")
+            try:
+                row = self._conn.execute(
+                    "SELECT tokens, updated FROM buckets WHERE name = ?", (name,)
+                ).fetchone()
+                tokens = burst if row is None else row[0] + (now - row[1]) * rate
+                tokens = min(burst, tokens)
+                wait = 0.0
+                if tokens >= 1:
+                    tokens -= 1
+                else:
+                    wait = (1 - tokens) / rate
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO buckets VALUES (?, ?, ?)",
+                    (name, tokens, now),
+                )
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+            return wait
+
+
+class SharedRateLimiter(RateLimiter):
+    """RateLimiter whose token bucket lives in SharedState."""
+
+    def __init__(
+        self,
+        state: SharedState,
+        rate: float = 0.0,
+        burst: Optional[float] = None,
+        name: str = "polygon",
+    ):
+        super().__init__(rate, burst)
+        self.state = state
+        self.name = name
+
+    def try_acquire(self) -> bool:
+        """Take a token if one is available right now, without waiting on locks."""
+        if self.rate <= 0:
+            return True
+        wait = self.state.take_token(self.name, self.rate, self.burst, blocking=False)
+        return wait == 0
+
+    async def acquire(self) -> None:
+        """Wait until a token is available and take it."""
+        if self.rate <= 0:
+            return
+        while True:
+            wait = await asyncio.to_thread(
+                self.state.take_token, self.name, self.rate, self.burst
+            )
+            if wait == 0:
+                return
+            await asyncio.sleep(wait)
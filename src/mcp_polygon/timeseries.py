@@ -0,0 +1,138 @@
+import asyncio
+from bisect import bisect_left, bisect_right
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+
+def to_day(value: Any) -> date:
+    """
+    Convert a date, datetime or ISO 8601 string to a date.
+
+    Raises:
+        ValueError: If value isn't a date
+    """
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    if isinstance(value, str):
+        return date.fromisoformat(value[:10])
+    raise ValueError(f"Invalid date: {value!r}")
+
+
+def date_range(
+    eq: Any = None,
+    any_of: Optional[str] = None,
+    gt: Any = None,
+    gte: Any = None,
+    lt: Any = None,
+    lte: Any = None,
+) -> Tuple[Optional[date], Optional[date], Optional[Set[date]]]:
+    """
+    Combine date filters into an inclusive (since, until, days) selection.
+
+    days is the set of dates allowed by eq or any_of (comma-separated), or
+    None if every date in range is allowed.
+    """
+    days = None
+    if eq is not None:
+        days = {to_day(eq)}
+    if any_of:
+        allowed = {to_day(day.strip()) for day in any_of.split(",") if day.strip()}
+        days = allowed if days is None else days & allowed
+
+    lower = [to_day(gte)] if gte is not None else []
+    if gt is not None:
+        lower.append(to_day(gt) + timedelta(days=1))
+    upper = [to_day(lte)] if lte is not None else []
+    if lt is not None:
+        upper.append(to_day(lt) - timedelta(days=1))
+    if days is not None:
+        lower.append(min(days, default=date.max))
+        upper.append(max(days, default=date.min))
+    return max(lower, default=None), min(upper, default=None), days
+
+
+class TimeSeries:
+    """
+    Append-only local copy of one dated series, e.g. a ticker's short interest.
+
+    Records are kept sorted by date, one per date, and cover every date from
+    covers_from (date.min once the full history is loaded) to the newest
+    record, the high-water mark. New records are only ever fetched past the
+    high-water mark; older ranges are backfilled when a query reaches
+    before covers_from.
+    """
+
+    def __init__(self, date_field: str, cadence_days: int):
+        self.date_field = date_field
+        self.cadence = timedelta(days=cadence_days)
+        self.dates: List[date] = []
+        self.records: List[Dict[str, Any]] = []
+        self.covers_from: Optional[date] = None
+        self.polled_at = float("-inf")
+        self.lock = asyncio.Lock()
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    @property
+    def high_water(self) -> Optional[date]:
+        return self.dates[-1] if self.dates else None
+
+    def add(self, records: Iterable[Dict[str, Any]]) -> None:
+        """Insert records, replacing any held for the same date."""
+        for record in records:
+            try:
+                day = to_day(record.get(self.date_field))
+            except ValueError:
+                continue
+            i = bisect_left(self.dates, day)
+            if i < len(self.dates) and self.dates[i] == day:
+                self.records[i] = record
+            else:
+                self.dates.insert(i, day)
+                self.records.insert(i, record)
+
+    def due(self, today: date) -> bool:
+        """Return True if a record newer than the high-water mark may be out."""
+        high_water = self.high_water
+        return high_water is None or today >= high_water + self.cadence
+
+    def query(
+        self,
+        since: Optional[date] = None,
+        until: Optional[date] = None,
+        days: Optional[Set[date]] = None,
+        limit: int = 10,
+        ascending: bool = False,
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Select records within an inclusive date range.
+
+        Returns:
+            Up to limit records, newest first unless ascending, or None if
+            the range reaches before covers_from and the missing history
+            could change the answer
+        """
+        if self.covers_from is None:
+            return None
+        start = 0 if since is None else bisect_left(self.dates, since)
+        end = len(self.dates) if until is None else bisect_right(self.dates, until)
+        selected = [
+            record
+            for day, record in zip(self.dates[start:end], self.records[start:end])
+            if days is None or day in days
+        ]
+        if not ascending:
+            selected.reverse()
+        selected = selected[:limit]
+
+        if since is not None and since >= self.covers_from:
+            return selected
+        if self.covers_from == date.min:
+            return selected
+        # Newest first is complete as long as the held range fills the limit.
+        if not ascending and len(selected) == limit:
+            return selected
+        return None
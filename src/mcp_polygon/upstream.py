@@ -0,0 +1,314 @@
+import asyncio
+import json
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Awaitable, Callable, Iterator, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class RateLimiter:
+    """
+    Token bucket limiting upstream requests per second.
+
+    A rate of 0 disables limiting. ``try_acquire`` never waits, which lets
+    optional work such as hedged requests run only when spare quota exists.
+    """
+
+    def __init__(self, rate: float = 0.0, burst: Optional[float] = None):
+        self.rate = rate
+        self.burst = burst if burst is not None else max(rate, 1.0)
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def try_acquire(self) -> bool:
+        """Take a token if one is available right now."""
+        if self.rate <= 0:
+            return True
+        self._refill()
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return True
+        return False
+
+    async def acquire(self) -> None:
+        """Wait until a token is available and take it."""
+        if self.rate <= 0:
+            return
+        # Waiters queue on the lock so tokens are handed out in arrival order.
+        async with self._lock:
+            self._refill()
+            if self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+                self._refill()
+            self._tokens -= 1
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+
+class LatencyTracker:
+    """Rolling window of observed latencies per endpoint."""
+
+    def __init__(self, window: int = 200, min_samples: int = 20):
+        self.window = window
+        self.min_samples = min_samples
+        self._samples: dict[str, deque[float]] = {}
+
+    def record(self, name: str, seconds: float) -> None:
+        """Record one request duration."""
+        samples = self._samples.get(name)
+        if samples is None:
+            samples = self._samples[name] = deque(maxlen=self.window)
+        samples.append(seconds)
+
+    def percentile(self, name: str, q: float) -> Optional[float]:
+        """
+        Return the q-th percentile latency (0 < q <= 1) for an endpoint.
+
+        Returns None until min_samples durations have been recorded.
+        """
+        samples = self._samples.get(name)
+        if samples is None or len(samples) < self.min_samples:
+            return None
+        ordered = sorted(samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class HedgeBudget:
+    """
+    Caps hedged requests at a fraction of primary requests.
+
+    Each primary request earns ``ratio`` credits and each hedge spends one,
+    so hedging can never add more than ``ratio`` extra load.
+    """
+
+    def __init__(self, ratio: float = 0.1, max_credits: float = 10.0):
+        self.ratio = ratio
+        self.max_credits = max_credits
+        self._credits = 0.0
+
+    def earn(self) -> None:
+        """Credit one primary request."""
+        self._credits = min(self.max_credits, self._credits + self.ratio)
+
+    def available(self) -> bool:
+        """Return True if a hedge could be paid for now, without spending."""
+        return self._credits >= 1
+
+    def try_spend(self) -> bool:
+        """Spend a credit for a hedge if one is available."""
+        if self._credits >= 1:
+            self._credits -= 1
+            return True
+        return False
+
+
+# Endpoint families sharing a circuit breaker, matched in order against the
+# RESTClient method name. Anything unmatched is reference data.
+ENDPOINT_FAMILIES = (
+    ("benzinga", "benzinga"),
+    ("futures", "futures"),
+    ("snapshot", "snapshots"),
+    ("agg", "aggs"),
+    ("trade", "trades"),
+    ("quote", "trades"),
+    ("currency_conversion", "trades"),
+)
+
+
+def endpoint_family(method: str) -> str:
+    """Return the circuit breaker family for a RESTClient method name."""
+    for fragment, family in ENDPOINT_FAMILIES:
+        if fragment in method:
+            return family
+    return "reference"
+
+
+class Unavailable(Exception):
+    """
+    Request rejected locally without calling upstream.
+
+    The message is a JSON object with the reason and a retry_after hint in
+    seconds, so agents can back off programmatically.
+    """
+
+    def __init__(self, reason: str, retry_after: float, **details: str):
+        self.reason = reason
+        self.retry_after = retry_after
+        super().__init__(
+            json.dumps(
+                {"error": reason, "retry_after": round(retry_after, 1), **details}
+            )
+        )
+
+
+class CircuitBreaker:
+    """
+    Fails fast while an endpoint family is unhealthy.
+
+    After ``failure_threshold`` consecutive failures the circuit opens and
+    calls are rejected for ``reset_timeout`` seconds. It then goes half-open
+    and lets a single probe through: success closes the circuit, failure
+    reopens it.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half-open"
+
+    def __init__(
+        self, name: str, failure_threshold: int = 5, reset_timeout: float = 30.0
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+
+    def before_call(self) -> None:
+        """
+        Admit a call or reject it.
+
+        Raises:
+            Unavailable: If the circuit is open or a half-open probe is running
+        """
+        if self.state == self.CLOSED:
+            return
+
+        now = time.monotonic()
+        if self.state == self.OPEN:
+            remaining = self._opened_at + self.reset_timeout - now
+            if remaining > 0:
+                raise Unavailable("circuit_open", remaining, family=self.name)
+            self.state = self.HALF_OPEN
+
+        if self._probing:
+            raise Unavailable("circuit_half_open", 1.0, family=self.name)
+        self._probing = True
+
+    def record_success(self) -> None:
+        """Close the circuit after a successful call."""
+        self.state = self.CLOSED
+        self._failures = 0
+        self._probing = False
+
+    def record_failure(self) -> None:
+        """Count an upstream failure, opening the circuit at the threshold."""
+        self._failures += 1
+        self._probing = False
+        if self.state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+            self.state = self.OPEN
+            self._opened_at = time.monotonic()
+
+    def release(self) -> None:
+        """End a call that neither succeeded nor failed, e.g. a client error."""
+        self._probing = False
+
+
+class AdmissionController:
+    """
+    Bounds the number of upstream requests in flight.
+
+    Requests over the limit are rejected immediately instead of queueing, so
+    memory and latency stay bounded when upstream slows down.
+    """
+
+    def __init__(self, max_in_flight: int = 64, retry_after: float = 1.0):
+        self.max_in_flight = max_in_flight
+        self.retry_after = retry_after
+        self.in_flight = 0
+
+    @contextmanager
+    def slot(self) -> Iterator[None]:
+        """
+        Hold an in-flight slot for the duration of the block.
+
+        Raises:
+            Unavailable: If every slot is taken
+        """
+        if self.in_flight >= self.max_in_flight:
+            raise Unavailable("overloaded", self.retry_after)
+        self.in_flight += 1
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+
+
+class DeadlineExceeded(TimeoutError):
+    """
+    Upstream request did not complete within its deadline.
+    """
+
+    pass
+
+
+async def hedged_call(
+    call: Callable[[], Awaitable[T]],
+    timeout: Optional[float] = None,
+    hedge_after: Optional[float] = None,
+    can_hedge: Callable[[], bool] = lambda: True,
+) -> T:
+    """
+    Run call, racing a duplicate against it if it is slow.
+
+    Args:
+        call: Coroutine factory for the request; invoked again for the hedge
+        timeout: Overall deadline in seconds, or None to wait indefinitely
+        hedge_after: Seconds to wait before sending a duplicate, or None to
+                     never hedge
+        can_hedge: Checked when the hedge is due; returning False skips it
+
+    Returns:
+        The result of whichever request succeeds first
+
+    Raises:
+        DeadlineExceeded: If no request succeeds before the deadline
+        Exception: The last error if every request fails
+
+    Requests still pending at the end are cancelled, which only stops the
+    wait: a request running in a thread completes in the background.
+    """
+    loop = asyncio.get_running_loop()
+    deadline = None if timeout is None else loop.time() + timeout
+    pending = {asyncio.ensure_future(call())}
+    hedged = hedge_after is None
+    error: Optional[BaseException] = None
+    try:
+        while pending:
+            wait = None if deadline is None else deadline - loop.time()
+            if wait is not None and wait <= 0:
+                break
+            if not hedged:
+                wait = hedge_after if wait is None else min(wait, hedge_after)
+
+            done, pending = await asyncio.wait(
+                pending, timeout=wait, return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in done:
+                if task.exception() is None:
+                    return task.result()
+                error = task.exception()
+
+            if not done and not hedged:
+                hedged = True
+                in_time = deadline is None or loop.time() < deadline
+                if in_time and can_hedge():
+                    pending.add(asyncio.ensure_future(call()))
+            elif not pending and not hedged:
+                # The primary failed fast; a hedge wouldn't help.
+                break
+
+        if error is not None:
+            raise error
+        raise DeadlineExceeded(f"Upstream request timed out after {timeout:.2f}s")
+    finally:
+        for task in pending:
+            task.cancel()
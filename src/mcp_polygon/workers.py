@@ -0,0 +1,270 @@
+import asyncio
+import itertools
+import multiprocessing
+import os
+import re
+import shutil
+import tempfile
+from collections import OrderedDict
+from typing import Literal, Optional
+
+import httpx
+from starlette.background import BackgroundTask
+from starlette.requests import Request
+from starlette.responses import Response, StreamingResponse
+
+# Environment variables read by worker processes.
+WORKER_SOCKET_ENV = "MCP_POLYGON_WORKER_SOCKET"
+STATE_DB_ENV = "MCP_POLYGON_STATE_DB"
+
+# Seconds to wait for worker sockets before giving up on startup.
+WORKER_STARTUP_TIMEOUT = 60.0
+
+SESSION_HEADER = "mcp-session-id"
+# SSE sessions announce their id in the first event, e.g.
+# "data: /messages/?session_id=9f1c...".
+SSE_SESSION_ID = re.compile(rb"session_id=([0-9a-fA-F-]+)")
+SSE_SNIFF_BYTES = 4096
+
+# Headers that describe a single connection and must not be forwarded.
+HOP_BY_HOP_HEADERS = {
+    "connection",
+    "keep-alive",
+    "proxy-connection",
+    "transfer-encoding",
+    "upgrade",
+    "te",
+    "trailer",
+    "host",
+    "content-length",
+}
+
+
+def worker_count(value: Optional[str]) -> int:
+    """
+    Parse the MCP_WORKERS setting.
+
+    Accepts a positive integer or "auto" for one worker per CPU core; anything
+    else means a single process.
+    """
+    if value == "auto":
+        return os.cpu_count() or 1
+    try:
+        return max(1, int(value))
+    except (TypeError, ValueError):
+        return 1
+
+
+class SessionRouter:
+    """
+    ASGI reverse proxy pinning each MCP session to one worker.
+
+    Requests without a session go to workers round-robin. Session ids issued
+    by a worker are learned from the mcp-session-id response header
+    (streamable HTTP) or the SSE endpoint event, and later requests for that
+    session are forwarded to the same worker. Unknown session ids are routed
+    by hash so routing stays stable even after the table was trimmed.
+    """
+
+    def __init__(self, sockets: list[str], max_sessions: int = 100_000):
+        self.sockets = sockets
+        self.max_sessions = max_sessions
+        self.sessions: OrderedDict[str, int] = OrderedDict()
+        self._next_worker = itertools.cycle(range(len(sockets)))
+        self._clients: list[httpx.AsyncClient] = []
+
+    def worker_for(self, session_id: Optional[str]) -> int:
+        """Return the worker index for a session id, or the next worker if None."""
+        if session_id is None:
+            return next(self._next_worker)
+        worker = self.sessions.get(session_id)
+        if worker is None:
+            return hash(session_id) % len(self.sockets)
+        self.sessions.move_to_end(session_id)
+        return worker
+
+    def remember(self, session_id: str, worker: int) -> None:
+        """Pin a session to a worker, forgetting the oldest sessions at capacity."""
+        self.sessions[session_id] = worker
+        self.sessions.move_to_end(session_id)
+        while len(self.sessions) > self.max_sessions:
+            self.sessions.popitem(last=False)
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+            return
+        if scope["type"] != "http":
+            return
+
+        request = Request(scope, receive)
+        session_id = request.headers.get(SESSION_HEADER) or request.query_params.get(
+            "session_id"
+        )
+        worker = self.worker_for(session_id)
+
+        path = request.url.path
+        if request.url.query:
+            path += "?" + request.url.query
+        client = self._clients[worker]
+        upstream_request = client.build_request(
+            request.method,
+            path,
+            headers=[
+                (name, value)
+                for name, value in request.headers.items()
+                if name not in HOP_BY_HOP_HEADERS
+            ],
+            content=await request.body(),
+        )
+        try:
+            upstream = await client.send(upstream_request, stream=True)
+        except httpx.TransportError:
+            # The worker is restarting; the client can retry shortly.
+            response = Response(status_code=503, headers={"Retry-After": "1"})
+            await response(scope, receive, send)
+            return
+
+        issued = upstream.headers.get(SESSION_HEADER)
+        if issued:
+            self.remember(issued, worker)
+        if request.method == "DELETE" and session_id:
+            self.sessions.pop(session_id, None)
+
+        response = StreamingResponse(
+            self._relay(upstream, worker),
+            status_code=upstream.status_code,
+            headers={
+                name: value
+                for name, value in upstream.headers.items()
+                if name not in HOP_BY_HOP_HEADERS
+            },
+            background=BackgroundTask(upstream.aclose),
+        )
+        await response(scope, receive, send)
+
+    async def _relay(self, upstream: httpx.Response, worker: int):
+        sniffed = b""
+        sniffing = upstream.headers.get("content-type", "").startswith(
+            "text/event-stream"
+        )
+        async for chunk in upstream.aiter_raw():
+            if sniffing:
+                sniffed += chunk
+                match = SSE_SESSION_ID.search(sniffed)
+                if match:
+                    self.remember(match.group(1).decode("ascii"), worker)
+                if match or len(sniffed) > SSE_SNIFF_BYTES:
+                    sniffing = False
+            yield chunk
+
+    async def _lifespan(self, receive, send) -> None:
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                self._clients = [
+                    httpx.AsyncClient(
+                        transport=httpx.AsyncHTTPTransport(uds=path),
+                        base_url="http://worker",
+                        timeout=httpx.Timeout(None, connect=10.0),
+                    )
+                    for path in self.sockets
+                ]
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                for client in self._clients:
+                    await client.aclose()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+
+def run_worker(transport: Literal["sse", "streamable-http"]) -> None:
+    """Serve the MCP app on the unix socket named in the environment."""
+    import uvicorn
+
+    from .server import poly_mcp
+
+    if transport == "sse":
+        app = poly_mcp.sse_app()
+    else:
+        app = poly_mcp.streamable_http_app()
+    uvicorn.run(
+        app,
+        uds=os.environ[WORKER_SOCKET_ENV],
+        log_level=poly_mcp.settings.log_level.lower(),
+    )
+
+
+def _spawn_worker(
+    context, transport: str, socket_path: str
+) -> multiprocessing.process.BaseProcess:
+    if os.path.exists(socket_path):
+        os.unlink(socket_path)
+    os.environ[WORKER_SOCKET_ENV] = socket_path
+    process = context.Process(target=run_worker, args=(transport,), daemon=True)
+    process.start()
+    return process
+
+
+async def _supervise(
+    context, transport: str, sockets: list[str], processes: list
+) -> None:
+    """Restart workers that exit unexpectedly."""
+    while True:
+        await asyncio.sleep(1.0)
+        for i, process in enumerate(processes):
+            if not process.is_alive():
+                processes[i] = _spawn_worker(context, transport, sockets[i])
+
+
+def serve(
+    transport: Literal["sse", "streamable-http"],
+    workers: int,
+    host: str,
+    port: int,
+    log_level: str = "info",
+) -> None:
+    """
+    Run the server as a session-routing front process and worker processes.
+
+    Workers serve the MCP app on private unix sockets and share the response
+    cache and rate limiter through a SQLite database, so adding workers
+    neither multiplies upstream quota nor fragments the cache.
+    """
+    import uvicorn
+
+    runtime_dir = tempfile.mkdtemp(prefix="mcp_polygon-")
+    os.environ.setdefault(STATE_DB_ENV, os.path.join(runtime_dir, "state.sqlite3"))
+    sockets = [os.path.join(runtime_dir, f"worker-{i}.sock") for i in range(workers)]
+
+    context = multiprocessing.get_context("spawn")
+    processes = [_spawn_worker(context, transport, path) for path in sockets]
+    router = SessionRouter(sockets)
+
+    async def main() -> None:
+        # Don't accept connections until every worker is listening.
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + WORKER_STARTUP_TIMEOUT
+        while not all(os.path.exists(path) for path in sockets):
+            if loop.time() > deadline:
+                raise RuntimeError("Timed out waiting for workers to start")
+            await asyncio.sleep(0.1)
+
+        supervisor = asyncio.create_task(
+            _supervise(context, transport, sockets, processes)
+        )
+        try:
+            config = uvicorn.Config(router, host=host, port=port, log_level=log_level)
+            await uvicorn.Server(config).serve()
+        finally:
+            supervisor.cancel()
+
+    try:
+        asyncio.run(main())
+    finally:
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            process.join(timeout=5)
+        # The shared cache holds every tenant's responses; don't leave it behind.
+        shutil.rmtree(runtime_dir, ignore_errors=True)
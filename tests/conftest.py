@@ -0,0 +1,69 @@
+import json
+from typing import Any, Callable, Dict, Union
+
+import pytest
+
+from mcp_polygon import server
+
+# A canned body, or a function building one from the request's arguments.
+Body = Union[Dict[str, Any], Callable[..., Dict[str, Any]]]
+
+
+class FakeResponse:
+    """Raw urllib3 response stand-in, as returned with raw=True."""
+
+    def __init__(self, body: Any):
+        self.data = json.dumps(body).encode("utf-8")
+
+
+class FakeClient:
+    """
+    Stands in for RESTClient, serving canned bodies per method.
+
+    Every call is recorded in calls as (method, kwargs), raw excluded.
+    Methods under vx (e.g. "vx.list_stock_financials") are served by name
+    without the prefix, and next_url pages fetched with _get by "_get".
+    """
+
+    headers: dict = {}
+
+    def __init__(self, **bodies: Body):
+        self.bodies = bodies
+        self.calls: list[tuple[str, Dict[str, Any]]] = []
+
+    @property
+    def vx(self) -> "FakeClient":
+        return self
+
+    def __getattr__(self, name: str):
+        if name not in self.bodies:
+            raise AttributeError(name)
+
+        def method(raw: bool = False, **kwargs: Any) -> FakeResponse:
+            self.calls.append((name, kwargs))
+            body = self.bodies[name]
+            return FakeResponse(body(**kwargs) if callable(body) else body)
+
+        return method
+
+    def called(self, name: str) -> list[Dict[str, Any]]:
+        """Return the kwargs of every call to a method, in call order."""
+        return [kwargs for method, kwargs in self.calls if method == name]
+
+
+@pytest.fixture
+def polygon(monkeypatch) -> Callable[..., FakeClient]:
+    """
+    Install a FakeClient as the server's Polygon client.
+
+    Returns a function taking the canned bodies per method, which installs
+    the client with an empty response cache and returns it.
+    """
+
+    def install(**bodies: Body) -> FakeClient:
+        fake = FakeClient(**bodies)
+        monkeypatch.setattr(server, "polygon_client", fake)
+        monkeypatch.setattr(server, "response_cache", server.ResponseCache())
+        return fake
+
+    return install
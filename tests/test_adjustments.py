@@ -0,0 +1,113 @@
+from datetime import datetime
+
+import pytest
+
+from mcp_polygon.adjustments import (
+    SplitAdjuster,
+    has_corporate_actions,
+    split_fingerprint,
+)
+from mcp_polygon.market_calendar import EASTERN
+
+# AAPL's 4-for-1 split
+SPLITS = [
+    {
+        "execution_date": "2020-08-31",
+        "id": "E1",
+        "split_from": 1,
+        "split_to": 4,
+        "ticker": "AAPL",
+    },
+]
+
+
+def _ms(*args):
+    return int(datetime(*args, tzinfo=EASTERN).timestamp() * 1000)
+
+
+def _bar(timestamp, price=100.0, volume=1000):
+    return {
+        "o": price,
+        "h": price,
+        "l": price,
+        "c": price,
+        "vw": price,
+        "v": volume,
+        "n": 10,
+        "t": timestamp,
+    }
+
+
+class TestSplitAdjuster:
+    """Tests for the SplitAdjuster class."""
+
+    def test_bar_before_split_adjusted(self):
+        """Test that bars before the execution date are scaled."""
+        bar = SplitAdjuster(SPLITS).adjust_bars([_bar(_ms(2020, 8, 28, 9, 30))])[0]
+        assert bar["o"] == pytest.approx(25.0)
+        assert bar["vw"] == pytest.approx(25.0)
+        assert bar["v"] == pytest.approx(4000)
+        assert bar["n"] == 10
+
+    def test_bar_on_execution_date_unchanged(self):
+        """Test that bars from the execution date onward are untouched."""
+        bar = _bar(_ms(2020, 8, 31, 4, 0))
+        assert SplitAdjuster(SPLITS).adjust_bars([bar])[0] is bar
+
+    def test_multiple_splits_compound(self):
+        """Test that splits after a bar multiply together."""
+        splits = SPLITS + [
+            {"execution_date": "2014-06-09", "split_from": 1, "split_to": 7}
+        ]
+        adjuster = SplitAdjuster(splits)
+        assert adjuster.factor_at(_ms(2014, 6, 6, 12, 0)) == pytest.approx(1 / 28)
+        assert adjuster.factor_at(_ms(2014, 6, 9, 12, 0)) == pytest.approx(1 / 4)
+        assert adjuster.factor_at(_ms(2021, 1, 4, 12, 0)) == 1.0
+
+    def test_reverse_split(self):
+        """Test that reverse splits raise historical prices."""
+        adjuster = SplitAdjuster(
+            [{"execution_date": "2023-01-03", "split_from": 10, "split_to": 1}]
+        )
+        bar = adjuster.adjust_bars([_bar(_ms(2022, 12, 30, 12, 0))])[0]
+        assert bar["c"] == pytest.approx(1000.0)
+        assert bar["v"] == pytest.approx(100)
+
+    def test_invalid_splits_ignored(self):
+        """Test that malformed split records are skipped."""
+        adjuster = SplitAdjuster(
+            [{"execution_date": "bad"}, {"execution_date": "2020-01-02"}]
+        )
+        assert not adjuster
+
+    def test_adjust_response(self):
+        """Test adjusting a full aggregates response."""
+        response = {
+            "adjusted": False,
+            "results": [_bar(_ms(2020, 8, 28, 0, 0)), _bar(_ms(2020, 8, 31, 0, 0))],
+            "ticker": "AAPL",
+        }
+        adjusted = SplitAdjuster(SPLITS).adjust_response(response)
+        assert adjusted["adjusted"] is True
+        assert [bar["c"] for bar in adjusted["results"]] == [25.0, 100.0]
+        # The cached unadjusted response is not modified
+        assert response["adjusted"] is False
+        assert response["results"][0]["c"] == 100.0
+
+
+class TestSplitHelpers:
+    """Tests for the split helper functions."""
+
+    def test_has_corporate_actions(self):
+        """Test that only stock tickers are split-adjusted."""
+        assert has_corporate_actions("AAPL")
+        assert not has_corporate_actions("X:BTCUSD")
+        assert not has_corporate_actions("O:AAPL251017C00150000")
+
+    def test_split_fingerprint(self):
+        """Test that fingerprints ignore order and detect new splits."""
+        new_split = {"execution_date": "2025-01-02", "split_from": 1, "split_to": 2}
+        assert split_fingerprint(SPLITS + [new_split]) == split_fingerprint(
+            [new_split] + SPLITS
+        )
+        assert split_fingerprint(SPLITS) != split_fingerprint(SPLITS + [new_split])
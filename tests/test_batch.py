@@ -0,0 +1,68 @@
+import asyncio
+
+import pytest
+
+from mcp_polygon import server
+
+
+@pytest.fixture
+def client(polygon):
+    return polygon(
+        get_previous_close_agg=lambda ticker, **kwargs: {
+            "results": [{"T": ticker, "c": 1.5}]
+        },
+        list_splits={"results": []},
+    )
+
+
+class TestBatch:
+    """Tests for the batch tool."""
+
+    def test_results_in_order(self, client):
+        """Test that each call's result appears under its own heading."""
+        result = asyncio.run(
+            server.batch(
+                [
+                    {"tool": "get_previous_close_agg", "args": {"ticker": "AAPL"}},
+                    {"tool": "get_previous_close_agg", "args": {"ticker": "MSFT"}},
+                ]
+            )
+        )
+        assert result == (
+            "# 1. get_previous_close_agg\nT,c\nAAPL,1.5\n\n"
+            "# 2. get_previous_close_agg\nT,c\nMSFT,1.5\n"
+        )
+
+    def test_duplicate_calls_run_once(self, client):
+        """Test that identical calls share one execution."""
+        call = {"tool": "get_previous_close_agg", "args": {"ticker": "AAPL"}}
+        result = asyncio.run(server.batch([call, dict(call)]))
+        assert result.count("AAPL,1.5") == 2
+        calls = client.called("get_previous_close_agg")
+        assert [kwargs["ticker"] for kwargs in calls] == ["AAPL"]
+
+    def test_errors_reported_per_call(self, client):
+        """Test that a failing call doesn't affect the others."""
+        result = asyncio.run(
+            server.batch(
+                [
+                    {"tool": "no_such_tool", "args": {}},
+                    {"tool": "get_previous_close_agg", "args": {}},
+                    {"tool": "batch", "args": {"calls": []}},
+                    {"tool": "get_previous_close_agg", "args": {"ticker": "AAPL"}},
+                ]
+            )
+        )
+        sections = result.split("# ")[1:]
+        assert "Unknown tool" in sections[0]
+        assert "ticker" in sections[1] and "Error" in sections[1]
+        assert "can't be nested" in sections[2]
+        assert "AAPL,1.5" in sections[3]
+
+    def test_too_many_calls(self, client):
+        """Test that oversized batches are rejected."""
+        calls = [{"tool": "get_previous_close_agg", "args": {"ticker": "A"}}] * (
+            server.BATCH_MAX_CALLS + 1
+        )
+        assert asyncio.run(server.batch(calls)).startswith("Error:")
+        assert client.calls == []
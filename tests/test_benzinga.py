@@ -0,0 +1,157 @@
+import asyncio
+
+import pytest
+from polygon import RESTClient
+
+from mcp_polygon import server
+from mcp_polygon.benzinga import (
+    TRACK_RECORD_FIELDS,
+    EntityIndex,
+    equality_filters,
+    join_ratings,
+)
+
+ANALYSTS = [
+    {
+        "benzinga_id": "a1",
+        "benzinga_firm_id": "f1",
+        "firm_name": "Wedbush",
+        "full_name": "Dan Ives",
+        "smart_score": 70.0,
+        "overall_success_rate": 0.6,
+        "overall_avg_return": 5.0,
+        "total_ratings": 300,
+    },
+    {
+        "benzinga_id": "a2",
+        "benzinga_firm_id": "f2",
+        "firm_name": "Morgan Stanley",
+        "full_name": "Dan Smith",
+    },
+    {"benzinga_id": "a3", "benzinga_firm_id": "f2", "full_name": "Erik Woodring"},
+]
+
+FIRMS = [
+    {"benzinga_id": "f1", "name": "Wedbush"},
+    {"benzinga_id": "f2", "name": "Morgan Stanley"},
+]
+
+RATING = {
+    "benzinga_id": "r1",
+    "benzinga_analyst_id": "a1",
+    "benzinga_firm_id": "f1",
+    "analyst": "Dan Ives",
+    "firm": "Wedbush",
+    "ticker": "AAPL",
+    "date": "2025-01-02",
+    "rating_action": "maintains",
+    "rating": "Outperform",
+    "price_target": 325.0,
+    "benzinga_news_url": "https://www.benzinga.com/...",
+    "notes": "Long notes",
+}
+
+
+def make_analysts():
+    index = EntityIndex("full_name")
+    index.load(ANALYSTS, now=0)
+    return index
+
+
+class TestEntityIndex:
+    """Tests for the EntityIndex class."""
+
+    def test_find(self):
+        """Test exact name matches before partial ones."""
+        index = make_analysts()
+        assert [a["benzinga_id"] for a in index.find("DAN IVES")] == ["a1"]
+        assert [a["benzinga_id"] for a in index.find("dan")] == ["a1", "a2"]
+        assert index.find("nobody") == []
+        assert index.find("") == []
+
+    def test_select(self):
+        """Test equality and any_of filters on several fields."""
+        index = make_analysts()
+        filters = equality_filters(
+            benzinga_id=(None, "a1,a2,a3"),
+            benzinga_firm_id=("f2", None),
+            full_name=(None, None),
+        )
+        assert filters == {
+            "benzinga_id": {"a1", "a2", "a3"},
+            "benzinga_firm_id": {"f2"},
+        }
+        assert [a["benzinga_id"] for a in index.select(filters, 10)] == ["a2", "a3"]
+        assert len(index.select({}, 2)) == 2
+
+    def test_reload_replaces(self):
+        """Test that a reload drops entities no longer listed."""
+        index = make_analysts()
+        index.load(ANALYSTS[:1], now=1)
+        assert len(index) == 1
+        assert index.find("smith") == []
+
+
+class TestJoinRatings:
+    """Tests for the join_ratings function."""
+
+    def test_track_record(self):
+        """Test that ratings are compacted and joined with their analyst."""
+        (row,) = join_ratings([RATING], make_analysts())
+        assert "notes" not in row
+        assert "benzinga_news_url" not in row
+        assert row["smart_score"] == 70.0
+        assert row["total_ratings"] == 300
+
+    def test_unknown_analyst(self):
+        """Test that a missing analyst leaves the track record empty."""
+        (row,) = join_ratings([{**RATING, "benzinga_analyst_id": "zz"}], None)
+        assert all(row[field] is None for field in TRACK_RECORD_FIELDS)
+
+
+class TestAnalystTools:
+    """Tests for the Benzinga entity tools."""
+
+    @pytest.fixture
+    def client(self, polygon, monkeypatch):
+        monkeypatch.setattr(server, "benzinga_entities", {})
+        return polygon(
+            list_benzinga_analysts={"results": ANALYSTS, "status": "OK"},
+            list_benzinga_firms={"results": FIRMS, "status": "OK"},
+            list_benzinga_ratings={"results": [RATING], "status": "OK"},
+        )
+
+    def test_ratings_by_analyst_name(self, client):
+        """Test that names resolve to IDs and the analyst list loads once."""
+        result = asyncio.run(server.get_analyst_ratings(analyst="Ives"))
+        header, row = result.splitlines()
+        assert header.endswith(
+            "smart_score,overall_success_rate,overall_avg_return,total_ratings"
+        )
+        assert row.endswith("70.0,0.6,5.0,300")
+        (ratings,) = client.called("list_benzinga_ratings")
+        assert ratings["benzinga_analyst_id_any_of"] == ["a1"]
+
+        asyncio.run(server.list_benzinga_analysts(benzinga_firm_id="f2"))
+        assert len(client.called("list_benzinga_analysts")) == 1
+
+    def test_ratings_by_ambiguous_name(self, client):
+        """Test that a name matching several analysts filters on all their IDs."""
+        asyncio.run(server.get_analyst_ratings(analyst="dan"))
+        (ratings,) = client.called("list_benzinga_ratings")
+        real = RESTClient("key")
+        query = real._get_params(
+            real.list_benzinga_ratings, {**ratings, "params": None}
+        )
+        assert query["benzinga_analyst_id.any_of"] == "a1,a2"
+
+    def test_unknown_name(self, client):
+        """Test that an unknown firm is reported without querying ratings."""
+        result = asyncio.run(server.get_analyst_ratings(firm="Nobody Capital"))
+        assert result == "Error: No Benzinga firm matches 'Nobody Capital'"
+        assert client.called("list_benzinga_ratings") == []
+
+    def test_local_firm_lookup(self, client):
+        """Test that firm ID lookups are answered from the index."""
+        result = asyncio.run(server.list_benzinga_firms(benzinga_id_any_of="f2,f9"))
+        assert result.splitlines() == ["benzinga_id,name", "f2,Morgan Stanley"]
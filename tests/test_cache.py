@@ -0,0 +1,163 @@
+import asyncio
+
+import pytest
+
+from mcp_polygon.cache import CachedNotFound, ResponseCache, is_not_found
+
+NOT_FOUND = '{"status":"NOT_FOUND","request_id":"abc","message":"Ticker not found."}'
+
+
+class FakeUpstream:
+    """Counts calls and returns numbered responses."""
+
+    def __init__(self, delay: float = 0.0, error: Exception | None = None):
+        self.calls = 0
+        self.delay = delay
+        self.error = error
+
+    async def __call__(self) -> str:
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+        return f"response-{self.calls}"
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+class TestResponseCache:
+    """Tests for the ResponseCache class."""
+
+    def test_fresh_hit(self):
+        """Test that fresh entries are served without refetching."""
+
+        async def scenario():
+            cache = ResponseCache()
+            upstream = FakeUpstream()
+            first = await cache.get_or_fetch("k", upstream, ttl=60)
+            second = await cache.get_or_fetch("k", upstream, ttl=60)
+            return first, second, upstream.calls
+
+        assert run(scenario()) == ("response-1", "response-1", 1)
+
+    def test_zero_ttl_not_cached(self):
+        """Test that a zero TTL disables caching."""
+
+        async def scenario():
+            cache = ResponseCache()
+            upstream = FakeUpstream()
+            await cache.get_or_fetch("k", upstream, ttl=0)
+            await cache.get_or_fetch("k", upstream, ttl=0)
+            return upstream.calls, len(cache)
+
+        assert run(scenario()) == (2, 0)
+
+    def test_concurrent_misses_share_request(self):
+        """Test that concurrent misses for one key make a single upstream call."""
+
+        async def scenario():
+            cache = ResponseCache()
+            upstream = FakeUpstream(delay=0.01)
+            results = await asyncio.gather(
+                *(cache.get_or_fetch("k", upstream, ttl=0) for _ in range(5))
+            )
+            return results, upstream.calls
+
+        results, calls = run(scenario())
+        assert results == ["response-1"] * 5
+        assert calls == 1
+
+    def test_stale_while_revalidate(self):
+        """Test that stale entries are served immediately and refreshed."""
+
+        async def scenario():
+            cache = ResponseCache()
+            upstream = FakeUpstream(delay=0.01)
+            await cache.get_or_fetch("k", upstream, ttl=0.01, stale_ttl=60)
+            await asyncio.sleep(0.02)
+            stale = await cache.get_or_fetch("k", upstream, ttl=0.01, stale_ttl=60)
+            await asyncio.sleep(0.05)
+            refreshed = await cache.get_or_fetch("k", upstream, ttl=60)
+            return stale, refreshed, upstream.calls
+
+        assert run(scenario()) == ("response-1", "response-2", 2)
+
+    def test_failed_refresh_keeps_stale_value(self):
+        """Test that a failing background refresh keeps serving the stale value."""
+
+        async def scenario():
+            cache = ResponseCache()
+            upstream = FakeUpstream()
+            await cache.get_or_fetch("k", upstream, ttl=0.01, stale_ttl=60)
+            await asyncio.sleep(0.02)
+            upstream.error = RuntimeError("upstream down")
+            await cache.get_or_fetch("k", upstream, ttl=0.01, stale_ttl=60)
+            await asyncio.sleep(0.01)
+            return await cache.get_or_fetch("k", upstream, ttl=0.01, stale_ttl=60)
+
+        assert run(scenario()) == "response-1"
+
+    def test_negative_caching(self):
+        """Test that not-found errors are cached and replayed."""
+
+        async def scenario():
+            cache = ResponseCache(negative_ttl=60)
+            upstream = FakeUpstream(error=Exception(NOT_FOUND))
+            with pytest.raises(Exception):
+                await cache.get_or_fetch("k", upstream, ttl=0)
+            with pytest.raises(CachedNotFound) as excinfo:
+                await cache.get_or_fetch("k", upstream, ttl=0)
+            return str(excinfo.value), upstream.calls
+
+        assert run(scenario()) == (NOT_FOUND, 1)
+
+    def test_other_errors_not_cached(self):
+        """Test that errors other than not-found are retried."""
+
+        async def scenario():
+            cache = ResponseCache()
+            upstream = FakeUpstream(error=RuntimeError("timeout"))
+            for _ in range(2):
+                with pytest.raises(RuntimeError):
+                    await cache.get_or_fetch("k", upstream, ttl=60)
+            return upstream.calls
+
+        assert run(scenario()) == 2
+
+    def test_lru_eviction(self):
+        """Test that the least recently used entry is evicted first."""
+
+        async def scenario():
+            cache = ResponseCache(max_entries=2)
+            upstream = FakeUpstream()
+            await cache.get_or_fetch("a", upstream, ttl=60)
+            await cache.get_or_fetch("b", upstream, ttl=60)
+            await cache.get_or_fetch("a", upstream, ttl=60)
+            await cache.get_or_fetch("c", upstream, ttl=60)
+            await cache.get_or_fetch("a", upstream, ttl=60)
+            await cache.get_or_fetch("b", upstream, ttl=60)
+            return upstream.calls
+
+        assert run(scenario()) == 4
+
+    def test_invalidate(self):
+        """Test dropping entries by key predicate."""
+
+        async def scenario():
+            cache = ResponseCache()
+            upstream = FakeUpstream()
+            await cache.get_or_fetch("aapl", upstream, ttl=60)
+            await cache.get_or_fetch("msft", upstream, ttl=60)
+            removed = cache.invalidate(lambda key: key.startswith("aapl"))
+            return removed, len(cache)
+
+        assert run(scenario()) == (1, 1)
+
+
+def test_is_not_found():
+    """Test classification of upstream not-found errors."""
+    assert is_not_found(Exception(NOT_FOUND))
+    assert is_not_found(CachedNotFound("cached"))
+    assert not is_not_found(Exception('{"status":"ERROR","error":"bad"}'))
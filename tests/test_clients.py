@@ -0,0 +1,126 @@
+from collections import OrderedDict
+from types import SimpleNamespace
+
+from mcp.server.lowlevel.server import request_ctx
+
+from mcp_polygon import server
+from mcp_polygon.clients import ClientPool, key_id, request_api_key
+from mcp_polygon.upstream import RateLimiter
+
+
+class FakeClient:
+    """Stands in for RESTClient and records whether its pool was closed."""
+
+    def __init__(self, api_key: str):
+        self.api_key = api_key
+        self.client = SimpleNamespace(clear=self.close)
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+def make_pool(max_clients: int = 2) -> ClientPool:
+    return ClientPool(FakeClient, lambda name: RateLimiter(1), max_clients)
+
+
+class TestClientPool:
+    """Tests for the ClientPool class."""
+
+    def test_client_reused_per_key(self):
+        """Test that one key always gets the same client and limiter."""
+        pool = make_pool()
+        first = pool.get("key-a")
+        assert pool.get("key-a") is first
+        assert first.client.api_key == "key-a"
+        assert first.key_id == key_id("key-a")
+
+    def test_keys_isolated(self):
+        """Test that different keys get separate clients and limiters."""
+        pool = make_pool()
+        a, b = pool.get("key-a"), pool.get("key-b")
+        assert a.client is not b.client
+        assert a.rate_limiter is not b.rate_limiter
+
+    def test_lru_eviction_closes_client(self):
+        """Test that the least recently used client is closed at capacity."""
+        pool = make_pool(max_clients=2)
+        a = pool.get("key-a")
+        b = pool.get("key-b")
+        pool.get("key-a")
+        pool.get("key-c")
+        assert len(pool) == 2
+        assert b.client.closed
+        assert not a.client.closed
+        assert pool.get("key-b") is not b
+
+    def test_eviction_callback(self):
+        """Test that eviction reports the evicted key's ID."""
+        evicted = []
+        pool = ClientPool(
+            FakeClient, lambda name: RateLimiter(1), 1, on_evict=evicted.append
+        )
+        pool.get("key-a")
+        pool.get("key-b")
+        assert evicted == [key_id("key-a")]
+
+
+class TestForgetApiKey:
+    """Tests for dropping an evicted key's local stores."""
+
+    def test_only_evicted_key_dropped(self, monkeypatch):
+        """Test that stores of other keys survive an eviction."""
+        stores = {
+            "fx_rates": {"k1": 1, "k2": 2},
+            "code_books": {"k1": 1, "k2": 2},
+            "news_stores": {
+                ("list_ticker_news", "k1"): 1,
+                ("list_ticker_news", "k2"): 2,
+            },
+            "series_cache": OrderedDict(
+                [
+                    (("list_short_volume", "k1", "AAPL"), 1),
+                    (("list_short_volume", "k2", "AAPL"), 2),
+                ]
+            ),
+            "futures_bars": OrderedDict(
+                [(("k1", "ESZ5", "1day"), 1), (("k2", "ESZ5", "1day"), 2)]
+            ),
+        }
+        for name, store in stores.items():
+            monkeypatch.setattr(server, name, store)
+        server._forget_api_key("k1")
+        for store in stores.values():
+            assert list(store.values()) == [2]
+
+
+class TestRequestApiKey:
+    """Tests for the request_api_key function."""
+
+    def test_outside_request(self):
+        """Test that no key is found outside an MCP request."""
+        assert request_api_key() is None
+
+    def test_from_header(self):
+        """Test that the key is read from the HTTP request headers."""
+        request = SimpleNamespace(headers={"x-polygon-api-key": "secret"})
+        token = request_ctx.set(SimpleNamespace(request=request))
+        try:
+            assert request_api_key() == "secret"
+        finally:
+            request_ctx.reset(token)
+
+    def test_stdio_request(self):
+        """Test that requests without HTTP headers have no key."""
+        token = request_ctx.set(SimpleNamespace(request=None))
+        try:
+            assert request_api_key() is None
+        finally:
+            request_ctx.reset(token)
+
+
+def test_key_id_hides_key():
+    """Test that key ids are stable and don't contain the key."""
+    assert key_id("secret") == key_id("secret")
+    assert key_id("secret") != key_id("other")
+    assert "secret" not in key_id("secret")
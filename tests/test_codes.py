@@ -0,0 +1,107 @@
+import asyncio
+
+import pytest
+
+from mcp_polygon import server
+from mcp_polygon.codes import CodeBook, asset_class
+
+CONDITIONS = [
+    {"id": 12, "asset_class": "stocks", "data_types": ["trade"], "name": "Form T"},
+    {"id": 37, "asset_class": "stocks", "data_types": ["trade"], "name": "Odd Lot"},
+    {
+        "id": 1,
+        "asset_class": "stocks",
+        "data_types": ["bbo", "nbbo"],
+        "name": "Regular",
+    },
+    {"id": 12, "asset_class": "options", "data_types": ["trade"], "name": "Late"},
+]
+
+EXCHANGES = [
+    {"id": 4, "asset_class": "stocks", "name": "FINRA Alternative Display Facility"},
+    {"id": 11, "asset_class": "stocks", "name": "NYSE Arca"},
+    {"id": 4, "asset_class": "options", "name": "Cboe Options"},
+]
+
+
+def make_book():
+    book = CodeBook()
+    book.load(CONDITIONS, EXCHANGES, now=0)
+    return book
+
+
+class TestCodeBook:
+    """Tests for the CodeBook class."""
+
+    def test_asset_class(self):
+        """Test that tickers map to the asset class of their codes."""
+        assert asset_class("AAPL") == "stocks"
+        assert asset_class("O:AAPL250620C00200000") == "options"
+        assert asset_class("X:BTCUSD") == "crypto"
+
+    def test_decode_trades(self):
+        """Test that trade conditions and exchanges get their names."""
+        trades = [
+            {"price": 1.0, "exchange": 11, "conditions": [12, 37], "trf_id": 4},
+            {"price": 1.1, "exchange": 99, "conditions": [12, 5]},
+            {"price": 1.2, "exchange": 4},
+        ]
+        rows = make_book().decode(trades, "stocks", "trades")
+        assert rows[0]["condition_names"] == ["Form T", "Odd Lot"]
+        assert rows[0]["exchange_name"] == "NYSE Arca"
+        assert rows[0]["trf_name"] == "FINRA Alternative Display Facility"
+        assert rows[1]["condition_names"] == ["Form T", None]
+        assert rows[1]["exchange_name"] is None
+        assert "condition_names" not in rows[2]
+        assert "condition_names" not in trades[0]
+
+    def test_decode_by_asset_class(self):
+        """Test that codes are looked up in the record's asset class."""
+        book = make_book()
+        option = book.decode([{"exchange": 4, "conditions": [12]}], "options", "trades")
+        assert option[0] == {
+            "exchange": 4,
+            "conditions": [12],
+            "condition_names": ["Late"],
+            "exchange_name": "Cboe Options",
+        }
+        quote = book.decode(
+            [{"ask_exchange": 11, "bid_exchange": 4, "conditions": [1]}],
+            "stocks",
+            "quotes",
+        )
+        assert quote[0]["condition_names"] == ["Regular"]
+        assert quote[0]["ask_exchange_name"] == "NYSE Arca"
+
+
+class TestDecodeTools:
+    """Tests for decoding in list_trades and list_quotes."""
+
+    @pytest.fixture
+    def client(self, polygon, monkeypatch):
+        monkeypatch.setattr(server, "code_books", {})
+        trades = [{"price": 1.0, "exchange": 11, "conditions": [12, 37]}]
+        return polygon(
+            list_trades={"results": trades, "status": "OK"},
+            list_conditions={"results": CONDITIONS, "status": "OK"},
+            get_exchanges={"results": EXCHANGES, "status": "OK"},
+        )
+
+    def test_decode_loads_names_once(self, client):
+        """Test that decoded calls share one load of the code book."""
+        result = asyncio.run(server.list_trades("AAPL", decode=True))
+        assert result.splitlines()[0].endswith("condition_names,exchange_name")
+        assert "Form T" in result and "NYSE Arca" in result
+        asyncio.run(server.list_trades("AAPL", limit=20, decode=True))
+        assert sorted(name for name, _ in client.calls) == [
+            "get_exchanges",
+            "list_conditions",
+            "list_trades",
+            "list_trades",
+        ]
+
+    def test_no_decode_by_default(self, client):
+        """Test that codes are left as is without decode."""
+        result = asyncio.run(server.list_trades("AAPL"))
+        assert "condition_names" not in result
+        assert [name for name, _ in client.calls] == ["list_trades"]
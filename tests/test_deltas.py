@@ -0,0 +1,81 @@
+from mcp_polygon.deltas import DeltaCursors, SnapshotTable
+
+
+def _rows(**prices):
+    return [
+        {"ticker": ticker, "day_c": price, "day_v": 100, "updated": 1}
+        for ticker, price in prices.items()
+    ]
+
+
+class TestSnapshotTable:
+    """Tests for the SnapshotTable class."""
+
+    def test_numeric_columns_only(self):
+        """Test that text and timestamp columns aren't compared."""
+        table = SnapshotTable(
+            [{"ticker": "A", "name": "x", "day_c": 1.0, "lastTrade_t": 5}]
+        )
+        assert list(table.columns) == ["day_c"]
+
+    def test_changed_rows(self):
+        """Test detection of new and changed tickers."""
+        previous = SnapshotTable(_rows(A=10.0, B=20.0))
+        current = SnapshotTable(_rows(A=10.0, B=21.0, C=5.0))
+        assert current.changed_rows(previous) == [1, 2]
+
+    def test_min_change(self):
+        """Test that moves under the threshold are ignored."""
+        previous = SnapshotTable(_rows(A=100.0, B=100.0))
+        current = SnapshotTable(_rows(A=100.5, B=102.0))
+        assert current.changed_rows(previous, min_change_pct=1.0) == [1]
+
+    def test_value_appears_or_disappears(self):
+        """Test that a field appearing or disappearing counts as a change."""
+        previous = SnapshotTable(
+            [{"ticker": "A", "day_c": 1.0}, {"ticker": "B", "day_c": 1.0}]
+        )
+        current = SnapshotTable(
+            [{"ticker": "A", "day_c": 1.0, "min_c": 2.0}, {"ticker": "B"}]
+        )
+        assert current.changed_rows(previous) == [0, 1]
+
+
+class TestDeltaCursors:
+    """Tests for the DeltaCursors class."""
+
+    def test_first_poll_returns_everything(self):
+        """Test that a new cursor receives the full snapshot."""
+        cursor, rows = DeltaCursors().diff(None, "req", _rows(A=1.0, B=2.0))
+        assert cursor
+        assert len(rows) == 2
+
+    def test_later_polls_return_changes(self):
+        """Test that a cursor only receives changed rows."""
+        cursors = DeltaCursors()
+        cursor, _ = cursors.diff(None, "req", _rows(A=1.0, B=2.0))
+        same, rows = cursors.diff(cursor, "req", _rows(A=1.0, B=2.5))
+        assert same == cursor
+        assert [row["ticker"] for row in rows] == ["B"]
+        _, rows = cursors.diff(cursor, "req", _rows(A=1.0, B=2.5))
+        assert rows == []
+
+    def test_cursor_bound_to_request(self):
+        """Test that a cursor can't be used for a different query."""
+        cursors = DeltaCursors()
+        cursor, _ = cursors.diff(None, "stocks", _rows(A=1.0))
+        other, rows = cursors.diff(cursor, "crypto", _rows(A=1.0))
+        assert other != cursor
+        assert len(rows) == 1
+        _, rows = cursors.diff(cursor, "stocks", _rows(A=1.0))
+        assert rows == []
+
+    def test_expired_cursors(self):
+        """Test that the oldest cursors are dropped at capacity."""
+        cursors = DeltaCursors(max_cursors=1)
+        first, _ = cursors.diff(None, "req", _rows(A=1.0))
+        cursors.diff(None, "req", _rows(A=1.0))
+        assert len(cursors) == 1
+        cursor, rows = cursors.diff(first, "req", _rows(A=1.0))
+        assert cursor != first
+        assert len(rows) == 1
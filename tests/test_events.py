@@ -0,0 +1,141 @@
+import asyncio
+from datetime import date
+
+import pytest
+
+from mcp_polygon import server
+from mcp_polygon.events import EventCalendar, week_of
+
+
+def _event(event_id, day, ticker, updated="2025-01-01T00:00:00Z", time="08:00:00"):
+    return {
+        "benzinga_id": event_id,
+        "date": day,
+        "time": time,
+        "ticker": ticker,
+        "last_updated": updated,
+    }
+
+
+def make_calendar():
+    calendar = EventCalendar()
+    calendar.load_bucket(
+        date(2025, 1, 6),
+        [
+            _event("e1", "2025-01-06", "AAPL"),
+            _event("e2", "2025-01-08", "MSFT"),
+            _event("e3", "2025-01-08", "AAPL", time="16:00:00"),
+        ],
+        now=0,
+    )
+    return calendar
+
+
+class TestEventCalendar:
+    """Tests for the EventCalendar class."""
+
+    def test_weeks(self):
+        """Test that ranges map to the Monday of each week they touch."""
+        assert week_of(date(2025, 1, 12)) == date(2025, 1, 6)
+        assert EventCalendar.weeks(date(2025, 1, 5), date(2025, 1, 13)) == [
+            date(2024, 12, 30),
+            date(2025, 1, 6),
+            date(2025, 1, 13),
+        ]
+
+    def test_query(self):
+        """Test date and ticker selection in calendar order."""
+        calendar = make_calendar()
+        events = calendar.query(date(2025, 1, 6), date(2025, 1, 12), ascending=True)
+        assert [e["benzinga_id"] for e in events] == ["e1", "e2", "e3"]
+        events = calendar.query(date(2025, 1, 7), date(2025, 1, 12), tickers=["AAPL"])
+        assert [e["benzinga_id"] for e in events] == ["e3"]
+
+    def test_sync_moves_event(self):
+        """Test that an updated event is reindexed under its new date."""
+        calendar = make_calendar()
+        calendar.add([_event("e1", "2025-01-09", "AAPL", "2025-01-02T00:00:00Z")])
+        assert calendar.cursor == "2025-01-02T00:00:00Z"
+        assert "e1" not in calendar.by_date.get(date(2025, 1, 6), set())
+        (event,) = calendar.query(date(2025, 1, 9), date(2025, 1, 9))
+        assert event["benzinga_id"] == "e1"
+
+    def test_reload_drops_removed(self):
+        """Test that reloading a bucket drops events no longer listed."""
+        calendar = make_calendar()
+        calendar.load_bucket(date(2025, 1, 6), [_event("e2", "2025-01-08", "MSFT")])
+        assert len(calendar) == 1
+        assert "AAPL" not in calendar.by_ticker
+        assert calendar.cursor is None
+
+    def test_stale(self):
+        """Test that only unloaded or expired buckets are reported."""
+        calendar = make_calendar()
+        buckets = [date(2025, 1, 6), date(2025, 1, 13)]
+        assert calendar.stale(buckets, 60, now=30) == [date(2025, 1, 13)]
+        assert calendar.stale(buckets, 60, now=90) == buckets
+
+
+def earnings_from(events):
+    def list_benzinga_earnings(**kwargs):
+        selected = [
+            e
+            for e in events
+            if e["date"] >= kwargs.get("date_gte", "")
+            and e["date"] <= kwargs.get("date_lte", "9999")
+            and e["last_updated"] > kwargs.get("last_updated_gt", "")
+            and kwargs.get("ticker") in (None, e["ticker"])
+        ]
+        return {"results": selected, "status": "OK"}
+
+    return list_benzinga_earnings
+
+
+class TestCalendarTools:
+    """Tests for the calendar-backed earnings tool."""
+
+    @pytest.fixture
+    def client(self, polygon, monkeypatch):
+        monkeypatch.setattr(server, "calendars", {})
+        events = [
+            _event("e1", "2025-01-06", "AAPL"),
+            _event("e2", "2025-01-14", "MSFT"),
+        ]
+        fake = polygon(list_benzinga_earnings=earnings_from(events))
+        fake.events = events
+        return fake
+
+    def test_week_buckets_shared(self, client):
+        """Test that overlapping range queries load each week once."""
+        result = asyncio.run(
+            server.list_benzinga_earnings(date_gte="2025-01-06", date_lte="2025-01-19")
+        )
+        assert [line.split(",")[0] for line in result.splitlines()[1:]] == ["e2", "e1"]
+        # Weeks load concurrently, so the call order isn't fixed.
+        assert sorted(
+            c["date_gte"] for c in client.called("list_benzinga_earnings")
+        ) == [
+            "2025-01-06",
+            "2025-01-13",
+        ]
+
+        result = asyncio.run(
+            server.list_benzinga_earnings(date="2025-01-14", ticker_any_of="MSFT,GOOG")
+        )
+        assert result.splitlines()[1].startswith("e2,2025-01-14")
+        assert len(client.called("list_benzinga_earnings")) == 2
+
+    def test_incremental_sync(self, client, monkeypatch):
+        """Test that later queries fetch only events updated past the cursor."""
+        asyncio.run(server.list_benzinga_earnings(ticker="AAPL"))
+        client.events[0] = _event("e1", "2025-01-07", "AAPL", "2099-01-01T00:00:00Z")
+        monkeypatch.setattr(server, "CALENDAR_SYNC_INTERVAL", 0.0)
+        result = asyncio.run(server.list_benzinga_earnings(ticker="AAPL"))
+        assert "last_updated_gt" in client.called("list_benzinga_earnings")[-1]
+        assert "2025-01-07" in result
+
+    def test_other_filters_go_upstream(self, client):
+        """Test that unsupported filters bypass the calendar."""
+        asyncio.run(server.list_benzinga_earnings(importance_gte=3))
+        assert client.called("list_benzinga_earnings")[-1]["importance_gte"] == 3
+        assert server.calendars == {}
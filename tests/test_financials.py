@@ -0,0 +1,173 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from mcp_polygon import server
+from mcp_polygon.financials import FinancialsStore
+
+
+def _filing(end_date, filing_date, revenues, assets=None, timeframe="quarterly"):
+    financials = {
+        "income_statement": {
+            "revenues": {"value": revenues, "unit": "USD", "label": "Revenues"},
+            "net_income_loss": {"value": revenues / 10, "label": "Net Income/Loss"},
+        },
+        "comprehensive_income": {
+            "net_income_loss": {"value": 1.0, "label": "Net Income/Loss"},
+        },
+    }
+    if assets is not None:
+        financials["balance_sheet"] = {"assets": {"value": assets, "label": "Assets"}}
+    return {
+        "end_date": end_date,
+        "start_date": "2024-01-01",
+        "timeframe": timeframe,
+        "fiscal_period": "Q1",
+        "fiscal_year": "2024",
+        "filing_date": filing_date,
+        "financials": financials,
+    }
+
+
+class TestFinancialsStore:
+    """Tests for the FinancialsStore class."""
+
+    def test_select_newest_periods(self):
+        """Test selecting metrics for the newest periods of several tickers."""
+        store = FinancialsStore()
+        store.add("AAPL", [_filing("2024-03-31", "2024-05-01", 100.0)])
+        store.add("AAPL", [_filing("2024-06-30", "2024-08-01", 120.0, assets=5.0)])
+        store.add("MSFT", [_filing("2024-03-31", "2024-04-25", 200.0)])
+
+        rows = store.select(["MSFT", "AAPL"], ["revenues", "assets"], "quarterly", 1)
+        assert [(r["ticker"], r["end_date"]) for r in rows] == [
+            ("MSFT", "2024-03-31"),
+            ("AAPL", "2024-06-30"),
+        ]
+        assert rows[0]["revenues"] == 200.0
+        assert rows[0]["assets"] is None
+        assert rows[1]["assets"] == 5.0
+        assert store.latest_filing["AAPL", "quarterly"] == "2024-08-01"
+
+    def test_replace_period(self):
+        """Test that a refiled period replaces the old values."""
+        store = FinancialsStore()
+        store.add("AAPL", [_filing("2024-03-31", "2024-05-01", 100.0, assets=5.0)])
+        store.add("AAPL", [_filing("2024-03-31", "2024-05-02", 101.0)])
+        (row,) = store.select(["AAPL"], ["revenues", "assets"], "quarterly")
+        assert len(store) == 1
+        assert row["revenues"] == 101.0
+        assert row["assets"] is None
+
+    def test_resolve(self):
+        """Test that bare names prefer the income statement."""
+        store = FinancialsStore()
+        store.add("AAPL", [_filing("2024-03-31", "2024-05-01", 100.0)])
+        assert store.resolve("net_income_loss") == "income_statement.net_income_loss"
+        assert (
+            store.resolve("comprehensive_income.net_income_loss")
+            == "comprehensive_income.net_income_loss"
+        )
+        with pytest.raises(ValueError):
+            store.resolve("ebitda")
+
+    def test_metric_list_counts_requested_tickers(self):
+        """Test that metrics are listed for the requested tickers only."""
+        store = FinancialsStore()
+        store.add("AAPL", [_filing("2024-03-31", "2024-05-01", 100.0)])
+        store.add("AAPL", [_filing("2024-06-30", "2024-08-01", 120.0)])
+        store.add("MSFT", [_filing("2024-03-31", "2024-04-25", 200.0, assets=5.0)])
+        listed = {row["metric"]: row["periods"] for row in store.metric_list(["AAPL"])}
+        assert listed["income_statement.revenues"] == 2
+        assert "balance_sheet.assets" not in listed
+        assert store.metric_list(["AAPL"], "annual") == []
+        everything = {row["metric"]: row["periods"] for row in store.metric_list()}
+        assert everything["income_statement.revenues"] == 3
+        assert everything["balance_sheet.assets"] == 1
+
+    def test_timeframes_are_separate(self):
+        """Test that annual and quarterly periods don't mix."""
+        store = FinancialsStore()
+        store.add("AAPL", [_filing("2024-03-31", "2024-05-01", 100.0)])
+        store.add(
+            "AAPL", [_filing("2023-12-31", "2024-02-01", 400.0, timeframe="annual")]
+        )
+        assert [
+            r["revenues"] for r in store.select(["AAPL"], ["revenues"], "annual")
+        ] == [400.0]
+
+
+def list_stock_financials(filing_date_gte=None, **kwargs):
+    filings = [_filing("2024-03-31", "2024-05-01", 100.0)]
+    if filing_date_gte:
+        filings.append(_filing("2024-06-30", "2024-08-01", 120.0))
+    return {"results": filings, "status": "OK"}
+
+
+class TestGetFinancialMetrics:
+    """Tests for the get_financial_metrics tool."""
+
+    @pytest.fixture
+    def financials(self, polygon, monkeypatch):
+        monkeypatch.setattr(server, "financials_stores", {})
+        return polygon(list_stock_financials=list_stock_financials)
+
+    def test_incremental_sync(self, financials, monkeypatch):
+        """Test that later syncs only ask for filings since the newest held."""
+        result = asyncio.run(server.get_financial_metrics("aapl", "revenues"))
+        assert result.splitlines()[1].startswith("AAPL,2024-03-31,quarterly")
+        assert financials.called("list_stock_financials")[0]["filing_date_gte"] is None
+
+        # Within the sync interval the store answers alone.
+        asyncio.run(server.get_financial_metrics("AAPL", "revenues"))
+        assert len(financials.calls) == 1
+
+        monkeypatch.setattr(server, "FINANCIALS_SYNC_INTERVAL", 0.0)
+        result = asyncio.run(
+            server.get_financial_metrics("AAPL", "revenues", periods=2)
+        )
+        assert (
+            financials.called("list_stock_financials")[1]["filing_date_gte"]
+            == "2024-05-01"
+        )
+        assert [line.split(",")[-1] for line in result.splitlines()[1:]] == [
+            "120.0",
+            "100.0",
+        ]
+
+    def test_metric_list(self, financials):
+        """Test that calling without metrics lists the available columns."""
+        result = asyncio.run(server.get_financial_metrics("AAPL"))
+        assert result.splitlines()[0] == "metric,label,periods"
+        assert "income_statement.revenues,Revenues,1" in result
+
+    def test_too_many_tickers(self, financials):
+        """Test that oversized ticker lists are rejected before fetching."""
+        tickers = ",".join(f"T{i}" for i in range(server.FINANCIALS_MAX_TICKERS + 1))
+        assert asyncio.run(server.get_financial_metrics(tickers)).startswith("Error:")
+        assert financials.calls == []
+
+    def test_max_tickers_against_slow_upstream(self, polygon, monkeypatch):
+        """Test that the largest ticker list is synced without being shed."""
+        monkeypatch.setattr(server, "financials_stores", {})
+        lock = threading.Lock()
+        in_flight = peak = 0
+
+        def slow_financials(**kwargs):
+            nonlocal in_flight, peak
+            with lock:
+                in_flight += 1
+                peak = max(peak, in_flight)
+            time.sleep(0.02)
+            with lock:
+                in_flight -= 1
+            return list_stock_financials(**kwargs)
+
+        fake = polygon(list_stock_financials=slow_financials)
+        tickers = ",".join(f"T{i}" for i in range(server.FINANCIALS_MAX_TICKERS))
+        result = asyncio.run(server.get_financial_metrics(tickers, "revenues"))
+        assert not result.startswith("Error:")
+        assert len(fake.called("list_stock_financials")) == len(tickers.split(","))
+        assert peak <= server.FANOUT_MAX_CONCURRENCY
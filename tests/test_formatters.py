@@ -4,7 +4,12 @@ import io
 
 import pytest
 
-from mcp_polygon.formatters import json_to_csv, _flatten_dict
+from mcp_polygon.formatters import (
+    json_to_csv,
+    _flatten_dict,
+    format_order_book,
+    list_strategy_setting,
+)
 
 
 class TestFlattenDict:
@@ -424,3 +429,178 @@ class TestJsonToCsvStdlib:
         assert rows[0]["name"] == "Café"
         assert rows[0]["symbol"] == "€"
         assert rows[0]["emoji"] == "🚀"
+
+
+NEWS = {
+    "results": [
+        {
+            "id": "n1",
+            "tickers": ["AAPL", "MSFT"],
+            "insights": [
+                {"ticker": "AAPL", "sentiment": "positive"},
+                {"ticker": "MSFT", "sentiment": "neutral"},
+            ],
+            "keywords": [],
+        }
+    ]
+}
+
+
+def _rows(results):
+    return list(csv.DictReader(io.StringIO(results)))
+
+
+class TestListStrategies:
+    """Tests for the list_strategy option of json_to_csv."""
+
+    def test_default_is_repr(self):
+        """Test that lists are written as Python repr by default."""
+        row = _rows(json_to_csv(NEWS))[0]
+        assert row["tickers"] == "['AAPL', 'MSFT']"
+
+    def test_setting_validated(self, capsys):
+        """Test that an unknown POLYGON_LIST_FORMAT falls back to repr."""
+        assert list_strategy_setting("json") == "json"
+        assert capsys.readouterr().err == ""
+        assert list_strategy_setting("jsno") == "repr"
+        assert "POLYGON_LIST_FORMAT 'jsno'" in capsys.readouterr().err
+
+    def test_join(self):
+        """Test joining scalars with a delimiter and dicts as JSON."""
+        row = _rows(json_to_csv(NEWS, list_strategy="join", list_delimiter="|"))[0]
+        assert row["tickers"] == "AAPL|MSFT"
+        assert row["insights"].split("|")[0] == (
+            '{"ticker":"AAPL","sentiment":"positive"}'
+        )
+        assert row["keywords"] == ""
+
+    def test_json(self):
+        """Test that lists are written as compact JSON."""
+        row = _rows(json_to_csv(NEWS, list_strategy="json"))[0]
+        assert json.loads(row["tickers"]) == ["AAPL", "MSFT"]
+        assert json.loads(row["insights"])[1]["sentiment"] == "neutral"
+        assert row["keywords"] == "[]"
+
+    def test_first(self):
+        """Test projecting the first K elements into columns."""
+        row = _rows(json_to_csv(NEWS, list_strategy="first", list_limit=1))[0]
+        assert row["tickers_0"] == "AAPL"
+        assert "tickers_1" not in row
+        assert row["tickers_count"] == "2"
+        assert row["insights_0_sentiment"] == "positive"
+        assert row["keywords_count"] == "0"
+
+    def test_explode(self):
+        """Test that lists become child rows, side by side."""
+        rows = _rows(json_to_csv(NEWS, list_strategy="explode"))
+        assert [row["id"] for row in rows] == ["n1", "n1"]
+        assert [row["tickers"] for row in rows] == ["AAPL", "MSFT"]
+        assert [row["insights_sentiment"] for row in rows] == [
+            "positive",
+            "neutral",
+        ]
+        assert list(rows[0]) == [
+            "id",
+            "tickers",
+            "insights_ticker",
+            "insights_sentiment",
+            "keywords",
+        ]
+
+    def test_explode_empty_lists(self):
+        """Test that a record with only empty lists is kept."""
+        rows = _rows(json_to_csv({"id": 1, "tags": []}, list_strategy="explode"))
+        assert rows == [{"id": "1", "tags": ""}]
+
+    def test_unknown_strategy(self):
+        """Test that an unknown strategy is rejected."""
+        with pytest.raises(ValueError):
+            json_to_csv(NEWS, list_strategy="yaml")
+
+    def test_single_result_object(self):
+        """Test that a single object under 'results' is one row."""
+        rows = _rows(json_to_csv({"results": {"ticker": "AAPL", "name": "Apple"}}))
+        assert rows == [{"ticker": "AAPL", "name": "Apple"}]
+
+
+BOOK = {
+    "data": {
+        "ticker": "X:BTCUSD",
+        "bids": [
+            {"p": 100.0, "x": {"1": 1.0, "2": 0.5}},
+            {"p": 99.9, "x": {"1": 2.0}},
+            {"p": 99.0, "x": {"1": 5.0}},
+        ],
+        "asks": [
+            {"p": 100.2, "x": {"1": 1.0}},
+            {"p": 101.5, "x": {"3": 4.0}},
+        ],
+        "bidCount": 3,
+        "askCount": 2,
+        "updated": 1700000000000000000,
+    },
+    "status": "OK",
+}
+
+
+def _tables(output):
+    summary, ladder = output.split("\n\n")
+    return (
+        list(csv.DictReader(io.StringIO(summary))),
+        list(csv.DictReader(io.StringIO(ladder))),
+    )
+
+
+class TestFormatOrderBook:
+    """Tests for the format_order_book function."""
+
+    def test_summary_metrics(self):
+        """Test mid, spread, imbalance and depth within a band."""
+        summary, _ = _tables(format_order_book(BOOK, depth=2, depth_bps=(50,)))
+        row = summary[0]
+        assert float(row["mid"]) == pytest.approx(100.1)
+        assert float(row["spread"]) == pytest.approx(0.2)
+        assert float(row["spread_bps"]) == pytest.approx(0.2 / 100.1 * 10_000)
+        # Top two levels: 3.5 bid vs 5.0 ask
+        assert float(row["imbalance"]) == pytest.approx(-1.5 / 8.5)
+        assert float(row["bid_size_50bps"]) == pytest.approx(3.5)
+        assert float(row["ask_size_50bps"]) == pytest.approx(1.0)
+
+    def test_ladder_truncated_to_depth(self):
+        """Test that the ladder pairs bid and ask levels up to depth."""
+        _, ladder = _tables(format_order_book(BOOK, depth=2))
+        assert len(ladder) == 2
+        assert ladder[1]["bid_price"] == "99.9"
+        assert ladder[1]["bid_cum_size"] == "3.5"
+        assert ladder[1]["ask_cum_size"] == "5.0"
+
+    def test_uneven_sides(self):
+        """Test that a side with fewer levels leaves its columns empty."""
+        _, ladder = _tables(format_order_book(BOOK, depth=5))
+        assert len(ladder) == 3
+        assert ladder[2]["ask_price"] == ""
+
+    def test_empty_book(self):
+        """Test that an empty side omits the derived metrics."""
+        book = {"data": {"ticker": "X:BTCUSD", "bids": [], "asks": []}}
+        header = format_order_book(book).split("\n")[0]
+        assert header == "ticker,updated,bid,ask,bid_levels,ask_levels"
+
+    def test_level_without_price_skipped(self):
+        """Test that levels without a price are left out and counted."""
+        book = {
+            "data": {
+                "bids": [{"p": None, "x": {"1": 9.0}}, {"p": 99.9, "x": {"1": 1.0}}],
+                "asks": [{"x": {"1": 2.0}}, {"p": 100.1, "x": {"1": 1.0}}],
+            }
+        }
+        summary, ladder = _tables(format_order_book(book))
+        assert summary[0]["bid"] == "99.9"
+        assert summary[0]["skipped_levels"] == "2"
+        assert float(summary[0]["mid"]) == pytest.approx(100.0)
+        assert len(ladder) == 1
+
+    def test_depth_validated(self):
+        """Test that a depth below one is rejected."""
+        with pytest.raises(ValueError, match="depth must be at least 1"):
+            format_order_book(BOOK, depth=0)
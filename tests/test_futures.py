@@ -0,0 +1,355 @@
+import asyncio
+from datetime import date, timedelta
+
+import pytest
+
+from mcp_polygon import server
+from mcp_polygon.benzinga import equality_filters
+from mcp_polygon.futures import ContractBars, FuturesReference, LiveTable, stitch
+
+CONTRACTS = [
+    {
+        "ticker": "ESM5",
+        "product_code": "ES",
+        "type": "single",
+        "active": False,
+        "first_trade_date": "2024-06-21",
+        "last_trade_date": "2025-06-20",
+    },
+    {
+        "ticker": "ESH5",
+        "product_code": "ES",
+        "type": "single",
+        "active": False,
+        "first_trade_date": "2024-03-15",
+        "last_trade_date": "2025-03-21",
+    },
+    {
+        "ticker": "ESU5",
+        "product_code": "ES",
+        "type": "single",
+        "active": True,
+        "first_trade_date": "2024-09-20",
+        "last_trade_date": "2025-09-19",
+    },
+    {
+        "ticker": "ESH5-ESM5",
+        "product_code": "ES",
+        "type": "combo",
+        "first_trade_date": "2024-06-21",
+        "last_trade_date": "2025-03-21",
+    },
+]
+
+
+def _sessions(first, last):
+    day, schedules = date.fromisoformat(first), []
+    while day <= date.fromisoformat(last):
+        if day.weekday() < 5 and day != date(2025, 3, 19):
+            schedules.append(
+                {"product_code": "ES", "session_end_date": day.isoformat()}
+            )
+        day += timedelta(days=1)
+    return schedules
+
+
+def make_reference():
+    reference = FuturesReference()
+    reference.load("contracts", "ES", CONTRACTS, now=0)
+    reference.load("schedules", "ES", _sessions("2025-03-01", "2025-03-31"), now=0)
+    return reference
+
+
+class TestFuturesReference:
+    """Tests for the FuturesReference class."""
+
+    def test_indexes(self):
+        """Test that contracts are indexed by ticker and sorted by expiry."""
+        reference = make_reference()
+        assert [c["ticker"] for c in reference.contracts["ES"]][:2] == [
+            "ESH5",
+            "ESH5-ESM5",
+        ]
+        assert reference.contracts_by_ticker["ESU5"]["active"] is True
+        assert reference.stale("contracts", "ES", 60, now=30) is False
+        assert reference.stale("schedules", "NQ", 60, now=30) is True
+
+    def test_roll_date_counts_sessions(self):
+        """Test that roll days skip weekends and days without a session."""
+        reference = make_reference()
+        contract = reference.contracts_by_ticker["ESH5"]
+        assert reference.roll_date("ES", contract, 0) == date(2025, 3, 21)
+        # 2025-03-19 has no session in the cached schedule.
+        assert reference.roll_date("ES", contract, 2) == date(2025, 3, 18)
+        # ESM5 expires past the cached sessions, so weekdays are counted.
+        assert reference.roll_date(
+            "ES", reference.contracts_by_ticker["ESM5"], 5
+        ) == date(2025, 6, 13)
+
+    def test_front_month(self):
+        """Test that the front month changes after the roll date."""
+        reference = make_reference()
+        chain = reference.chain("ES", date(2025, 3, 18), roll_days=2)
+        assert [c["ticker"] for c in chain] == ["ESH5", "ESM5", "ESU5"]
+        assert chain[0]["roll_date"] == "2025-03-18"
+        front = reference.chain("ES", date(2025, 3, 20), roll_days=2)[0]
+        assert front["ticker"] == "ESM5"
+
+    def test_roll_schedule(self):
+        """Test that a range is split into consecutive front-month segments."""
+        reference = make_reference()
+        assert reference.roll_schedule("ES", date(2025, 3, 1), date(2025, 7, 1)) == [
+            {"ticker": "ESH5", "start_date": "2025-03-01", "end_date": "2025-03-21"},
+            {"ticker": "ESM5", "start_date": "2025-03-22", "end_date": "2025-06-20"},
+            {"ticker": "ESU5", "start_date": "2025-06-21", "end_date": "2025-07-01"},
+        ]
+
+
+def _bars(ticker, first, last, close):
+    day, bars = date.fromisoformat(first), []
+    while day <= date.fromisoformat(last):
+        if day.weekday() < 5:
+            bars.append(
+                {
+                    "ticker": ticker,
+                    "session_end_date": day.isoformat(),
+                    "open": close,
+                    "close": close,
+                    "volume": 10,
+                }
+            )
+        day += timedelta(days=1)
+    return bars
+
+
+class TestContractBars:
+    """Tests for the ContractBars class."""
+
+    def test_fetches_only_missing_sessions(self):
+        """Test that only sessions outside the covered range are missing."""
+        held = ContractBars()
+        assert held.missing(date(2025, 3, 3), date(2025, 3, 7)) == [
+            (date(2025, 3, 3), date(2025, 3, 7))
+        ]
+        bars = _bars("ESH5", "2025-03-01", "2025-03-10", 100)
+        held.add(bars, date(2025, 3, 3), date(2025, 3, 7), today=date(2025, 3, 6))
+        # Today's session is still forming, so it stays missing.
+        assert held.covers == (date(2025, 3, 3), date(2025, 3, 5))
+        assert len(held) == 5
+        assert held.missing(date(2025, 3, 4), date(2025, 3, 5)) == []
+        assert held.missing(date(2025, 2, 28), date(2025, 3, 7)) == [
+            (date(2025, 2, 28), date(2025, 3, 2)),
+            (date(2025, 3, 6), date(2025, 3, 7)),
+        ]
+
+    def test_refetch_replaces_sessions(self):
+        """Test that refetched sessions replace the bars held for them."""
+        held = ContractBars()
+        held.add(
+            _bars("ESH5", "2025-03-03", "2025-03-07", 100),
+            date(2025, 3, 3),
+            date(2025, 3, 7),
+            today=date(2025, 3, 7),
+        )
+        held.add(
+            _bars("ESH5", "2025-03-07", "2025-03-07", 101),
+            date(2025, 3, 7),
+            date(2025, 3, 7),
+            today=date(2025, 3, 8),
+        )
+        selected = held.select(date(2025, 3, 6), date(2025, 3, 7))
+        assert [bar["close"] for bar in selected] == [100, 101]
+        assert held.covers == (date(2025, 3, 3), date(2025, 3, 7))
+
+
+class TestStitch:
+    """Tests for the stitch function."""
+
+    SEGMENTS = [
+        {"ticker": "ESH5", "start_date": "2025-03-17", "end_date": "2025-03-19"},
+        {"ticker": "ESM5", "start_date": "2025-03-20", "end_date": "2025-03-21"},
+    ]
+    BARS = [
+        _bars("ESH5", "2025-03-17", "2025-03-19", 100),
+        _bars("ESM5", "2025-03-19", "2025-03-21", 110),
+    ]
+
+    def test_ratio(self):
+        """Test that earlier contracts are scaled onto the next at the roll."""
+        rows = stitch(self.SEGMENTS, self.BARS, "ratio")
+        assert [row["session_end_date"] for row in rows] == [
+            "2025-03-17",
+            "2025-03-18",
+            "2025-03-19",
+            "2025-03-20",
+            "2025-03-21",
+        ]
+        assert [row["close"] for row in rows] == pytest.approx([110] * 5)
+        assert rows[0]["ticker"] == "ESH5"
+        assert rows[0]["high"] is None
+
+    def test_difference_and_none(self):
+        """Test that difference shifts prices and none leaves them as traded."""
+        rows = stitch(self.SEGMENTS, self.BARS, "difference")
+        assert [row["close"] for row in rows] == pytest.approx([110] * 5)
+        rows = stitch(self.SEGMENTS, self.BARS, "none")
+        assert [row["close"] for row in rows] == [100, 100, 100, 110, 110]
+
+    def test_missing_roll_close(self):
+        """Test that a roll without both closes isn't adjusted."""
+        bars = [self.BARS[0], self.BARS[1][1:]]
+        rows = stitch(self.SEGMENTS, bars, "ratio")
+        assert [row["close"] for row in rows] == [100, 100, 100, 110, 110]
+        with pytest.raises(ValueError):
+            stitch(self.SEGMENTS, self.BARS, "log")
+
+
+SNAPSHOTS = [
+    {"ticker": "NQZ5", "product_code": "NQ", "session": {"close": 21000}},
+    {"ticker": "ESZ5", "product_code": "ES", "session": {"close": 6000}},
+    {"ticker": "ESH6", "product_code": "ES", "session": {"close": 6050}},
+    {"ticker": "CLZ5", "product_code": "CL"},
+]
+
+
+class TestLiveTable:
+    """Tests for the LiveTable class."""
+
+    def test_select(self):
+        """Test that equality and range filters are applied locally."""
+        table = LiveTable("ticker")
+        table.load(SNAPSHOTS, now=0)
+        assert [row["ticker"] for row in table.rows] == ["CLZ5", "ESH6", "ESZ5", "NQZ5"]
+        rows = table.select(
+            equality_filters(product_code=(None, "ES,NQ")),
+            {"ticker": (None, "ESZ5", None, None)},
+            limit=10,
+        )
+        assert [row["ticker"] for row in rows] == ["ESZ5", "NQZ5"]
+        rows = table.select({}, {"ticker": (None, None, None, None)}, 2, "ticker.desc")
+        assert [row["ticker"] for row in rows] == ["NQZ5", "ESZ5"]
+        assert table.age(now=3) == 3
+
+
+def list_futures_aggregates(ticker, window_start_gte, window_start_lt, **kwargs):
+    last = date.fromisoformat(window_start_lt) - timedelta(days=1)
+    close = {"ESH5": 100, "ESM5": 110, "ESU5": 121}[ticker]
+    bars = _bars(ticker, window_start_gte, last.isoformat(), close)
+    return {"results": bars, "status": "OK"}
+
+
+class TestFuturesTools:
+    """Tests for the futures reference tools."""
+
+    @pytest.fixture
+    def client(self, polygon, monkeypatch):
+        monkeypatch.setattr(server, "futures_references", {})
+        monkeypatch.setattr(server, "futures_bars", server.OrderedDict())
+        monkeypatch.setattr(server, "live_tables", {})
+        statuses = [
+            {"product_code": "ES", "market_status": "open"},
+            {"product_code": "CL", "market_status": "pause"},
+        ]
+        return polygon(
+            list_futures_contracts={"results": CONTRACTS, "status": "OK"},
+            list_futures_schedules_by_product_code={
+                "results": _sessions("2025-03-01", "2025-03-31"),
+                "status": "OK",
+            },
+            list_futures_aggregates=list_futures_aggregates,
+            get_futures_snapshot={"results": SNAPSHOTS, "status": "OK"},
+            list_futures_market_statuses={"results": statuses, "status": "OK"},
+            get_futures_contract_details=lambda ticker, **kwargs: {
+                "results": {"ticker": ticker},
+                "status": "OK",
+            },
+        )
+
+    def test_resolver_loads_reference_once(self, client):
+        """Test that resolvers and lookups share one load per product."""
+        result = asyncio.run(
+            server.get_futures_front_month("ES", as_of="2025-03-20", roll_days=2)
+        )
+        assert result.splitlines()[1].startswith("ESM5,")
+        asyncio.run(server.get_futures_roll_schedule("ES", "2025-03-01", "2025-04-01"))
+        result = asyncio.run(
+            server.list_futures_contracts(product_code="ES", active="true")
+        )
+        assert [line.split(",")[0] for line in result.splitlines()[1:]] == ["ESU5"]
+        result = asyncio.run(server.get_futures_contract_details("ESH5"))
+        assert "2025-03-21" in result
+        assert [name for name, _ in client.calls] == [
+            "list_futures_contracts",
+            "list_futures_schedules_by_product_code",
+        ]
+
+    def test_unknown_contract_goes_upstream(self, client):
+        """Test that contracts not cached are fetched as before."""
+        result = asyncio.run(server.get_futures_contract_details("NQZ5"))
+        assert result.splitlines() == ["ticker", "NQZ5"]
+
+    def test_continuous_series_fetches_new_segments_only(self, client):
+        """Test that segments are stitched and only new sessions are fetched."""
+        result = asyncio.run(
+            server.get_continuous_futures("ES", "2025-03-17", "2025-03-28")
+        )
+        lines = result.splitlines()
+        assert lines[0].startswith("session_end_date,window_start,ticker,open")
+        assert len(lines) == 11
+        assert lines[1].startswith("2025-03-17,,ESH5,110.0")
+        assert lines[-1].startswith("2025-03-28,,ESM5,110")
+        fetched = client.called("list_futures_aggregates")
+        # Segments are fetched concurrently, so the call order isn't fixed.
+        assert sorted(kw["ticker"] for kw in fetched) == ["ESH5", "ESM5"]
+
+        asyncio.run(server.get_continuous_futures("ES", "2025-03-17", "2025-04-04"))
+        fetched = client.called("list_futures_aggregates")
+        assert sorted(kw["ticker"] for kw in fetched) == ["ESH5", "ESM5", "ESM5"]
+        extended = [kw for kw in fetched if kw["ticker"] == "ESM5"][-1]
+        assert extended["window_start_gte"] == "2025-03-26"
+
+    def test_snapshot_readers_share_one_poll(self, client):
+        """Test that concurrent snapshot reads share one upstream poll."""
+
+        async def read():
+            return await asyncio.gather(
+                server.get_futures_snapshot(product_code="ES"),
+                server.get_futures_snapshot(ticker_lt="ESZ5", limit=1),
+                server.list_futures_market_statuses(product_code_any_of="CL"),
+            )
+
+        es, first, statuses = asyncio.run(read())
+        assert [line.split(",")[0] for line in es.splitlines()[1:]] == [
+            "ESH6",
+            "ESZ5",
+        ]
+        assert first.splitlines()[1].startswith("CLZ5,")
+        assert statuses.splitlines()[1:] == ["CL,pause"]
+        assert sorted(name for name, _ in client.calls) == [
+            "get_futures_snapshot",
+            "list_futures_market_statuses",
+        ]
+
+    def test_stale_table_refreshes_in_background(self, client, monkeypatch):
+        """Test that a stale table is served while it refreshes."""
+        monkeypatch.setattr(server, "POLYGON_FUTURES_REFRESH_INTERVAL", 5.0)
+
+        async def read():
+            await server.get_futures_snapshot(ticker="ESZ5")
+            table = server.live_tables["get_futures_snapshot", ""]
+            table.refreshed_at -= 10
+            refreshed_at = table.refreshed_at
+            result = await server.get_futures_snapshot(ticker="ESZ5")
+            assert table.refreshed_at == refreshed_at
+            await table.refresh
+            assert table.refreshed_at > refreshed_at
+            return result
+
+        assert asyncio.run(read()).splitlines()[1].startswith("ESZ5,ES,")
+        assert len(client.calls) == 2
+
+    def test_params_go_upstream(self, client):
+        """Test that calls with params bypass the live table."""
+        asyncio.run(server.get_futures_snapshot(ticker="ESZ5", params={"x": 1}))
+        assert client.calls[0][1]["ticker"] == "ESZ5"
+        assert server.live_tables == {}
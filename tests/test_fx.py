@@ -0,0 +1,151 @@
+import asyncio
+
+import pytest
+
+from mcp_polygon import server
+from mcp_polygon.clients import PooledClient
+from mcp_polygon.fx import FxRates
+
+from .conftest import FakeClient
+
+
+def make_rates():
+    rates = FxRates(max_age=5)
+    rates.set_quote("EUR", 0.90, 0.92, now=100)
+    rates.set_quote("JPY", 150.0, 150.2, now=100)
+    return rates
+
+
+class TestFxRates:
+    """Tests for the FxRates class."""
+
+    def test_cross_rates(self):
+        """Test that cross rates are derived through USD mids."""
+        rates = make_rates()
+        assert rates.cross("USD", "EUR") == pytest.approx(0.91)
+        assert rates.cross("EUR", "USD") == pytest.approx(1 / 0.91)
+        assert rates.cross("EUR", "JPY") == pytest.approx(150.1 / 0.91)
+        assert rates.cross("EUR", "EUR") == 1.0
+        assert rates.cross("EUR", "XYZ") is None
+
+    def test_matrix(self):
+        """Test that the matrix is reciprocal and marks unknown rates."""
+        rows = make_rates().matrix(["EUR", "JPY", "XYZ"])
+        assert [row["currency"] for row in rows] == ["EUR", "JPY", "XYZ"]
+        assert rows[0]["JPY"] * rows[1]["EUR"] == pytest.approx(1.0)
+        assert rows[0]["XYZ"] is None
+        assert rows[2]["EUR"] is None
+
+    def test_stale(self):
+        """Test that old and unknown rates are reported as stale."""
+        rates = make_rates()
+        rates.set_quote("GBP", 0.78, 0.80, now=104)
+        assert rates.stale(["USD", "EUR", "GBP", "XYZ", "EUR"], now=106) == [
+            "EUR",
+            "XYZ",
+        ]
+
+    def test_staleness(self):
+        """Test that stale rates report their quote time and refresh error."""
+        rates = make_rates()
+        rates.set_quote("GBP", 0.78, 0.80, now=104, as_of=1_700_000_000)
+        assert rates.staleness("GBP", now=106) == {}
+        rates.set_error("GBP", "timed out")
+        assert rates.staleness("GBP", now=110) == {
+            "as_of": "2023-11-14T22:13:20+00:00",
+            "error": "timed out",
+        }
+        assert rates.staleness("XYZ") == {"as_of": None, "error": None}
+        assert rates.staleness("USD") == {}
+
+    def test_invalid_quote(self):
+        """Test that non-positive quotes are rejected."""
+        with pytest.raises(ValueError):
+            FxRates().set_quote("EUR", 0, 0.92)
+
+
+def fx_client(mid):
+    last = {"bid": mid, "ask": mid}
+    return FakeClient(get_last_forex_quote={"last": last, "status": "success"})
+
+
+class TestFxTools:
+    """Tests for the FX tools."""
+
+    def test_tables_are_per_api_key(self, monkeypatch):
+        """Test that each API key reads rates from its own quotes."""
+        monkeypatch.setattr(server, "response_cache", server.ResponseCache())
+        monkeypatch.setattr(server, "fx_rates", {})
+        mids = {"a": 0.9, "b": 0.8}
+        clients = {
+            key_id: PooledClient(fx_client(mid), server.rate_limiter, key_id)
+            for key_id, mid in mids.items()
+        }
+        for key_id, mid in mids.items():
+            monkeypatch.setattr(server, "_current_client", lambda k=key_id: clients[k])
+            result = asyncio.run(server.convert_currencies({"USD": 10}, "EUR"))
+            assert result.splitlines()[1].split(",")[2] == str(mid)
+        assert server.fx_rates["a"].rates["EUR"] == 0.9
+        assert server.fx_rates["b"].rates["EUR"] == 0.8
+
+    @pytest.fixture
+    def client(self, polygon, monkeypatch):
+        monkeypatch.setattr(server, "fx_rates", {})
+        mids = {"EUR": 0.9, "JPY": 150.0, "GBP": 0.8}
+        failing = set()
+
+        def last_quote(from_, to, **kwargs):
+            if to in failing or to not in mids:
+                raise RuntimeError(f"no quote for {to}")
+            last = {"bid": mids[to], "ask": mids[to], "timestamp": 1_700_000_000_000}
+            return {"last": last, "status": "success"}
+
+        fake = polygon(
+            get_last_forex_quote=last_quote,
+            get_real_time_currency_conversion=lambda from_, to, **kwargs: {
+                "converted": 2.0 if from_ == "XYZ" else 0.5
+            },
+        )
+        fake.failing = failing
+        return fake
+
+    def test_stale_rate_marked(self, client):
+        """Test that a rate whose refresh failed carries as_of and error."""
+        rates = server.fx_rates[""] = server.FxRates(server.FX_RATES_MAX_AGE)
+        rates.set_quote("GBP", 0.8, 0.8, now=float("-inf"), as_of=1_700_000_000)
+        client.failing.add("GBP")
+        result = asyncio.run(server.get_fx_rates(["EUR", "GBP"]))
+        header, eur, gbp = result.splitlines()
+        assert header == "currency,EUR,GBP,as_of,error"
+        assert eur == "EUR,1.0,0.888888888888889,,"
+        assert gbp.endswith(",2023-11-14T22:13:20+00:00,no quote for GBP")
+
+    def test_missing_pair_converted_directly(self, client):
+        """Test that pairs without a USD quote fall back to upstream."""
+        result = asyncio.run(server.get_fx_rates(["EUR", "XYZ"]))
+        header, eur, xyz = result.splitlines()
+        assert header == "currency,EUR,XYZ,as_of,error"
+        assert eur == "EUR,1.0,0.5,,"
+        assert xyz == "XYZ,2.0,1.0,,no quote for XYZ"
+        assert len(client.called("get_real_time_currency_conversion")) == 2
+
+    def test_refresh_bounded(self, client, monkeypatch):
+        """Test that at most FANOUT_MAX_CONCURRENCY quotes load at once."""
+        monkeypatch.setattr(server, "FANOUT_MAX_CONCURRENCY", 2)
+        in_flight = peak = 0
+        fetch = server._fetch
+
+        async def counting_fetch(*args, **kwargs):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            try:
+                return await fetch(*args, **kwargs)
+            finally:
+                in_flight -= 1
+
+        monkeypatch.setattr(server, "_fetch", counting_fetch)
+        asyncio.run(server.get_fx_rates(["EUR", "JPY", "GBP"]))
+        assert len(client.called("get_last_forex_quote")) == 3
+        assert peak == 2
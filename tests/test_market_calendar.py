@@ -0,0 +1,191 @@
+import asyncio
+from datetime import date, datetime
+
+import pytest
+
+from mcp_polygon import server
+
+from mcp_polygon.market_calendar import (
+    EASTERN,
+    MarketCalendar,
+    follows_equity_calendar,
+    to_market_date,
+)
+
+HOLIDAYS = [
+    {
+        "date": "2025-11-27",
+        "exchange": "NYSE",
+        "name": "Thanksgiving",
+        "status": "closed",
+    },
+    {
+        "date": "2025-11-27",
+        "exchange": "NASDAQ",
+        "name": "Thanksgiving",
+        "status": "closed",
+    },
+    {
+        "close": "2025-11-28T18:00:00.000Z",
+        "date": "2025-11-28",
+        "exchange": "NYSE",
+        "name": "Thanksgiving",
+        "open": "2025-11-28T14:30:00.000Z",
+        "status": "early-close",
+    },
+    {
+        "date": "2025-12-25",
+        "exchange": "OTC",
+        "name": "Christmas",
+        "status": "closed",
+    },
+]
+
+
+def _eastern(*args):
+    return datetime(*args, tzinfo=EASTERN)
+
+
+class TestMarketCalendar:
+    """Tests for the MarketCalendar class."""
+
+    def test_weekends_closed_without_holidays(self):
+        """Test that weekends are closed even before holidays are loaded."""
+        calendar = MarketCalendar()
+        assert calendar.is_trading_day(date(2025, 11, 21))
+        assert not calendar.is_trading_day(date(2025, 11, 22))
+        assert not calendar.is_trading_day(date(2025, 11, 23))
+        assert calendar.is_stale(60)
+
+    def test_holidays_closed(self):
+        """Test that equity exchange holidays are closed and others ignored."""
+        calendar = MarketCalendar(HOLIDAYS)
+        assert not calendar.is_trading_day(date(2025, 11, 27))
+        # OTC-only records don't close the equity calendar
+        assert calendar.is_trading_day(date(2025, 12, 25))
+        assert not calendar.is_stale(60)
+
+    def test_next_and_previous_trading_day(self):
+        """Test stepping over weekends and holidays."""
+        calendar = MarketCalendar(HOLIDAYS)
+        assert calendar.next_trading_day(date(2025, 11, 26)) == date(2025, 11, 28)
+        assert calendar.next_trading_day(date(2025, 11, 28)) == date(2025, 12, 1)
+        assert calendar.previous_trading_day(date(2025, 11, 28)) == date(2025, 11, 26)
+
+    def test_has_trading_day(self):
+        """Test range checks used to skip empty aggregate requests."""
+        calendar = MarketCalendar(HOLIDAYS)
+        assert not calendar.has_trading_day(date(2025, 11, 22), date(2025, 11, 23))
+        assert calendar.has_trading_day(date(2025, 11, 22), date(2025, 11, 24))
+        assert not calendar.has_trading_day(date(2025, 11, 24), date(2025, 11, 21))
+
+    def test_regular_session(self):
+        """Test regular session boundaries in Eastern time."""
+        session = MarketCalendar(HOLIDAYS).session(date(2025, 11, 26))
+        assert session["pre_market_open"] == _eastern(2025, 11, 26, 4, 0)
+        assert session["open"] == _eastern(2025, 11, 26, 9, 30)
+        assert session["close"] == _eastern(2025, 11, 26, 16, 0)
+        assert session["after_hours_close"] == _eastern(2025, 11, 26, 20, 0)
+
+    def test_early_close_session(self):
+        """Test that early closes shorten regular and extended hours."""
+        session = MarketCalendar(HOLIDAYS).session(date(2025, 11, 28))
+        assert session["close"] == _eastern(2025, 11, 28, 13, 0)
+        assert session["after_hours_close"] == _eastern(2025, 11, 28, 17, 0)
+
+    def test_no_session_on_holiday(self):
+        """Test that holidays have no session."""
+        assert MarketCalendar(HOLIDAYS).session(date(2025, 11, 27)) is None
+
+    def test_status(self):
+        """Test status across the phases of a trading day."""
+        calendar = MarketCalendar(HOLIDAYS)
+
+        status = calendar.status(_eastern(2025, 11, 26, 8, 0))
+        assert status["market"] == "extended-hours"
+        assert status["earlyHours"] is True
+        assert status["nextChange"] == "2025-11-26T09:30:00-05:00"
+
+        status = calendar.status(_eastern(2025, 11, 26, 12, 0))
+        assert status["market"] == "open"
+        assert status["earlyHours"] is False
+        assert status["afterHours"] is False
+
+        status = calendar.status(_eastern(2025, 11, 26, 17, 0))
+        assert status["market"] == "extended-hours"
+        assert status["afterHours"] is True
+
+        status = calendar.status(_eastern(2025, 11, 26, 21, 0))
+        assert status["market"] == "closed"
+        assert status["nextChange"] == "2025-11-28T04:00:00-05:00"
+
+    def test_seconds_until_transition(self):
+        """Test the time remaining until the next status change."""
+        calendar = MarketCalendar(HOLIDAYS)
+        now = _eastern(2025, 11, 28, 12, 0)
+        assert calendar.seconds_until_transition(now) == 3600
+
+
+class TestCalendarHelpers:
+    """Tests for the module-level calendar helpers."""
+
+    def test_follows_equity_calendar(self):
+        """Test that crypto and forex tickers are exempt from the calendar."""
+        assert follows_equity_calendar("AAPL")
+        assert follows_equity_calendar("O:TSLA251003C00050000")
+        assert not follows_equity_calendar("X:BTCUSD")
+        assert not follows_equity_calendar("C:EURUSD")
+
+    def test_to_market_date(self):
+        """Test conversion of the range bound formats accepted by get_aggs."""
+        assert to_market_date("2025-11-26") == date(2025, 11, 26)
+        assert to_market_date(date(2025, 11, 26)) == date(2025, 11, 26)
+        # 2025-11-27T02:00:00Z is still the 26th in New York
+        assert to_market_date(1764208800000) == date(2025, 11, 26)
+        assert to_market_date("1764208800000") == date(2025, 11, 26)
+        assert to_market_date(_eastern(2025, 11, 26, 23, 0)) == date(2025, 11, 26)
+        assert to_market_date("not a date") is None
+        assert to_market_date(None) is None
+
+
+class TestAggsPlanning:
+    """Tests for skipping aggregates requests on non-trading days."""
+
+    @pytest.fixture
+    def client(self, polygon, monkeypatch):
+        monkeypatch.setattr(server, "market_calendar", MarketCalendar())
+        monkeypatch.setattr(server, "_holidays_retry_at", 0.0)
+        bar = {"o": 1.0, "c": 1.5, "t": 1672531200000}
+        return polygon(
+            get_market_holidays=HOLIDAYS,
+            get_aggs={"results": [bar], "status": "OK"},
+            list_aggs={"results": [bar], "status": "OK"},
+        )
+
+    def test_weekend_days_skipped(self, client):
+        """Test that day bars over a weekend aren't requested upstream."""
+        result = asyncio.run(
+            server.get_aggs("AAPL", 1, "day", "2025-11-22", "2025-11-23", False)
+        )
+        assert result == ""
+        assert [name for name, _ in client.calls] == ["get_market_holidays"]
+
+    @pytest.mark.parametrize(
+        "timespan, from_, to",
+        [
+            ("week", "2025-01-04", "2025-01-05"),
+            ("month", "2023-01-01", "2023-01-01"),
+            ("year", "2023-01-01", "2023-01-01"),
+        ],
+    )
+    def test_coarse_timespans_requested(self, client, timespan, from_, to):
+        """Test that bars longer than a day are requested for any range."""
+        for tool in (server.get_aggs, server.list_aggs):
+            result = asyncio.run(tool("AAPL", 1, timespan, from_, to, False))
+            assert result.splitlines()[1] == "1.0,1.5,1672531200000"
+        assert sorted(name for name, _ in client.calls) == ["get_aggs", "list_aggs"]
+
+    def test_calendar_error_returned(self, client):
+        """Test that range bounds the calendar can't convert give an error."""
+        result = asyncio.run(server.get_aggs("AAPL", 1, "day", 10**20, 10**20))
+        assert result.startswith("Error:")
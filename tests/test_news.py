@@ -0,0 +1,237 @@
+import asyncio
+
+import pytest
+from polygon.exceptions import BadResponse
+
+from mcp_polygon import server
+
+from mcp_polygon.news import (
+    HEADLINE_FIELDS,
+    NewsStore,
+    merge_news,
+    normalize_title,
+    time_bounds,
+    to_timestamp,
+    url_hash,
+)
+
+
+def _article(article_id, hour, tickers=("AAPL",), updated_hour=None):
+    return {
+        "benzinga_id": article_id,
+        "published": f"2025-01-02T{hour:02d}:00:00Z",
+        "last_updated": f"2025-01-02T{updated_hour or hour:02d}:00:00Z",
+        "tickers": list(tickers),
+    }
+
+
+def make_store(articles, max_articles=100):
+    store = NewsStore("benzinga_id", "published", "last_updated", max_articles)
+    store.covers_from = to_timestamp("2025-01-02T00:00:00Z")
+    store.add(articles)
+    store.caught_up = True
+    return store
+
+
+class TestTimeBounds:
+    """Tests for the time_bounds function."""
+
+    def test_bounds(self):
+        """Test combining comparison filters into an inclusive range."""
+        since, until = time_bounds(gte="2025-01-02", lt="2025-01-03T00:00:00Z")
+        assert since == to_timestamp("2025-01-02T00:00:00+00:00")
+        assert until < to_timestamp("2025-01-03")
+
+    def test_tightest_bound_wins(self):
+        """Test that overlapping bounds keep the narrowest range."""
+        since, _ = time_bounds(gt="2025-01-02", gte="2025-01-01")
+        assert since > to_timestamp("2025-01-02")
+
+    def test_invalid(self):
+        """Test that malformed bounds are rejected."""
+        with pytest.raises(ValueError):
+            time_bounds(gte="yesterday")
+
+
+class TestNewsStore:
+    """Tests for the NewsStore class."""
+
+    def test_dedupe_and_replace(self):
+        """Test that a newer version of an article replaces the old one."""
+        store = make_store([_article(1, 9, ["AAPL"])])
+        store.add([_article(1, 9, ["MSFT"], updated_hour=10)])
+        assert len(store) == 1
+        assert "AAPL" not in store.by_ticker
+        assert store.by_ticker["MSFT"] == {1}
+        assert store.cursor == "2025-01-02T10:00:00Z"
+
+    def test_query_by_ticker(self):
+        """Test ticker filters, newest first."""
+        store = make_store(
+            [
+                _article(1, 9, ["AAPL"]),
+                _article(2, 10, ["AAPL", "MSFT"]),
+                _article(3, 11, ["MSFT"]),
+            ]
+        )
+        assert [a["benzinga_id"] for a in store.query(["MSFT"], limit=2)] == [3, 2]
+        since = to_timestamp("2025-01-02T00:00:00Z")
+        articles = store.query(["AAPL", "MSFT"], all_tickers=True, since=since)
+        assert [a["benzinga_id"] for a in articles] == [2]
+
+    def test_query_time_range(self):
+        """Test publication time bounds within the covered window."""
+        store = make_store([_article(i, i) for i in range(1, 6)])
+        since, until = time_bounds(gte="2025-01-02T02:00:00Z", lt="2025-01-02T04:00")
+        articles = store.query(since=since, until=until, ascending=True)
+        assert [a["benzinga_id"] for a in articles] == [2, 3]
+
+    def test_uncovered_query_goes_upstream(self):
+        """Test that queries reaching before the covered window return None."""
+        store = make_store([_article(1, 9)])
+        assert store.query(limit=5) is None
+        assert store.query(since=to_timestamp("2025-01-01"), limit=5) is None
+        assert store.query(limit=1) is not None
+
+    def test_not_synced(self):
+        """Test that a store that hasn't caught up answers nothing."""
+        store = make_store([_article(1, 9)])
+        store.caught_up = False
+        assert store.query(since=to_timestamp("2025-01-02T05:00:00Z")) is None
+
+    def test_eviction_moves_coverage(self):
+        """Test that dropping old articles narrows the covered window."""
+        store = make_store([_article(i, i) for i in range(1, 6)], max_articles=3)
+        assert len(store) == 3
+        assert not store.covers(to_timestamp("2025-01-02T02:00:00Z"))
+        assert store.covers(to_timestamp("2025-01-02T03:00:00Z"))
+
+
+POLYGON_ARTICLE = {
+    "id": "p1",
+    "title": "Apple Beats Estimates!",
+    "published_utc": "2025-01-02T10:00:00Z",
+    "article_url": "https://www.example.com/apple-beats/?utm_source=x",
+    "tickers": ["AAPL"],
+    "publisher": {"name": "Example", "logo_url": "https://example.com/logo"},
+    "description": "Apple reported...",
+    "insights": [{"ticker": "AAPL", "sentiment": "positive"}],
+}
+
+
+def _benzinga(article_id, title, url, hour, tickers):
+    return {
+        "benzinga_id": article_id,
+        "title": title,
+        "published": f"2025-01-02T{hour:02d}:00:00Z",
+        "url": url,
+        "tickers": tickers,
+        "author": "Writer",
+        "teaser": "Teaser",
+        "body": "<p>Long body</p>",
+    }
+
+
+class TestMergeNews:
+    """Tests for the merge_news function."""
+
+    def test_normalization(self):
+        """Test that cosmetic title and URL differences are ignored."""
+        assert normalize_title("Apple  Beats Estimates!") == "apple beats estimates"
+        assert url_hash("http://example.com/apple-beats") == url_hash(
+            "https://www.example.com/apple-beats/?utm_source=x#top"
+        )
+        assert url_hash(None) == ""
+
+    def test_dedupe_across_sources(self):
+        """Test that a story in both feeds is listed once with both sources."""
+        articles = merge_news(
+            [
+                ("polygon", [POLYGON_ARTICLE]),
+                (
+                    "benzinga",
+                    [
+                        _benzinga(
+                            1,
+                            "apple beats estimates",
+                            "https://b.com/1",
+                            11,
+                            ["AAPL", "MSFT"],
+                        ),
+                        _benzinga(
+                            2,
+                            "Other story",
+                            "http://example.com/apple-beats",
+                            9,
+                            ["AAPL"],
+                        ),
+                        _benzinga(3, "Fresh story", "https://b.com/3", 12, ["TSLA"]),
+                    ],
+                ),
+            ]
+        )
+        assert articles == [
+            {
+                "published": "2025-01-02T12:00:00Z",
+                "title": "Fresh story",
+                "tickers": ["TSLA"],
+                "sources": ["benzinga"],
+                "url": "https://b.com/3",
+            },
+            {
+                "published": "2025-01-02T10:00:00Z",
+                "title": "Apple Beats Estimates!",
+                "tickers": ["AAPL", "MSFT"],
+                "sources": ["polygon", "benzinga"],
+                "url": POLYGON_ARTICLE["article_url"],
+            },
+        ]
+
+    def test_full_articles(self):
+        """Test that the full projection adds publisher and summary only."""
+        (article,) = merge_news([("polygon", [POLYGON_ARTICLE])], headlines_only=False)
+        assert list(article) == list(HEADLINE_FIELDS) + ["publisher", "summary"]
+        assert article["publisher"] == "Example"
+        assert article["summary"] == "Apple reported..."
+
+    def test_limit(self):
+        """Test that only the newest articles are kept."""
+        articles = merge_news(
+            [
+                (
+                    "benzinga",
+                    [
+                        _benzinga(i, f"Story {i}", f"https://b.com/{i}", i, [])
+                        for i in range(1, 6)
+                    ],
+                )
+            ],
+            limit=2,
+        )
+        assert [a["title"] for a in articles] == ["Story 5", "Story 4"]
+
+
+def not_authorized(**kwargs):
+    raise BadResponse('{"status":"NOT_AUTHORIZED"}')
+
+
+class TestGetNews:
+    """Tests for the get_news tool."""
+
+    def test_failed_feed_is_skipped(self, polygon, monkeypatch):
+        """Test that one feed failing still returns the other."""
+        fake = polygon(
+            list_ticker_news={"results": [POLYGON_ARTICLE], "status": "OK"},
+            list_benzinga_news=not_authorized,
+        )
+        monkeypatch.setattr(server, "news_stores", {})
+        result = asyncio.run(server.get_news(ticker="AAPL", published_gte="2025-01-01"))
+        assert result.splitlines() == [
+            "published,title,tickers,sources,url",
+            "2025-01-02T10:00:00Z,Apple Beats Estimates!,AAPL,polygon,"
+            + POLYGON_ARTICLE["article_url"],
+        ]
+        # The query reaches before the synced window, so it went upstream.
+        assert any(
+            kwargs.get("published_utc_gte") == "2025-01-01" for _, kwargs in fake.calls
+        )
@@ -0,0 +1,102 @@
+import asyncio
+
+import pytest
+
+from mcp_polygon import server
+from mcp_polygon.options_chain import merge_chain
+
+CONTRACTS = [
+    {
+        "ticker": f"O:SPY251219C00{strike}000",
+        "contract_type": "call",
+        "expiration_date": "2025-12-19",
+        "strike_price": strike,
+        "shares_per_contract": 100,
+        "exercise_style": "american",
+        "underlying_ticker": "SPY",
+    }
+    for strike in (600, 605, 610)
+]
+
+
+PAGE_2 = "/v3/reference/options/contracts?cursor=p2"
+
+
+@pytest.fixture
+def client(polygon, monkeypatch):
+    """Serve a two-page contract list and per-contract snapshots."""
+    monkeypatch.setitem(server.CACHE_POLICIES, "list_universal_snapshots", (0, 0))
+    return polygon(
+        list_options_contracts={
+            "results": CONTRACTS[:2],
+            "next_url": f"https://api.polygon.io{PAGE_2}",
+        },
+        _get={"results": CONTRACTS[2:]},
+        list_universal_snapshots=lambda ticker_any_of=None, **kwargs: {
+            "results": [{"ticker": t, "greeks": {"delta": 0.5}} for t in ticker_any_of]
+        },
+    )
+
+
+class TestMergeChain:
+    """Tests for the merge_chain function."""
+
+    def test_snapshot_fields_joined(self):
+        """Test that quote fields are joined onto contracts by ticker."""
+        snapshots = [
+            {
+                "ticker": CONTRACTS[1]["ticker"],
+                "greeks": {"delta": 0.4},
+                "implied_volatility": 0.2,
+                "details": {"strike_price": 605},
+            }
+        ]
+        chain = merge_chain(CONTRACTS[:2], snapshots)
+        assert [row["strike_price"] for row in chain] == [600, 605]
+        assert "greeks" not in chain[0]
+        assert chain[1]["greeks"] == {"delta": 0.4}
+        assert chain[1]["implied_volatility"] == 0.2
+        assert "details" not in chain[1]
+        assert "underlying_ticker" not in chain[1]
+
+    def test_snapshot_error(self):
+        """Test that per-contract snapshot errors are reported."""
+        snapshots = [
+            {"ticker": CONTRACTS[0]["ticker"], "error": "NOT_FOUND", "message": "x"}
+        ]
+        assert merge_chain(CONTRACTS[:1], snapshots)[0]["error"] == "x"
+
+
+class TestGetOptionsChain:
+    """Tests for the get_options_chain tool."""
+
+    def test_pages_followed(self, client):
+        """Test that every page of the contract list is loaded."""
+        result = asyncio.run(server.get_options_chain("SPY"))
+        assert len(result.splitlines()) == 4
+        assert client.called("_get") == [{"path": PAGE_2}]
+
+    def test_pages_count_against_list_method(self, client, monkeypatch):
+        """Test that follow-up pages are accounted to the list method."""
+        monkeypatch.setattr(server, "latency_tracker", server.LatencyTracker())
+        asyncio.run(server.get_options_chain("SPY"))
+        samples = server.latency_tracker._samples
+        assert len(samples["list_options_contracts"]) == 2
+        assert "_get" not in samples
+
+    def test_contract_list_cached(self, client):
+        """Test that later calls only refresh the snapshots."""
+
+        async def scenario():
+            await server.get_options_chain("SPY", contract_type="call")
+            await server.get_options_chain("SPY", contract_type="call")
+
+        asyncio.run(scenario())
+        assert len(client.called("list_options_contracts")) == 1
+        assert len(client.called("list_universal_snapshots")) == 2
+
+    def test_max_contracts(self, client):
+        """Test that the chain is truncated to max_contracts."""
+        result = asyncio.run(server.get_options_chain("SPY", max_contracts=2))
+        assert len(result.splitlines()) == 3
+        assert client.called("_get") == []
@@ -0,0 +1,89 @@
+import json
+
+import pytest
+
+from mcp_polygon.screening import snapshot_rows, top_n
+
+
+def _snapshot(ticker, change, volume, price, vwap, bid=None, ask=None):
+    snapshot = {
+        "ticker": ticker,
+        "todaysChangePerc": change,
+        "day": {"c": price, "v": volume, "vw": vwap},
+        "lastTrade": {"p": price},
+    }
+    if bid is not None:
+        snapshot["lastQuote"] = {"p": bid, "P": ask}
+    return snapshot
+
+
+BODY = json.dumps(
+    {
+        "status": "OK",
+        "tickers": [
+            _snapshot("AAA", 5.0, 1_000_000, 10.0, 9.5, bid=9.99, ask=10.01),
+            _snapshot("BBB", -3.0, 50_000, 20.0, 21.0, bid=19.9, ask=20.1),
+            _snapshot("CCC", 12.0, 200, 1.0, 1.0),
+            _snapshot("DDD", 1.0, 3_000_000, 100.0, 100.0, bid=99.0, ask=101.0),
+            {"ticker": "EEE"},
+        ],
+    }
+)
+
+
+class TestSnapshotRows:
+    """Tests for the snapshot_rows function."""
+
+    def test_derived_columns(self):
+        """Test that spread, VWAP distance and dollar volume are derived."""
+        row = snapshot_rows(BODY)[0]
+        assert row["day_v"] == 1_000_000
+        assert row["price"] == 10.0
+        assert row["spread"] == pytest.approx(0.02)
+        assert row["spread_pct"] == pytest.approx(0.2)
+        assert row["vwap_distance_pct"] == pytest.approx(0.5 / 9.5 * 100)
+        assert row["dollar_volume"] == pytest.approx(9_500_000)
+
+    def test_missing_fields(self):
+        """Test that tickers without data still parse."""
+        row = snapshot_rows(BODY)[4]
+        assert row["price"] is None
+        assert "spread" not in row
+
+    def test_empty_snapshot(self):
+        """Test that a snapshot without tickers yields no rows."""
+        assert snapshot_rows('{"status": "OK", "count": 0}') == []
+
+
+class TestTopN:
+    """Tests for the top_n function."""
+
+    def test_largest(self):
+        """Test ranking by the largest values."""
+        ranked = top_n(snapshot_rows(BODY), "todaysChangePerc", 2)
+        assert [row["ticker"] for row in ranked] == ["CCC", "AAA"]
+
+    def test_ascending(self):
+        """Test ranking by the smallest values."""
+        ranked = top_n(snapshot_rows(BODY), "spread", 2, ascending=True)
+        assert [row["ticker"] for row in ranked] == ["AAA", "BBB"]
+        assert list(ranked[0]) == [
+            "ticker",
+            "price",
+            "todaysChangePerc",
+            "day_v",
+            "day_vw",
+            "spread",
+        ]
+
+    def test_filters(self):
+        """Test the volume and price floors."""
+        rows = snapshot_rows(BODY)
+        ranked = top_n(rows, "todaysChangePerc", 10, min_volume=10_000)
+        assert [row["ticker"] for row in ranked] == ["AAA", "DDD", "BBB"]
+        ranked = top_n(rows, "todaysChangePerc", 10, min_price=15)
+        assert [row["ticker"] for row in ranked] == ["DDD", "BBB"]
+
+    def test_unknown_column(self):
+        """Test that a column no ticker has yields no rows."""
+        assert top_n(snapshot_rows(BODY), "nonexistent", 5) == []
@@ -0,0 +1,92 @@
+import asyncio
+
+import pytest
+
+from mcp_polygon import server
+
+
+def echo_tickers(ticker_any_of=None, limit=None, **kwargs):
+    results = [{"ticker": ticker, "value": 1} for ticker in ticker_any_of or []]
+    return {"status": "OK", "results": results[:limit]}
+
+
+@pytest.fixture
+def client(polygon, monkeypatch):
+    monkeypatch.setattr(server, "UNIVERSAL_SNAPSHOT_MAX_TICKERS", 3)
+    return polygon(list_universal_snapshots=echo_tickers)
+
+
+def requests(client):
+    """Return the (tickers, limit) of each snapshot request."""
+    return [
+        (list(kwargs["ticker_any_of"] or []), kwargs["limit"])
+        for kwargs in client.called("list_universal_snapshots")
+    ]
+
+
+class TestUniversalSnapshotChunks:
+    """Tests for chunked list_universal_snapshots requests."""
+
+    def test_short_list_single_request(self, client):
+        """Test that lists within the maximum are sent as is."""
+        asyncio.run(server.list_universal_snapshots("stocks", ["A", "B"], limit=10))
+        assert requests(client) == [(["A", "B"], 10)]
+
+    def test_long_list_chunked(self, client):
+        """Test that long lists are split and merged in order."""
+        tickers = ["A", "B", "C", "D", "E", "B"]
+        result = asyncio.run(server.list_universal_snapshots("stocks", tickers))
+        assert sorted(requests(client)) == [(["A", "B", "C"], 3), (["D", "E"], 2)]
+        assert result.splitlines() == [
+            "ticker,value",
+            "A,1",
+            "B,1",
+            "C,1",
+            "D,1",
+            "E,1",
+        ]
+
+    def test_long_list_sorted_and_limited(self, client):
+        """Test that sort, order and limit apply to the merged chunks."""
+        tickers = ["D", "A", "E", "C", "B"]
+        result = asyncio.run(
+            server.list_universal_snapshots(
+                "stocks", tickers, order="desc", limit=3, sort="ticker"
+            )
+        )
+        assert result.splitlines() == ["ticker,value", "E,1", "D,1", "C,1"]
+        for kwargs in client.called("list_universal_snapshots"):
+            assert "sort" not in kwargs and "order" not in kwargs
+
+    def test_long_list_bounded(self, client, monkeypatch):
+        """Test that at most FANOUT_MAX_CONCURRENCY chunks are in flight."""
+        monkeypatch.setattr(server, "FANOUT_MAX_CONCURRENCY", 2)
+        in_flight = peak = 0
+        fetch = server._fetch
+
+        async def counting_fetch(*args, **kwargs):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            try:
+                return await fetch(*args, **kwargs)
+            finally:
+                in_flight -= 1
+
+        monkeypatch.setattr(server, "_fetch", counting_fetch)
+        tickers = [f"T{i}" for i in range(12)]
+        result = asyncio.run(server.list_universal_snapshots("stocks", tickers))
+        assert len(result.splitlines()) == 11
+        assert len(requests(client)) == 4
+        assert peak == 2
+
+
+class TestCryptoBook:
+    """Tests for the get_snapshot_crypto_book tool."""
+
+    def test_depth_below_one_rejected(self, polygon):
+        """Test that depth=0 is an error rather than the default depth."""
+        polygon(get_snapshot_crypto_book={"data": {"bids": [], "asks": []}})
+        result = asyncio.run(server.get_snapshot_crypto_book("X:BTCUSD", depth=0))
+        assert result == "Error: depth must be at least 1, got 0"
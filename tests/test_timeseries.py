@@ -0,0 +1,160 @@
+import asyncio
+from datetime import date, timedelta
+
+import pytest
+
+from mcp_polygon import server
+from mcp_polygon.timeseries import TimeSeries, date_range
+
+
+def _records(first, count, step=1):
+    start = date.fromisoformat(first)
+    return [
+        {"date": (start + timedelta(days=i * step)).isoformat(), "yield_10_year": i}
+        for i in range(count)
+    ]
+
+
+def make_series(covers_from="2025-01-01"):
+    series = TimeSeries("date", cadence_days=1)
+    series.add(_records("2025-01-01", 10))
+    series.covers_from = date.fromisoformat(covers_from)
+    return series
+
+
+class TestDateRange:
+    """Tests for the date_range function."""
+
+    def test_bounds(self):
+        """Test that exclusive bounds become inclusive dates."""
+        assert date_range(gt="2025-01-01", lt="2025-01-10T00:00:00Z") == (
+            date(2025, 1, 2),
+            date(2025, 1, 9),
+            None,
+        )
+
+    def test_any_of(self):
+        """Test that listed dates set both the range and the allowed days."""
+        since, until, days = date_range(any_of="2025-01-05,2025-01-02")
+        assert (since, until) == (date(2025, 1, 2), date(2025, 1, 5))
+        assert days == {date(2025, 1, 2), date(2025, 1, 5)}
+
+    def test_invalid(self):
+        """Test that malformed dates are rejected."""
+        with pytest.raises(ValueError):
+            date_range(gte="soon")
+
+
+class TestTimeSeries:
+    """Tests for the TimeSeries class."""
+
+    def test_add_keeps_order_and_replaces(self):
+        """Test that records stay sorted and a date is held once."""
+        series = TimeSeries("date", cadence_days=1)
+        series.add(_records("2025-01-05", 2) + _records("2025-01-01", 2))
+        series.add([{"date": "2025-01-05", "yield_10_year": 9}])
+        assert [r["date"] for r in series.records] == [
+            "2025-01-01",
+            "2025-01-02",
+            "2025-01-05",
+            "2025-01-06",
+        ]
+        assert series.records[2]["yield_10_year"] == 9
+        assert series.high_water == date(2025, 1, 6)
+
+    def test_range_query(self):
+        """Test newest-first and ascending range selection."""
+        series = make_series()
+        since, until, days = date_range(gte="2025-01-03", lte="2025-01-06")
+        newest = series.query(since, until, days, limit=2)
+        assert [r["date"] for r in newest] == ["2025-01-06", "2025-01-05"]
+        oldest = series.query(since, until, days, limit=2, ascending=True)
+        assert [r["date"] for r in oldest] == ["2025-01-03", "2025-01-04"]
+
+    def test_uncovered_history(self):
+        """Test that queries needing unloaded history return None."""
+        series = make_series()
+        assert series.query(limit=5) is not None
+        assert series.query(limit=20) is None
+        assert series.query(limit=5, ascending=True) is None
+        assert series.query(since=date(2024, 12, 1), limit=20) is None
+        series.covers_from = date.min
+        assert len(series.query(limit=20)) == 10
+
+    def test_due(self):
+        """Test that a release is due one cadence after the high-water mark."""
+        series = make_series()
+        assert not series.due(date(2025, 1, 9))
+        assert series.due(date(2025, 1, 11))
+
+
+def yields_between(history):
+    def list_treasury_yields(
+        date_gt="", date_gte="", date_lt="9999", order=None, limit=None, **kwargs
+    ):
+        records = [
+            r
+            for r in history
+            if r["date"] > date_gt and r["date"] >= date_gte and r["date"] < date_lt
+        ]
+        if order == "desc":
+            records = records[::-1]
+        return {"results": records[:limit], "status": "OK"}
+
+    return list_treasury_yields
+
+
+class TestSeriesTools:
+    """Tests for the cached series tools."""
+
+    @pytest.fixture
+    def client(self, polygon, monkeypatch):
+        monkeypatch.setattr(server, "series_cache", server.OrderedDict())
+        history = _records("2025-01-01", 10)
+        fake = polygon(list_treasury_yields=yields_between(history))
+        fake.history = history
+        return fake
+
+    def test_only_new_records_fetched(self, client, monkeypatch):
+        """Test that refreshes ask only for records past the high-water mark."""
+        result = asyncio.run(server.list_treasury_yields(limit=2))
+        assert result.splitlines()[1:] == ["2025-01-10,9", "2025-01-09,8"]
+        assert len(client.called("list_treasury_yields")) == 1
+        assert "date_gt" not in client.called("list_treasury_yields")[0]
+
+        asyncio.run(server.list_treasury_yields(date_gte="2025-01-09", limit=3))
+        assert len(client.called("list_treasury_yields")) == 1
+
+        client.history.append({"date": "2025-01-11", "yield_10_year": 10})
+        monkeypatch.setattr(server, "SERIES_POLL_INTERVAL", 0.0)
+        result = asyncio.run(server.list_treasury_yields(limit=1))
+        assert client.called("list_treasury_yields")[-1]["date_gt"] == "2025-01-10"
+        assert result.splitlines()[1:] == ["2025-01-11,10"]
+
+    def test_backfill(self, client):
+        """Test that a query before the held range loads only the missing part."""
+        asyncio.run(server.list_treasury_yields(date_gte="2025-01-06"))
+        result = asyncio.run(
+            server.list_treasury_yields(date_gte="2025-01-02", order="asc", limit=2)
+        )
+        assert client.called("list_treasury_yields")[-1]["date_gte"] == "2025-01-02"
+        assert client.called("list_treasury_yields")[-1]["date_lt"] == "2025-01-06"
+        assert result.splitlines()[1:] == ["2025-01-02,1", "2025-01-03,2"]
+
+    def test_cold_query_loads_newest_window(self, client):
+        """Test that a first unfiltered query fetches only the newest records."""
+        result = asyncio.run(server.list_treasury_yields(limit=3))
+        assert result.splitlines()[1:] == [
+            "2025-01-10,9",
+            "2025-01-09,8",
+            "2025-01-08,7",
+        ]
+        (window,) = client.called("list_treasury_yields")
+        assert (window["sort"], window["order"], window["limit"]) == ("date", "desc", 3)
+
+        # Older history is backfilled only when a query reaches it.
+        result = asyncio.run(server.list_treasury_yields(limit=5))
+        assert client.called("list_treasury_yields")[-1]["date_lt"] == "2025-01-08"
+        assert result.splitlines()[-1] == "2025-01-06,5"
+        asyncio.run(server.list_treasury_yields(limit=10))
+        assert len(client.called("list_treasury_yields")) == 2
@@ -0,0 +1,291 @@
+import asyncio
+import json
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from mcp_polygon import server
+from mcp_polygon.upstream import (
+    AdmissionController,
+    CircuitBreaker,
+    DeadlineExceeded,
+    HedgeBudget,
+    LatencyTracker,
+    RateLimiter,
+    Unavailable,
+    endpoint_family,
+    hedged_call,
+)
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+class SlowThenFast:
+    """First call takes `first_delay` seconds, later calls `delay` seconds."""
+
+    def __init__(self, first_delay: float, delay: float = 0.0):
+        self.first_delay = first_delay
+        self.delay = delay
+        self.calls = 0
+
+    async def __call__(self) -> str:
+        self.calls += 1
+        call = self.calls
+        await asyncio.sleep(self.first_delay if call == 1 else self.delay)
+        return f"call-{call}"
+
+
+class TestRateLimiter:
+    """Tests for the RateLimiter class."""
+
+    def test_unlimited(self):
+        """Test that a zero rate never blocks."""
+        limiter = RateLimiter(0)
+        assert all(limiter.try_acquire() for _ in range(1000))
+
+    def test_try_acquire_respects_burst(self):
+        """Test that non-blocking acquisition stops at the burst size."""
+        limiter = RateLimiter(1, burst=2)
+        assert limiter.try_acquire()
+        assert limiter.try_acquire()
+        assert not limiter.try_acquire()
+
+    def test_acquire_waits_for_refill(self):
+        """Test that acquire waits for a token instead of failing."""
+
+        async def scenario():
+            limiter = RateLimiter(50, burst=1)
+            loop = asyncio.get_running_loop()
+            start = loop.time()
+            for _ in range(3):
+                await limiter.acquire()
+            return loop.time() - start
+
+        assert run(scenario()) >= 0.03
+
+
+class TestLatencyTracker:
+    """Tests for the LatencyTracker class."""
+
+    def test_percentile_needs_samples(self):
+        """Test that percentiles are withheld until enough samples exist."""
+        tracker = LatencyTracker(min_samples=5)
+        for _ in range(4):
+            tracker.record("get_last_trade", 0.1)
+        assert tracker.percentile("get_last_trade", 0.95) is None
+        assert tracker.percentile("unknown", 0.95) is None
+
+    def test_percentile(self):
+        """Test percentile selection over the rolling window."""
+        tracker = LatencyTracker(window=100, min_samples=1)
+        for i in range(1, 101):
+            tracker.record("get_last_trade", i / 100)
+        assert tracker.percentile("get_last_trade", 0.95) == pytest.approx(0.96)
+        assert tracker.percentile("get_last_trade", 1.0) == pytest.approx(1.0)
+
+    def test_window_drops_old_samples(self):
+        """Test that only the most recent samples are kept."""
+        tracker = LatencyTracker(window=10, min_samples=1)
+        for _ in range(10):
+            tracker.record("x", 5.0)
+        for _ in range(10):
+            tracker.record("x", 0.1)
+        assert tracker.percentile("x", 1.0) == pytest.approx(0.1)
+
+
+class TestHedgeBudget:
+    """Tests for the HedgeBudget class."""
+
+    def test_hedges_limited_to_ratio(self):
+        """Test that hedges are earned by primary requests."""
+        budget = HedgeBudget(ratio=0.25)
+        assert not budget.try_spend()
+        for _ in range(4):
+            budget.earn()
+        assert budget.try_spend()
+        assert not budget.try_spend()
+
+    def test_credit_kept_without_token(self, monkeypatch):
+        """Test that a hedge denied a rate-limit token keeps its credit."""
+        budget = HedgeBudget(ratio=1.0)
+        budget.earn()
+        monkeypatch.setattr(server, "hedge_budget", budget)
+        limiter = RateLimiter(rate=1, burst=1)
+        assert limiter.try_acquire()
+        client = SimpleNamespace(rate_limiter=limiter)
+        assert not server._try_hedge(client)
+        assert budget.available()
+        client.rate_limiter = RateLimiter(0)
+        assert server._try_hedge(client)
+        assert not budget.available()
+
+
+class TestHedgedCall:
+    """Tests for the hedged_call function."""
+
+    def test_fast_primary_not_hedged(self):
+        """Test that no duplicate is sent when the primary is fast."""
+        call = SlowThenFast(first_delay=0)
+        assert run(hedged_call(call, timeout=1, hedge_after=0.5)) == "call-1"
+        assert call.calls == 1
+
+    def test_hedge_wins(self):
+        """Test that a hedge sent after the delay can win the race."""
+        call = SlowThenFast(first_delay=1)
+        assert run(hedged_call(call, timeout=2, hedge_after=0.01)) == "call-2"
+        assert call.calls == 2
+
+    def test_hedge_denied(self):
+        """Test that hedging is skipped when the budget refuses it."""
+        call = SlowThenFast(first_delay=0.05)
+        result = run(
+            hedged_call(call, timeout=1, hedge_after=0.01, can_hedge=lambda: False)
+        )
+        assert result == "call-1"
+        assert call.calls == 1
+
+    def test_deadline_exceeded(self):
+        """Test that the deadline bounds the wait."""
+        call = SlowThenFast(first_delay=1, delay=1)
+        with pytest.raises(DeadlineExceeded):
+            run(hedged_call(call, timeout=0.05, hedge_after=0.01))
+
+    def test_primary_error_raised(self):
+        """Test that a fast failure is raised without hedging."""
+        calls = []
+
+        async def failing():
+            calls.append(1)
+            raise ValueError("bad request")
+
+        with pytest.raises(ValueError):
+            run(hedged_call(failing, timeout=1, hedge_after=0.5))
+        assert len(calls) == 1
+
+
+class TestCircuitBreaker:
+    """Tests for the CircuitBreaker class."""
+
+    def test_opens_after_threshold(self):
+        """Test that consecutive failures open the circuit."""
+        breaker = CircuitBreaker("aggs", failure_threshold=2, reset_timeout=60)
+        breaker.before_call()
+        breaker.record_failure()
+        breaker.before_call()
+        breaker.record_failure()
+        assert breaker.state == CircuitBreaker.OPEN
+        with pytest.raises(Unavailable) as excinfo:
+            breaker.before_call()
+        payload = json.loads(str(excinfo.value))
+        assert payload["error"] == "circuit_open"
+        assert payload["family"] == "aggs"
+        assert 0 < payload["retry_after"] <= 60
+
+    def test_success_resets_failures(self):
+        """Test that only consecutive failures count."""
+        breaker = CircuitBreaker("aggs", failure_threshold=2)
+        breaker.record_failure()
+        breaker.record_success()
+        breaker.record_failure()
+        assert breaker.state == CircuitBreaker.CLOSED
+
+    def test_half_open_single_probe(self):
+        """Test that one probe is admitted after the reset timeout."""
+        breaker = CircuitBreaker("trades", failure_threshold=1, reset_timeout=0)
+        breaker.record_failure()
+        breaker.before_call()
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+        with pytest.raises(Unavailable):
+            breaker.before_call()
+        breaker.record_success()
+        assert breaker.state == CircuitBreaker.CLOSED
+        breaker.before_call()
+
+    def test_failed_probe_reopens(self):
+        """Test that a failed half-open probe reopens the circuit."""
+        breaker = CircuitBreaker("trades", failure_threshold=3, reset_timeout=0)
+        for _ in range(3):
+            breaker.record_failure()
+        breaker.before_call()
+        breaker.record_failure()
+        assert breaker.state == CircuitBreaker.OPEN
+
+    def test_release_frees_probe(self):
+        """Test that a neutral outcome lets another probe through."""
+        breaker = CircuitBreaker("trades", failure_threshold=1, reset_timeout=0)
+        breaker.record_failure()
+        breaker.before_call()
+        breaker.release()
+        breaker.before_call()
+
+
+class TestAdmissionController:
+    """Tests for the AdmissionController class."""
+
+    def test_rejects_over_limit(self):
+        """Test that requests over the in-flight limit are shed."""
+        admission = AdmissionController(max_in_flight=1, retry_after=2)
+        with admission.slot():
+            with pytest.raises(Unavailable) as excinfo:
+                with admission.slot():
+                    pass
+            assert excinfo.value.retry_after == 2
+        with admission.slot():
+            assert admission.in_flight == 1
+        assert admission.in_flight == 0
+
+
+def test_endpoint_family():
+    """Test mapping of client methods to breaker families."""
+    assert endpoint_family("get_aggs") == "aggs"
+    assert endpoint_family("get_previous_close_agg") == "aggs"
+    assert endpoint_family("get_daily_open_close_agg") == "aggs"
+    assert endpoint_family("list_futures_aggregates") == "futures"
+    assert endpoint_family("list_trades") == "trades"
+    assert endpoint_family("get_last_quote") == "trades"
+    assert endpoint_family("get_snapshot_ticker") == "snapshots"
+    assert endpoint_family("list_universal_snapshots") == "snapshots"
+    assert endpoint_family("list_benzinga_ratings") == "benzinga"
+    assert endpoint_family("list_futures_trades") == "futures"
+    assert endpoint_family("get_futures_snapshot") == "futures"
+    assert endpoint_family("list_tickers") == "reference"
+
+
+def test_abandoned_calls_keep_bounded_threads(monkeypatch):
+    """Test that timed-out calls hold an upstream thread instead of adding more."""
+    monkeypatch.setattr(
+        server, "upstream_executor", server.ThreadPoolExecutor(max_workers=1)
+    )
+    release = threading.Event()
+    threads = []
+
+    def get_last_trade(**kwargs):
+        threads.append(threading.current_thread())
+        release.wait(5)
+        return SimpleNamespace(data=b"{}")
+
+    client = SimpleNamespace(get_last_trade=get_last_trade)
+
+    async def scenario():
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(
+                server._call_upstream(client, "get_last_trade", {}), 0.05
+            )
+        # The abandoned call still holds the only thread, so the next one queues.
+        second = asyncio.ensure_future(
+            server._call_upstream(client, "get_last_trade", {})
+        )
+        await asyncio.sleep(0.05)
+        assert len(threads) == 1
+        release.set()
+        assert await second == "{}"
+
+    start = time.monotonic()
+    run(scenario())
+    assert len(threads) == 2 and threads[0] is threads[1]
+    assert time.monotonic() - start < 5
+    server.upstream_executor.shutdown()
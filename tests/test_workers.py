@@ -0,0 +1,104 @@
+import asyncio
+
+from mcp_polygon.cache import ResponseCache
+from mcp_polygon.shared_state import SharedRateLimiter, SharedState
+from mcp_polygon.workers import SessionRouter, worker_count
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+class TestSharedState:
+    """Tests for the SharedState class."""
+
+    def test_cache_row_roundtrip(self, tmp_path):
+        """Test that cache rows written by one handle are read by another."""
+        path = str(tmp_path / "state.sqlite3")
+        SharedState(path).put("k", "value", None, 10.0, 20.0)
+        assert SharedState(path).get("k") == ("value", None, 10.0, 20.0)
+        assert SharedState(path).get("missing") is None
+
+    def test_take_token(self, tmp_path):
+        """Test that the token bucket is shared between handles."""
+        path = str(tmp_path / "state.sqlite3")
+        first, second = SharedState(path), SharedState(path)
+        assert first.take_token("polygon", rate=1, burst=2) == 0
+        assert second.take_token("polygon", rate=1, burst=2) == 0
+        assert first.take_token("polygon", rate=1, burst=2) > 0
+
+    def test_try_acquire_skips_locked_database(self, tmp_path):
+        """Test that try_acquire gives up at once while another writer has the lock."""
+        path = str(tmp_path / "state.sqlite3")
+        holder = SharedState(path)
+        limiter = SharedRateLimiter(SharedState(path), rate=1, burst=1)
+        holder._conn.execute("BEGIN IMMEDIATE")
+        try:
+            assert not limiter.try_acquire()
+        finally:
+            holder._conn.execute("ROLLBACK")
+        assert limiter.try_acquire()
+
+    def test_shared_rate_limiter(self, tmp_path):
+        """Test that limiters on one database draw from one budget."""
+        path = str(tmp_path / "state.sqlite3")
+        first = SharedRateLimiter(SharedState(path), rate=1, burst=1)
+        second = SharedRateLimiter(SharedState(path), rate=1, burst=1)
+        assert first.try_acquire()
+        assert not second.try_acquire()
+
+    def test_response_cache_shares_entries(self, tmp_path):
+        """Test that a response fetched by one cache is served to another."""
+        path = str(tmp_path / "state.sqlite3")
+        calls = []
+
+        async def fetch():
+            calls.append(1)
+            return "response"
+
+        async def scenario():
+            first = ResponseCache(store=SharedState(path))
+            second = ResponseCache(store=SharedState(path))
+            await first.get_or_fetch("k", fetch, ttl=60)
+            return await second.get_or_fetch("k", fetch, ttl=60)
+
+        assert run(scenario()) == "response"
+        assert len(calls) == 1
+
+
+class TestSessionRouter:
+    """Tests for the SessionRouter class."""
+
+    def test_new_sessions_round_robin(self):
+        """Test that requests without a session rotate across workers."""
+        router = SessionRouter(["a.sock", "b.sock", "c.sock"])
+        assert [router.worker_for(None) for _ in range(4)] == [0, 1, 2, 0]
+
+    def test_known_session_sticky(self):
+        """Test that a learned session always maps to its worker."""
+        router = SessionRouter(["a.sock", "b.sock"])
+        router.remember("abc", 1)
+        assert all(router.worker_for("abc") == 1 for _ in range(5))
+
+    def test_unknown_session_stable(self):
+        """Test that unknown sessions are routed consistently."""
+        router = SessionRouter(["a.sock", "b.sock"])
+        assert router.worker_for("xyz") == router.worker_for("xyz")
+
+    def test_session_table_bounded(self):
+        """Test that the oldest sessions are forgotten at capacity."""
+        router = SessionRouter(["a.sock", "b.sock"], max_sessions=2)
+        router.remember("one", 0)
+        router.remember("two", 1)
+        router.worker_for("one")
+        router.remember("three", 1)
+        assert list(router.sessions) == ["one", "three"]
+
+
+def test_worker_count():
+    """Test parsing of the MCP_WORKERS setting."""
+    assert worker_count(None) == 1
+    assert worker_count("4") == 4
+    assert worker_count("0") == 1
+    assert worker_count("many") == 1
+    assert worker_count("auto") >= 1